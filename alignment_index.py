@@ -0,0 +1,123 @@
+# alignment_index.py
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class AlignmentIndex:
+    """
+    Chainage-parametrised index over a 3D reference polyline (baseline, zero line, ...).
+
+    project() drops each query point perpendicularly onto the nearest polyline segment and
+    returns its chainage, horizontal offset and the Z interpolated along that segment.
+    Candidate segments come from a KD-tree over points sampled along the polyline, so a
+    query costs O(log M) and the work is done in fixed-size chunks (constant memory).
+
+    breaks are the indices of vertices that start a new polyline: no segment joins the
+    previous vertex to them, and chainage continues across the gap without counting it.
+    from_polylines() builds the index over several polylines that way.
+    """
+
+    def __init__(self, vertices, sample_spacing=None, candidates=4, chunk_size=500_000, breaks=()):
+        vertices = np.asarray(vertices, dtype=np.float64)[:, :3]
+        polyline_ids = np.zeros(len(vertices), dtype=np.int64)
+        breaks = np.unique(np.asarray(breaks, dtype=np.int64))
+        if len(breaks):
+            polyline_ids = np.searchsorted(breaks, np.arange(len(vertices)), side='right')
+        # Repeated vertices give zero-length segments; keep the first of each run
+        if len(vertices) > 1:
+            keep = np.concatenate(([True], np.any(np.diff(vertices[:, :2], axis=0) != 0, axis=1)
+                                   | (np.diff(polyline_ids) != 0)))
+            vertices = vertices[keep]
+            polyline_ids = polyline_ids[keep]
+        self.vertices = vertices
+        self.candidates = candidates
+        self.chunk_size = chunk_size
+
+        # Segments only join consecutive vertices of the same polyline
+        first = np.flatnonzero(polyline_ids[:-1] == polyline_ids[1:])
+        self.starts = vertices[first]
+        self.ends = vertices[first + 1]
+        self.vectors = self.ends[:, :2] - self.starts[:, :2]
+        self.lengths = np.hypot(self.vectors[:, 0], self.vectors[:, 1])
+        self.chainages = np.concatenate(([0.0], np.cumsum(self.lengths)))
+
+        if len(self.lengths) == 0:
+            self.tree = None
+            return
+
+        # Sample every segment at least at both ends and every sample_spacing in between
+        if sample_spacing is None:
+            sample_spacing = max(float(np.median(self.lengths)), 1e-6)
+        per_segment = np.maximum(np.ceil(self.lengths / sample_spacing).astype(np.int64), 1) + 1
+        self.sample_segments = np.repeat(np.arange(len(self.lengths)), per_segment)
+        first = np.repeat(np.cumsum(per_segment) - per_segment, per_segment)
+        fraction = (np.arange(len(self.sample_segments)) - first) / (per_segment[self.sample_segments] - 1)
+        samples = self.starts[self.sample_segments, :2] + fraction[:, None] * self.vectors[self.sample_segments]
+        self.tree = cKDTree(samples)
+
+    @classmethod
+    def from_polylines(cls, polylines, **kwargs):
+        """Index over several separate polylines ((N, 3) arrays, in chainage order)"""
+        polylines = [np.asarray(polyline, dtype=np.float64).reshape(-1, 3) for polyline in polylines]
+        polylines = [polyline for polyline in polylines if len(polyline)]
+        if not polylines:
+            return cls(np.empty((0, 3)), **kwargs)
+        breaks = np.cumsum([len(polyline) for polyline in polylines])[:-1]
+        return cls(np.concatenate(polylines), breaks=breaks, **kwargs)
+
+    @property
+    def length(self):
+        return float(self.chainages[-1])
+
+    def project(self, points_xy):
+        """
+        Project (N, 2) XY positions onto the polyline.
+
+        Returns (chainage, offset, elevation) arrays; offset is the horizontal distance
+        from the polyline.
+        """
+        xy = np.asarray(points_xy, dtype=np.float64)[:, :2]
+        count = len(xy)
+        if self.tree is None:
+            # No segments (a single vertex per polyline at most): use the nearest vertex
+            if not len(self.vertices):
+                return np.zeros(count), np.zeros(count), np.full(count, np.nan)
+            offset, nearest = cKDTree(self.vertices[:, :2]).query(xy)
+            return np.zeros(count), offset, self.vertices[nearest, 2]
+
+        chainage = np.empty(count)
+        offset = np.empty(count)
+        elevation = np.empty(count)
+        k = min(self.candidates, self.tree.n)
+        last_segment = len(self.lengths) - 1
+        for start in range(0, count, self.chunk_size):
+            block = xy[start:start + self.chunk_size]
+            _, nearest = self.tree.query(block, k=k)
+            nearest = nearest.reshape(len(block), k)
+            # Segments of the nearest samples plus their neighbours, so a point close to a
+            # vertex is also tested against the segment on the other side of it
+            segments = self.sample_segments[nearest]
+            segments = np.concatenate((segments, np.maximum(segments - 1, 0),
+                                       np.minimum(segments + 1, last_segment)), axis=1)
+
+            vectors = self.vectors[segments]
+            relative = block[:, None, :] - self.starts[segments, :2]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                t = np.einsum('ijk,ijk->ij', relative, vectors) / (self.lengths[segments] ** 2)
+            t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+            foot = relative - t[:, :, None] * vectors
+            distances = np.hypot(foot[:, :, 0], foot[:, :, 1])
+
+            best = np.argmin(distances, axis=1)
+            rows = np.arange(len(block))
+            segment = segments[rows, best]
+            t_best = t[rows, best]
+            end = slice(start, start + len(block))
+            chainage[end] = self.chainages[segment] + t_best * self.lengths[segment]
+            offset[end] = distances[rows, best]
+            elevation[end] = self.starts[segment, 2] + t_best * (self.ends[segment, 2] - self.starts[segment, 2])
+        return chainage, offset, elevation
+
+    def elevation(self, points_xy):
+        """Reference Z at the foot of the perpendicular from each XY position"""
+        return self.project(points_xy)[2]
@@ -2038,11 +2038,28 @@ class ApplicationUI(QMainWindow):
             }
         """)
         self.percentage_label.setAlignment(Qt.AlignCenter)
+        # Cancel button (only shown while a background load is running)
+        self.cancel_load_button = QPushButton("Cancel")
+        self.cancel_load_button.setFixedHeight(30)
+        self.cancel_load_button.setStyleSheet("""
+            QPushButton {
+                font-size: 14px;
+                color: white;
+                background-color: #8B0000;
+                border-radius: 5px;
+                padding: 4px 16px;
+            }
+            QPushButton:hover {
+                background-color: #B22222;
+            }
+        """)
+        self.cancel_load_button.setVisible(False)
         # Add widgets to layout
         layout.addWidget(self.loading_label)
         layout.addWidget(file_info_container)
         layout.addWidget(self.progress)
         layout.addWidget(self.percentage_label)
+        layout.addWidget(self.cancel_load_button, alignment=Qt.AlignCenter)
         # Center the progress bar on screen but shifted slightly to the right
         screen_geometry = QApplication.desktop().screenGeometry()
         x = (screen_geometry.width() - self.progress_bar.width()) // 2 + 150 # Shift 100 pixels right
@@ -2082,6 +2099,7 @@ class ApplicationUI(QMainWindow):
     def hide_progress_bar(self):
         """Hide the progress bar with a smooth fade-out"""
         self.progress_bar.hide()
+        self.cancel_load_button.setVisible(False)
         self.progress.setValue(0)
         self.percentage_label.setText("0%")
 
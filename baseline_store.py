@@ -0,0 +1,392 @@
+# baseline_store.py
+import argparse
+import json
+import os
+
+import numpy as np
+
+STORAGE_FORMAT = "npz-columns"
+STORAGE_VERSION = 1
+# Boolean column marking the points that carry an optional field (e.g. angle_deg)
+PRESENT_SUFFIX = "__present"
+
+
+def columns_path(json_path):
+    """Path of the .npz column file that belongs to a baseline JSON sidecar"""
+    return os.path.splitext(json_path)[0] + ".npz"
+
+
+def points_to_columns(points):
+    """
+    Turn a list of point dicts into {field: array} columns.
+
+    Fields missing from some points get a zero-filled column plus a '<field>__present'
+    mask. Raises ValueError for values NumPy cannot store without pickling.
+    """
+    keys = []
+    for point in points:
+        for key in point:
+            if key not in keys:
+                keys.append(key)
+
+    columns = {}
+    for key in keys:
+        present = np.fromiter((key in point for point in points), dtype=bool, count=len(points))
+        values = np.array([point[key] for point in points if key in point])
+        if values.dtype == object:
+            raise ValueError(f"Point field '{key}' has mixed or missing values")
+        if present.all():
+            columns[key] = values
+        else:
+            column = np.zeros((len(points),) + values.shape[1:], dtype=values.dtype)
+            column[present] = values
+            columns[key] = column
+            columns[key + PRESENT_SUFFIX] = present
+    return keys, columns
+
+
+class BaselineColumns:
+    """
+    A baseline file held as one array per point field.
+
+    metadata is the baseline dict without the points (baseline_type, width_meters, ...,
+    and per polyline its start/end chainage); columns hold the points of all polylines
+    back to back, polyline i spanning offsets[i]:offsets[i + 1].
+    """
+
+    def __init__(self, metadata, point_keys, columns, offsets):
+        self.metadata = metadata
+        self.point_keys = list(point_keys)
+        self.columns = columns
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Columns of a baseline dict in the legacy JSON layout (one dict per point)"""
+        metadata = {key: value for key, value in data.items() if key != "polylines"}
+        metadata["polylines"] = []
+        points = []
+        offsets = [0]
+        for polyline in data.get("polylines", []):
+            metadata["polylines"].append({key: value for key, value in polyline.items() if key != "points"})
+            points.extend(polyline.get("points", []))
+            offsets.append(len(points))
+        keys, columns = points_to_columns(points)
+        return cls(metadata, keys, columns, offsets)
+
+    @classmethod
+    def from_polylines(cls, metadata, polylines):
+        """
+        Columns from (polyline metadata, {field: array}) pairs; every polyline must carry
+        the same fields.
+        """
+        metadata = dict(metadata)
+        metadata["polylines"] = [dict(polyline) for polyline, _ in polylines]
+        keys = list(polylines[0][1]) if polylines else []
+        columns = {key: np.concatenate([np.asarray(fields[key]) for _, fields in polylines]) for key in keys}
+        offsets = np.concatenate(([0], np.cumsum([len(fields[keys[0]]) for _, fields in polylines]))) if keys else [0]
+        return cls(metadata, keys, columns, offsets)
+
+    @classmethod
+    def concatenate(cls, baselines):
+        """One BaselineColumns with the polylines of several (fields they all share)"""
+        keys = [key for key in baselines[0].point_keys if all(key in other.point_keys for other in baselines)]
+        polylines = []
+        for baseline in baselines:
+            for i, polyline in enumerate(baseline.metadata.get("polylines", [])):
+                polylines.append((polyline, {key: baseline.polyline(i, key) for key in keys}))
+        return cls.from_polylines(baselines[0].metadata, polylines)
+
+    @property
+    def point_count(self):
+        return int(self.offsets[-1])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def polyline(self, index, key):
+        """Column `key` of polyline `index` (a view, not a copy)"""
+        return self.columns[key][self.offsets[index]:self.offsets[index + 1]]
+
+    def present(self, key):
+        """Boolean mask of the points that carry field `key`"""
+        if key + PRESENT_SUFFIX in self.columns:
+            return self.columns[key + PRESENT_SUFFIX]
+        return np.full(self.point_count, key in self.columns)
+
+    def point(self, index):
+        """Point `index` as a dict of the fields it carries"""
+        return {key: self.columns[key][index].tolist() for key in self.point_keys
+                if key + PRESENT_SUFFIX not in self.columns or self.columns[key + PRESENT_SUFFIX][index]}
+
+    def polylines_2d(self, min_points=2):
+        """(chainage_m, relative_elevation_m) tuple lists, as kept in line_types[...]['polylines']"""
+        if self.point_count == 0:
+            return []
+        chainage = self.columns["chainage_m"].tolist()
+        elevation = self.columns["relative_elevation_m"].tolist()
+        result = []
+        for start, end in zip(self.offsets[:-1], self.offsets[1:]):
+            if end - start >= min_points:
+                result.append(list(zip(chainage[start:end], elevation[start:end])))
+        return result
+
+    def world_polylines(self, min_points=2):
+        """(N, 3) world coordinate arrays, one per polyline (points without coordinates skipped)"""
+        if self.point_count == 0 or "world_coordinates" not in self.columns:
+            return []
+        present = self.present("world_coordinates")
+        result = []
+        for i in range(len(self)):
+            polyline = self.polyline(i, "world_coordinates")
+            mask = present[self.offsets[i]:self.offsets[i + 1]]
+            if not mask.all():
+                polyline = polyline[mask]
+            if len(polyline) >= min_points:
+                result.append(polyline)
+        return result
+
+    def nearest(self, chainages, key="relative_elevation_m"):
+        """
+        Value of `key` at the point nearest in chainage to each query chainage, and the
+        chainage distance to it (binary search instead of a scan over all points).
+        """
+        chainages = np.asarray(chainages, dtype=np.float64)
+        if self.point_count == 0:
+            return np.full(len(chainages), np.nan), np.full(len(chainages), np.inf)
+        order = np.argsort(self.columns["chainage_m"], kind='stable')
+        sorted_chainages = self.columns["chainage_m"][order]
+        if len(order) == 1:
+            index = np.zeros(len(chainages), dtype=np.int64)
+        else:
+            right = np.clip(np.searchsorted(sorted_chainages, chainages), 1, len(order) - 1)
+            left = right - 1
+            # Ties go to the lower chainage, as the first match of a linear scan would
+            take_right = np.abs(sorted_chainages[right] - chainages) < np.abs(sorted_chainages[left] - chainages)
+            index = np.where(take_right, right, left)
+        return self.columns[key][order[index]], np.abs(sorted_chainages[index] - chainages)
+
+    def to_dict(self):
+        """Rebuild the legacy JSON layout (for code that walks the point dicts)"""
+        values = {key: self.columns[key].tolist() for key in self.point_keys}
+        present = {key: self.columns[key + PRESENT_SUFFIX]
+                   for key in self.point_keys if key + PRESENT_SUFFIX in self.columns}
+        points = [dict(zip(self.point_keys, row)) for row in zip(*(values[key] for key in self.point_keys))]
+        for key, mask in present.items():
+            for index in np.flatnonzero(~mask):
+                del points[index][key]
+
+        data = {key: value for key, value in self.metadata.items() if key != "polylines"}
+        data["polylines"] = []
+        for i, polyline in enumerate(self.metadata.get("polylines", [])):
+            polyline = dict(polyline)
+            polyline["points"] = points[self.offsets[i]:self.offsets[i + 1]]
+            data["polylines"].append(polyline)
+        return data
+
+
+def normalize_chainage_str(value):
+    """Canonical 'KM+MMM' form ('101+20', ' 101 + 020 ' -> '101+020'); other strings are only stripped"""
+    text = str(value).replace(" ", "")
+    km, plus, metres = text.partition("+")
+    if plus and km.isdigit() and metres.isdigit():
+        return f"{int(km)}+{int(metres):03d}"
+    return text
+
+
+class ChainageIndex:
+    """
+    Sorted chainage index over the vertices of a baseline.
+
+    lookup() resolves a chainage label ('101+020') through a normalized string map, or a
+    numeric chainage by binary search; between two vertices of the same polyline the world
+    coordinates are interpolated. start_km (the zero line KM) lets labels that are not
+    stored on any vertex be converted to a chainage as well.
+    """
+
+    def __init__(self, baseline, start_km=None, tolerance=0.001):
+        self.metadata = baseline.metadata
+        self.start_km = start_km
+        self.tolerance = tolerance
+        columns = baseline.columns
+        if baseline.point_count and "chainage_m" in columns and "world_coordinates" in columns:
+            chainages = columns["chainage_m"].astype(np.float64)
+            world = columns["world_coordinates"].astype(np.float64)
+            polyline = np.repeat(np.arange(len(baseline)), np.diff(baseline.offsets))
+            vertex = np.arange(len(chainages)) - baseline.offsets[polyline]
+        else:
+            chainages, world = np.empty(0), np.empty((0, 3))
+            polyline = vertex = np.empty(0, dtype=np.int64)
+
+        order = np.argsort(chainages, kind='stable')
+        self.chainages = chainages[order]
+        self.world = world[order]
+        self.polyline = polyline[order]
+        self.vertex = vertex[order]
+
+        # First vertex (in file order) for every label, as a linear scan would find it
+        self.labels = {}
+        if len(chainages) and "chainage_str" in columns:
+            for index, label in enumerate(columns["chainage_str"].tolist()):
+                self.labels.setdefault(normalize_chainage_str(label), index)
+        self.label_world = world
+
+    def __len__(self):
+        return len(self.chainages)
+
+    def to_chainage(self, value):
+        """Chainage in metres of a numeric string or (with start_km) a 'KM+MMM' label, else None"""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+        label = normalize_chainage_str(value)
+        km, plus, metres = label.partition("+")
+        if self.start_km is None or not plus or not (km.isdigit() and metres.isdigit()):
+            return None
+        return (int(km) - float(self.start_km)) * 1000.0 + int(metres)
+
+    def lookup(self, value):
+        """World coordinates [x, y, z] at a chainage label or value, or None outside the baseline"""
+        index = self.labels.get(normalize_chainage_str(value))
+        if index is not None:
+            return self.label_world[index].tolist()
+        chainage = self.to_chainage(value)
+        if chainage is None:
+            return None
+        world = self.interpolate(np.array([chainage]))[0]
+        return None if np.isnan(world[0]) else world.tolist()
+
+    def interpolate(self, chainages):
+        """(N, 3) world coordinates for an array of chainages; NaN rows where none is found"""
+        chainages = np.asarray(chainages, dtype=np.float64)
+        result = np.full((len(chainages), 3), np.nan)
+        if len(self.chainages) == 0:
+            return result
+
+        # A vertex within the tolerance wins (the nearer of the two neighbours)
+        right = np.minimum(np.searchsorted(self.chainages, chainages), len(self.chainages) - 1)
+        left = np.maximum(right - 1, 0)
+        nearest = np.where(np.abs(self.chainages[right] - chainages) < np.abs(self.chainages[left] - chainages),
+                           right, left)
+        exact = np.abs(self.chainages[nearest] - chainages) < self.tolerance
+        result[exact] = self.world[nearest[exact]]
+
+        # Otherwise interpolate between neighbouring vertices of one polyline
+        between = (~exact & (self.chainages[left] <= chainages) & (chainages <= self.chainages[right])
+                   & (self.polyline[left] == self.polyline[right])
+                   & (np.abs(self.vertex[right] - self.vertex[left]) == 1))
+        if between.any():
+            lo, hi = left[between], right[between]
+            span = self.chainages[hi] - self.chainages[lo]
+            t = np.divide(chainages[between] - self.chainages[lo], span, out=np.zeros_like(span), where=span > 0)
+            result[between] = self.world[lo] + t[:, None] * (self.world[hi] - self.world[lo])
+        return result
+
+
+def is_columnar(data):
+    return data.get("storage", {}).get("format") == STORAGE_FORMAT
+
+
+def read_baseline_columns(json_path):
+    """BaselineColumns of a baseline file, columnar or legacy JSON"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not is_columnar(data):
+        return BaselineColumns.from_dict(data)
+
+    storage = data.pop("storage")
+    npz_path = os.path.join(os.path.dirname(json_path), storage["columns_file"])
+    with np.load(npz_path, allow_pickle=False) as archive:
+        columns = {name: archive[name] for name in archive.files}
+    offsets = columns.pop("polyline_offsets")
+    return BaselineColumns(data, storage["point_keys"], columns, offsets)
+
+
+def read_baseline(json_path):
+    """Baseline dict in the legacy JSON layout, whichever format is on disk"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not is_columnar(data):
+        return data
+    return read_baseline_columns(json_path).to_dict()
+
+
+def write_baseline_columns(json_path, baseline):
+    """
+    Save a BaselineColumns as a small JSON sidecar (metadata, polyline ranges) next to an
+    .npz file with one array per point field.
+    """
+    npz_path = columns_path(json_path)
+    arrays = dict(baseline.columns)
+    arrays["polyline_offsets"] = baseline.offsets
+    # Write through a file object so NumPy does not change the extension
+    with open(npz_path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+    sidecar = dict(baseline.metadata)
+    sidecar["storage"] = {
+        "format": STORAGE_FORMAT,
+        "version": STORAGE_VERSION,
+        "columns_file": os.path.basename(npz_path),
+        "point_keys": baseline.point_keys,
+        "point_count": baseline.point_count,
+    }
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(sidecar, f, indent=4, ensure_ascii=False)
+
+
+def write_baseline(json_path, data):
+    """Save a baseline dict in the legacy layout to the columnar format"""
+    write_baseline_columns(json_path, BaselineColumns.from_dict(data))
+
+
+def migrate_baseline(json_path, backup=True):
+    """
+    Convert one legacy *_baseline.json to the columnar format in place.
+
+    The original is kept as <name>.json.bak unless backup is False. Returns False when the
+    file is already columnar or its points cannot be stored as arrays.
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if is_columnar(data):
+        return False
+    try:
+        baseline = BaselineColumns.from_dict(data)
+    except (ValueError, TypeError):
+        return False
+    if backup:
+        os.replace(json_path, json_path + ".bak")
+    write_baseline_columns(json_path, baseline)
+    return True
+
+
+def migrate_tree(root, backup=True):
+    """Migrate every *_baseline.json below root; returns (converted, skipped) path lists"""
+    converted, skipped = [], []
+    for folder, _, files in os.walk(root):
+        for name in sorted(files):
+            if not name.endswith("_baseline.json"):
+                continue
+            path = os.path.join(folder, name)
+            try:
+                ok = migrate_baseline(path, backup=backup)
+            except (OSError, json.JSONDecodeError):
+                ok = False
+            (converted if ok else skipped).append(path)
+    return converted, skipped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert legacy *_baseline.json files to columnar .npz storage")
+    parser.add_argument("root", help="worksheet, design layer or worksheets base folder")
+    parser.add_argument("--no-backup", action="store_true", help="do not keep the original as .json.bak")
+    args = parser.parse_args()
+
+    converted, skipped = migrate_tree(args.root, backup=not args.no_backup)
+    for path in converted:
+        print(f"converted  {path}")
+    for path in skipped:
+        print(f"skipped    {path}")
+    print(f"{len(converted)} converted, {len(skipped)} skipped")
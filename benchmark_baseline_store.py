@@ -0,0 +1,91 @@
+# benchmark_baseline_store.py
+"""
+Compare opening a design-layer baseline stored as legacy JSON (one dict per point) with
+the columnar .npz format of baseline_store.
+
+A synthetic road_surface_baseline.json is written to a temporary directory, timed the way
+load_all_baselines_from_layer used to read it, migrated with migrate_baseline and timed
+again through read_baseline_columns.
+
+Usage:
+    python benchmark_baseline_store.py                      # 100k and 1M points
+    python benchmark_baseline_store.py --points 200000 --polylines 4
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from baseline_store import columns_path, migrate_baseline, read_baseline_columns
+
+
+def write_legacy_baseline(path, num_points, num_polylines):
+    rng = np.random.default_rng(0)
+    polylines = []
+    for chainages in np.array_split(np.linspace(0.0, 20_000.0, num_points), num_polylines):
+        rel_z = np.cumsum(rng.normal(scale=0.05, size=len(chainages)))
+        points = [{
+            "chainage_m": float(ch),
+            "chainage_str": f"{int(ch) // 1000}+{int(ch) % 1000:03d}",
+            "relative_elevation_m": float(z),
+            "world_coordinates": [387000.0 + float(ch), 2061000.0, 590.0 + float(z)],
+        } for ch, z in zip(chainages, rel_z)]
+        polylines.append({
+            "start_chainage_m": points[0]["chainage_m"],
+            "end_chainage_m": points[-1]["chainage_m"],
+            "points": points,
+        })
+    data = {"baseline_type": "Road Surface", "baseline_key": "road_surface", "width_meters": 12.0,
+            "polylines": polylines}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+def open_legacy(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [[(pt["chainage_m"], pt["relative_elevation_m"]) for pt in poly["points"]]
+            for poly in data["polylines"]]
+
+
+def open_columnar(path):
+    return read_baseline_columns(path).polylines_2d()
+
+
+def run(point_counts, num_polylines):
+    work_dir = tempfile.mkdtemp(prefix="baseline_bench_")
+    print(f"{'points':>11} {'format':>9} {'size (MB)':>10} {'open (s)':>9}")
+    print("-" * 43)
+    try:
+        for num_points in point_counts:
+            path = os.path.join(work_dir, "road_surface_baseline.json")
+            write_legacy_baseline(path, num_points, num_polylines)
+            results = []
+            for name, open_layer in (("json", open_legacy), ("npz", open_columnar)):
+                if name == "npz":
+                    migrate_baseline(path, backup=False)
+                    size = os.path.getsize(path) + os.path.getsize(columns_path(path))
+                else:
+                    size = os.path.getsize(path)
+                start = time.perf_counter()
+                polylines = open_layer(path)
+                elapsed = time.perf_counter() - start
+                results.append(polylines)
+                print(f"{num_points:>11,} {name:>9} {size / (1024 * 1024):>10.1f} {elapsed:>9.3f}")
+            assert results[0] == results[1]
+            os.remove(path)
+            os.remove(columns_path(path))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--polylines", type=int, default=8)
+    args = parser.parse_args()
+    run(args.points, args.polylines)
@@ -0,0 +1,72 @@
+# benchmark_db_pool.py
+"""
+Statements per second against a local MySQL/MariaDB server (DB_CONFIG in db_config.py),
+with a new connection per statement (what execute_query used to do) and through the
+shared ConnectionManager pool.
+
+Every mode runs the same parameterised SELECT on unique_id_header_all from one or more
+threads.
+
+Usage:
+    python benchmark_db_pool.py                          # 500 statements, 1 and 4 threads
+    python benchmark_db_pool.py --statements 2000 --threads 1 8
+"""
+import argparse
+import threading
+import time
+
+import mysql.connector
+
+from db_config import DB_CONFIG, ConnectionManager
+
+QUERY = "SELECT uh_id, uh_last_id FROM unique_id_header_all WHERE uh_table_name = %s"
+PARAMS = ("user_header_all",)
+
+
+def run_unpooled(count):
+    for _ in range(count):
+        connection = mysql.connector.connect(**DB_CONFIG)
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(QUERY, PARAMS)
+        cursor.fetchall()
+        cursor.close()
+        connection.close()
+
+
+def make_run_pooled(pool):
+    def run_pooled(count):
+        for _ in range(count):
+            pool.fetch_all(QUERY, PARAMS)
+    return run_pooled
+
+
+def timed(run, statements, num_threads):
+    per_thread = statements // num_threads
+    threads = [threading.Thread(target=run, args=(per_thread,)) for _ in range(num_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_thread * num_threads / (time.perf_counter() - start)
+
+
+def main(statements, thread_counts):
+    print(f"{'threads':>8} {'mode':>10} {'statements/s':>13}")
+    print("-" * 33)
+    for num_threads in thread_counts:
+        pool = ConnectionManager(pool_size=max(num_threads, 1))
+        # Open the pooled connections first so both modes are measured warm
+        timed(make_run_pooled(pool), num_threads, num_threads)
+        for name, run in (("unpooled", run_unpooled), ("pooled", make_run_pooled(pool))):
+            rate = timed(run, statements, num_threads)
+            print(f"{num_threads:>8} {name:>10} {rate:>13.0f}")
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=500)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+    main(args.statements, args.threads)
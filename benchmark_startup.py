@@ -0,0 +1,72 @@
+# benchmark_startup.py
+"""
+Import-time report of the startup path, from python -X importtime.
+
+Each target is imported in a fresh interpreter: "login" is what main.py needs before the
+login screen appears (main itself, login, welcome_page and the database modules), "viewer"
+is pointcloudviewer with open3d, vtk, matplotlib, scipy and dialogs, which main.py now
+imports in the background. The report lists the total per target and its slowest
+top-level imports.
+
+Usage:
+    python benchmark_startup.py                          # login and viewer, 15 slowest imports
+    python benchmark_startup.py --top 30 --output importtime_report.txt
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+TARGETS = {
+    "login": "import main, login, welcome_page, database, db_executor",
+    "viewer": "import pointcloudviewer",
+}
+
+
+def import_times(statement):
+    """(total seconds, [(cumulative seconds, module)] of top-level imports) or raises RuntimeError"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+        raise RuntimeError(last_line)
+
+    top_level = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under the module that imported them
+        if not name[1:].startswith(" "):
+            top_level.append((int(cumulative) / 1e6, name.strip()))
+    return sum(seconds for seconds, _ in top_level), top_level
+
+
+def report(targets, top):
+    lines = []
+    for target in targets:
+        try:
+            total, modules = import_times(TARGETS[target])
+        except RuntimeError as e:
+            lines.append(f"{target}: import failed ({e})")
+            lines.append("")
+            continue
+        lines.append(f"{target}: {total:.3f} s")
+        for seconds, name in sorted(modules, reverse=True)[:top]:
+            lines.append(f"    {seconds:>8.3f} s  {name}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=["login", "viewer"])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+    text = report(args.targets, args.top)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
@@ -0,0 +1,65 @@
+# benchmark_volume.py
+"""
+Micro-benchmark for the volume used by calculate_volume.
+
+Compares the old per-tetrahedron np.linalg.det loop, the batched triple product over the
+Delaunay simplices (utils.tetrahedra_volume) and the ConvexHull fast path.
+
+Usage:
+    python benchmark_volume.py                        # 1k / 100k / 1M points
+    python benchmark_volume.py --sizes 1000 10000 --loop-max 10000
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.spatial import ConvexHull, Delaunay
+
+from utils import tetrahedra_volume
+
+
+def loop_volume(points, simplices):
+    """The original calculate_volume loop"""
+    total_volume = 0
+    for tetrahedron in points[simplices]:
+        x0, y0, z0 = tetrahedron[0]
+        x1, y1, z1 = tetrahedron[1]
+        x2, y2, z2 = tetrahedron[2]
+        x3, y3, z3 = tetrahedron[3]
+        total_volume += (1/6) * abs(np.linalg.det(np.array([[x1-x0, y1-y0, z1-z0],
+                                                            [x2-x0, y2-y0, z2-z0],
+                                                            [x3-x0, y3-y0, z3-z0]])))
+    return total_volume
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def run(sizes, loop_max):
+    rng = np.random.default_rng(0)
+    print(f"{'points':>10} {'delaunay (s)':>13} {'loop (s)':>10} {'batched (s)':>12} {'hull (s)':>10} {'volume':>14}")
+    print("-" * 75)
+    for size in sizes:
+        # A cropped terrain-like block: 20 x 20 m footprint, 0-3 m high
+        points = rng.random((size, 3)) * [20.0, 20.0, 3.0]
+        tri, delaunay_time = timed(lambda: Delaunay(points))
+        loop_time = "skipped"
+        if size <= loop_max:
+            loop_result, elapsed = timed(lambda: loop_volume(points, tri.simplices))
+            loop_time = f"{elapsed:.3f}"
+        batched, batched_time = timed(lambda: tetrahedra_volume(points, tri.simplices))
+        hull, hull_time = timed(lambda: ConvexHull(points).volume)
+        assert abs(batched - hull) <= 1e-6 * hull
+        print(f"{size:>10,} {delaunay_time:>13.3f} {loop_time:>10} {batched_time:>12.4f} {hull_time:>10.4f} {hull:>14.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--loop-max", type=int, default=100_000,
+                        help="largest input to run through the old per-tetrahedron loop")
+    args = parser.parse_args()
+    run(args.sizes, args.loop_max)
@@ -0,0 +1,91 @@
+# benchmark_vtk_conversion.py
+"""
+Load-to-first-frame benchmark for the point cloud -> VTK conversion.
+
+Compares the old per-point InsertNextPoint/InsertCellPoint/InsertNextTuple3 loops with the
+bulk path in vtk_utils on synthetic clouds, then renders one offscreen frame.
+
+Usage:
+    python benchmark_vtk_conversion.py                 # 1M / 10M / 50M points
+    python benchmark_vtk_conversion.py --sizes 1000000 --legacy-max 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import vtk
+
+from vtk_utils import create_point_cloud_polydata
+
+
+def build_legacy_polydata(points, colors):
+    """The original display_point_cloud conversion loops"""
+    vtk_points = vtk.vtkPoints()
+    for point in points:
+        vtk_points.InsertNextPoint(point[0], point[1], point[2])
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(vtk_points)
+    vertices = vtk.vtkCellArray()
+    for i in range(points.shape[0]):
+        vertices.InsertNextCell(1)
+        vertices.InsertCellPoint(i)
+    polydata.SetVerts(vertices)
+    vtk_colors = vtk.vtkUnsignedCharArray()
+    vtk_colors.SetNumberOfComponents(3)
+    vtk_colors.SetName("Colors")
+    for color in colors * 255:
+        vtk_colors.InsertNextTuple3(color[0], color[1], color[2])
+    polydata.GetPointData().SetScalars(vtk_colors)
+    return polydata
+
+
+def render_first_frame(polydata):
+    """Render a single offscreen frame and return the render time in seconds"""
+    mapper = vtk.vtkPolyDataMapper()
+    mapper.SetInputData(polydata)
+    actor = vtk.vtkActor()
+    actor.SetMapper(mapper)
+    actor.GetProperty().SetPointSize(2)
+    renderer = vtk.vtkRenderer()
+    renderer.AddActor(actor)
+    render_window = vtk.vtkRenderWindow()
+    render_window.SetOffScreenRendering(1)
+    render_window.SetSize(800, 600)
+    render_window.AddRenderer(renderer)
+    renderer.ResetCamera()
+    start = time.perf_counter()
+    render_window.Render()
+    elapsed = time.perf_counter() - start
+    render_window.Finalize()
+    return elapsed
+
+
+def run(sizes, legacy_max, render):
+    rng = np.random.default_rng(0)
+    print(f"{'points':>12} {'method':>8} {'convert (s)':>12} {'render (s)':>11} {'total (s)':>10}")
+    print("-" * 58)
+    for size in sizes:
+        points = rng.random((size, 3)) * [1000.0, 1000.0, 50.0]
+        colors = rng.random((size, 3))
+        methods = [("bulk", lambda: create_point_cloud_polydata(points, colors))]
+        if size <= legacy_max:
+            methods.insert(0, ("legacy", lambda: build_legacy_polydata(points, colors)))
+        for name, build in methods:
+            start = time.perf_counter()
+            polydata = build()
+            convert_time = time.perf_counter() - start
+            render_time = render_first_frame(polydata) if render else 0.0
+            print(f"{size:>12,} {name:>8} {convert_time:>12.3f} {render_time:>11.3f} "
+                  f"{convert_time + render_time:>10.3f}")
+        if size > legacy_max:
+            print(f"{size:>12,} {'legacy':>8} {'skipped (> --legacy-max)':>35}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument("--legacy-max", type=int, default=1_000_000,
+                        help="largest cloud to run through the old per-point loops")
+    parser.add_argument("--no-render", action="store_true", help="skip the offscreen first frame")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_max, not args.no_render)
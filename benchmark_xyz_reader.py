@@ -0,0 +1,65 @@
+# benchmark_xyz_reader.py
+"""
+Compare the streaming xyz_reader against the old np.loadtxt(usecols=(0, 1, 2)) path.
+
+Synthetic "x y z intensity" files are written to a temporary directory (100M lines is
+roughly 4.5 GB, so make sure there is room) and removed afterwards.
+
+Usage:
+    python benchmark_xyz_reader.py                           # 10M and 100M lines
+    python benchmark_xyz_reader.py --lines 1000000 --loadtxt-max 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from xyz_reader import read_xyz
+
+
+def write_synthetic_xyz(path, num_lines, chunk=1_000_000):
+    rng = np.random.default_rng(0)
+    with open(path, 'w') as f:
+        for start in range(0, num_lines, chunk):
+            rows = min(chunk, num_lines - start)
+            data = rng.random((rows, 4)) * [1000.0, 1000.0, 50.0, 255.0] + [387000.0, 2061000.0, 590.0, 0.0]
+            np.savetxt(f, data, fmt='%.3f %.3f %.3f %.0f')
+
+
+def run(line_counts, loadtxt_max, keep_dir):
+    work_dir = keep_dir or tempfile.mkdtemp(prefix="xyz_bench_")
+    print(f"{'lines':>13} {'size (MB)':>10} {'method':>10} {'time (s)':>10} {'lines/s':>14}")
+    print("-" * 62)
+    for num_lines in line_counts:
+        path = os.path.join(work_dir, f"synthetic_{num_lines}.xyz")
+        if not os.path.exists(path):
+            write_synthetic_xyz(path, num_lines)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+
+        methods = [("streaming", lambda: read_xyz(path)['points'])]
+        if num_lines <= loadtxt_max:
+            methods.insert(0, ("loadtxt", lambda: np.loadtxt(path, usecols=(0, 1, 2))))
+        for name, load in methods:
+            start = time.perf_counter()
+            points = load()
+            elapsed = time.perf_counter() - start
+            assert len(points) == num_lines
+            print(f"{num_lines:>13,} {size_mb:>10.0f} {name:>10} {elapsed:>10.2f} {num_lines / elapsed:>14,.0f}")
+        if num_lines > loadtxt_max:
+            print(f"{num_lines:>13,} {size_mb:>10.0f} {'loadtxt':>10} {'skipped (> --loadtxt-max)':>25}")
+        if not keep_dir:
+            os.remove(path)
+    if not keep_dir:
+        os.rmdir(work_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[10_000_000, 100_000_000])
+    parser.add_argument("--loadtxt-max", type=int, default=10_000_000,
+                        help="largest file to run through np.loadtxt")
+    parser.add_argument("--keep-dir", help="write (and keep) the synthetic files in this directory")
+    args = parser.parse_args()
+    run(args.lines, args.loadtxt_max, args.keep_dir)
@@ -0,0 +1,78 @@
+# chainage_ticks.py
+import math
+
+import numpy as np
+from matplotlib import ticker
+
+
+class ChainageLocator(ticker.Locator):
+    """
+    Chainage ticks at multiples of the zero line interval, for the visible x-range only.
+
+    When the interval would put ticks closer than min_spacing_px on screen, the step grows
+    to the next 1-2-5 multiple of the interval, so the number of labels depends on the
+    axis width, not on the alignment length.
+    """
+
+    def __init__(self, interval, total_distance, min_spacing_px=70):
+        self.interval = float(interval)
+        self.total_distance = float(total_distance)
+        self.min_spacing_px = min_spacing_px
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        vmin, vmax = sorted((vmin, vmax))
+        vmin = max(vmin, 0.0)
+        vmax = min(vmax, self.total_distance)
+        if vmax < vmin or self.interval <= 0:
+            return np.array([])
+        width_px = self.axis.axes.bbox.width if self.axis is not None else 1000.0
+        max_ticks = max(int(width_px / self.min_spacing_px), 2)
+        step = self.interval * self.step_multiple((vmax - vmin) / self.interval / max_ticks)
+        first = math.ceil(vmin / step - 1e-9) * step
+        return np.arange(first, vmax + step * 1e-9, step)
+
+    @staticmethod
+    def step_multiple(minimum):
+        """Smallest 1, 2, 5, 10, 20, 50, ... not below minimum"""
+        if minimum <= 1:
+            return 1
+        magnitude = 10 ** math.floor(math.log10(minimum))
+        for factor in (1, 2, 5, 10):
+            if factor * magnitude >= minimum:
+                return factor * magnitude
+
+
+class ChainageFormatter(ticker.Formatter):
+    """'KM+MMM' labels measured from the zero line start, cached per tick position"""
+
+    def __init__(self, start_km=0, max_cache=10_000):
+        self.start_km = start_km
+        self.max_cache = max_cache
+        self.cache = {}
+
+    def __call__(self, x, pos=None):
+        key = round(x, 3)
+        label = self.cache.get(key)
+        if label is None:
+            if len(self.cache) >= self.max_cache:
+                self.cache.clear()
+            meters = max(int(round(x)), 0)
+            label = f"{self.start_km + meters // 1000}+{meters % 1000:03d}"
+            self.cache[key] = label
+        return label
+
+
+def apply_chainage_ticks(ax, interval, total_distance, start_km, rotation=15, fontsize=8):
+    """Install a ChainageLocator/ChainageFormatter pair on the x-axis of ax"""
+    ax.xaxis.set_major_locator(ChainageLocator(interval, total_distance))
+    ax.xaxis.set_major_formatter(ChainageFormatter(start_km))
+    ax.tick_params(axis='x', labelrotation=rotation)
+    if fontsize is not None:
+        ax.tick_params(axis='x', labelsize=fontsize)
+    # Ticks created later copy the alignment of the existing ones
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
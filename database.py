@@ -1,16 +1,153 @@
 # database.py
-import mysql.connector
 from mysql.connector import Error
+from collections import deque
 import datetime
 import re
+import threading
 
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': '',
-    'database': 'integrated',
-    'port': 3306
+from db_config import db_pool
+
+# IDs reserved per round trip for the detail tables that are written in bulk. Other tables
+# reserve exactly what is asked for, so closing the application never skips their IDs.
+ID_BLOCK_SIZES = {
+    'road_step_gap_details_all': 100,
+    'work_stage_layers_details_all': 100,
+    'measurement_layer_details_all': 100,
+    'cross_layers_details_all': 100,
+    'bridge_layer_data_details_all': 100,
 }
+# Rows per executemany() call of bulk_insert; mysql.connector sends each call as one multi-row INSERT
+BULK_BATCH_SIZE = 500
+IDENTIFIER_RE = re.compile(r'^\w+$')
+
+
+def increment_unique_id(prefix, last_id):
+    """ID following last_id: PRE-00001 ... PRE-99999, PRE-A0001 ... PRE-Z9999, PRE-ZA001 ..."""
+    # Parse last_id (UHA-00001, UHA-A0001, etc.)
+    last_id_parts = last_id.split('-')
+    if len(last_id_parts) != 2:
+        raise ValueError(f"Invalid last_id format: {last_id}")
+
+    prefix_part, rest = last_id_parts
+    alphabets = ''.join(re.findall(r'[A-Z]', rest))
+    digits = ''.join(re.findall(r'\d+', rest))
+
+    alpha_len = len(alphabets)
+    digit_len = 5 - alpha_len
+
+    if alpha_len == 5:
+        raise ValueError("Reached maximum ID limit: ZZZZZ")
+
+    if digits == '9' * digit_len:
+        # Carry over logic (same as before)
+        if alphabets == 'Z' and alpha_len == 1:
+            alphabets = 'ZA'
+            digits = '001'
+        elif alphabets == 'ZZ' and alpha_len == 2:
+            alphabets = 'ZZA'
+            digits = '01'
+        elif alphabets == 'ZZZ' and alpha_len == 3:
+            alphabets = 'ZZZZ'
+            digits = '1'
+        elif alphabets == 'ZZZZ' and alpha_len == 4:
+            alphabets = 'ZZZZZ'
+            digits = ''
+        elif alpha_len == 0:
+            alphabets = 'A'
+            digits = '0001'
+        elif alpha_len in [1, 2, 3] and alphabets[-1] != 'Z':
+            last_char = alphabets[-1]
+            alphabets = alphabets[:-1] + chr(ord(last_char) + 1)
+            digits = '1'.zfill(digit_len)
+        elif alpha_len in [2, 3] and alphabets[-1] == 'Z':
+            alphabets += 'A'
+            digits = '1'.zfill(digit_len - 1)
+    else:
+        next_number = int(digits) + 1
+        digits = str(next_number).zfill(digit_len)
+
+    return f"{prefix}-{alphabets}{digits}"
+
+
+def unique_id_sequence(prefix, last_id, count):
+    """The count IDs following last_id (starting at PRE-00001 when last_id is empty)"""
+    ids = []
+    for _ in range(count):
+        last_id = increment_unique_id(prefix, last_id) if last_id else f"{prefix}-00001"
+        ids.append(last_id)
+    return ids
+
+
+class IdAllocator:
+    """
+    Hands out unique_id_header_all IDs from blocks reserved in the database.
+
+    reserve() locks the table's counter row (SELECT ... FOR UPDATE), advances uh_last_id by a
+    whole block and commits on a connection of its own, never the calling thread's pooled one,
+    so concurrent workstations never get the same ID and a caller that rolls back its own
+    transaction neither returns IDs to the counter nor holds the row lock. IDs of a block that
+    are not used before the application exits are skipped.
+    """
+
+    def __init__(self, pool=db_pool, block_sizes=ID_BLOCK_SIZES):
+        self.pool = pool
+        self.block_sizes = block_sizes
+        self.blocks = {}  # table name -> deque of reserved, unused IDs
+        self.table_locks = {}  # table name -> lock held while its block is refilled
+        self.lock = threading.Lock()
+
+    def next_ids(self, table_name, prefix, count):
+        # Only callers of the same table wait for each other's database round trip
+        with self.lock:
+            table_lock = self.table_locks.setdefault(table_name, threading.Lock())
+        with table_lock:
+            cached = self.blocks.setdefault(table_name, deque())
+            ids = [cached.popleft() for _ in range(min(count, len(cached)))]
+            missing = count - len(ids)
+            if missing > 0:
+                reserved = self.reserve(table_name, prefix, max(missing, self.block_sizes.get(table_name, 1)))
+                ids.extend(reserved[:missing])
+                cached.extend(reserved[missing:])
+            return ids
+
+    def reserve(self, table_name, prefix, count):
+        """Advance the counter of table_name by count in one locked transaction; returns the IDs"""
+        if count <= 0:
+            return []
+        now = datetime.datetime.now()
+        # A connection of its own: the thread's pooled one may belong to a caller's transaction
+        connection = self.pool.acquire()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(
+                    "SELECT uh_id, uh_last_id FROM unique_id_header_all "
+                    "WHERE uh_table_name = %s ORDER BY uh_id LIMIT 1 FOR UPDATE",
+                    (table_name,))
+                rows = cursor.fetchall()
+                record = rows[0] if rows else None
+                ids = unique_id_sequence(prefix, record['uh_last_id'] if record else None, count)
+                if record is None:
+                    cursor.execute(
+                        "INSERT INTO unique_id_header_all "
+                        "(uh_table_name, uh_id_for, uh_prefix, uh_last_id, uh_created_on, uh_modified_on) "
+                        "VALUES (%s, %s, %s, %s, %s, %s)",
+                        (table_name, f"{table_name}_id", prefix, ids[-1], now, now))
+                else:
+                    cursor.execute(
+                        "UPDATE unique_id_header_all SET uh_last_id = %s, uh_modified_on = %s WHERE uh_id = %s",
+                        (ids[-1], now, record['uh_id']))
+                connection.commit()
+            finally:
+                cursor.close()
+        finally:
+            # release() rolls back whatever an exception left uncommitted
+            self.pool.release(connection)
+        return ids
+
+
+id_allocator = IdAllocator()
+
 
 class DatabaseHandler:
     def __init__(self):
@@ -33,18 +170,41 @@ class DatabaseHandler:
         }
 
     def connect(self):
+        """Check a connection out of the shared pool until disconnect()"""
+        if self.connection is not None:
+            return True
         try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
+            self.connection = db_pool.acquire()
             self.cursor = self.connection.cursor(dictionary=True)
             return True
         except Error as e:
+            if self.connection is not None:
+                db_pool.release(self.connection, broken=True)
+                self.connection = None
             print(f"Connection failed: {e}")
             return False
 
     def disconnect(self):
-        if self.connection and self.connection.is_connected():
+        """Return the connection to the pool"""
+        if self.connection is None:
+            return
+        broken = False
+        try:
             self.cursor.close()
-            self.connection.close()
+        except Error:
+            broken = True
+        db_pool.release(self.connection, broken)
+        self.connection = None
+        self.cursor = None
+
+    def __enter__(self):
+        if not self.connect():
+            raise Error("Cannot connect to database.")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disconnect()
+        return False
 
     def execute_query(self, query, params=None, fetch=False):
         try:
@@ -60,92 +220,53 @@ class DatabaseHandler:
             return False
 
     def get_next_id(self, table_name):
+        return self.get_next_ids(table_name, 1)[0]
+
+    def get_next_ids(self, table_name, count):
+        """The next count IDs of a table (e.g. 500 for a bulk import), reserved in one round trip"""
         prefix = self.table_prefixes.get(table_name)
         if not prefix:
             raise ValueError(f"No prefix defined for table: {table_name}")
+        return id_allocator.next_ids(table_name, prefix, count)
 
-        query = """
-        SELECT * FROM unique_id_header_all 
-        WHERE uh_table_name = %s
+    def bulk_insert(self, table_name, rows, id_column=None, batch_size=BULK_BATCH_SIZE, upsert=False):
         """
-        self.cursor.execute(query, (table_name,))
-        record = self.cursor.fetchone()
-        
-        now = datetime.datetime.now()
-        
-        if not record:
-            next_id = f"{prefix}-00001"
-            insert_query = """
-            INSERT INTO unique_id_header_all 
-            (uh_table_name, uh_id_for, uh_prefix, uh_last_id, uh_created_on, uh_modified_on)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            self.execute_query(insert_query, 
-                             (table_name, f"{table_name}_id", prefix, next_id, now, now))
-            return next_id
-        
-        last_id = record['uh_last_id']
-        
-        if not last_id:
-            next_id = f"{prefix}-00001"
-            update_query = """
-            UPDATE unique_id_header_all 
-            SET uh_last_id = %s, uh_modified_on = %s
-            WHERE uh_id = %s
-            """
-            self.execute_query(update_query, (next_id, now, record['uh_id']))
-            return next_id
-
-        # Parse last_id (UHA-00001, UHA-A0001, etc.)
-        last_id_parts = last_id.split('-')
-        if len(last_id_parts) != 2:
-            raise ValueError(f"Invalid last_id format: {last_id}")
-
-        prefix_part, rest = last_id_parts
-        alphabets = ''.join(re.findall(r'[A-Z]', rest))
-        digits = ''.join(re.findall(r'\d+', rest))
-
-        alpha_len = len(alphabets)
-        digit_len = 5 - alpha_len
-
-        if alpha_len == 5:
-            raise ValueError("Reached maximum ID limit: ZZZZZ")
-
-        if digits == '9' * digit_len:
-            # Carry over logic (same as before)
-            if alphabets == 'Z' and alpha_len == 1:
-                alphabets = 'ZA'
-                digits = '001'
-            elif alphabets == 'ZZ' and alpha_len == 2:
-                alphabets = 'ZZA'
-                digits = '01'
-            elif alphabets == 'ZZZ' and alpha_len == 3:
-                alphabets = 'ZZZZ'
-                digits = '1'
-            elif alphabets == 'ZZZZ' and alpha_len == 4:
-                alphabets = 'ZZZZZ'
-                digits = ''
-            elif alpha_len == 0:
-                alphabets = 'A'
-                digits = '0001'
-            elif alpha_len in [1, 2, 3] and alphabets[-1] != 'Z':
-                last_char = alphabets[-1]
-                alphabets = alphabets[:-1] + chr(ord(last_char) + 1)
-                digits = '1'.zfill(digit_len)
-            elif alpha_len in [2, 3] and alphabets[-1] == 'Z':
-                alphabets += 'A'
-                digits = '1'.zfill(digit_len - 1)
-        else:
-            next_number = int(digits) + 1
-            digits = str(next_number).zfill(digit_len)
-
-        next_id = f"{prefix}-{alphabets}{digits}"
-        
-        update_query = """
-        UPDATE unique_id_header_all 
-        SET uh_last_id = %s, uh_modified_on = %s
-        WHERE uh_id = %s
+        Insert many rows (dicts with the same keys) in a single transaction.
+
+        Rows are sent batch_size at a time with executemany, which becomes one multi-row
+        INSERT per batch, and committed once at the end; any error rolls the whole set back.
+        When id_column is given, rows without a value for it get IDs from get_next_ids in one
+        reservation. With upsert, rows whose key already exists are updated instead
+        (ON DUPLICATE KEY UPDATE). Returns the rows' id_column values ([] without id_column),
+        or None if the insert failed.
         """
-        self.execute_query(update_query, (next_id, now, record['uh_id']))
-        
-        return next_id
\ No newline at end of file
+        rows = [dict(row) for row in rows]
+        if not rows:
+            return []
+        if id_column:
+            missing = [row for row in rows if not row.get(id_column)]
+            for row, new_id in zip(missing, self.get_next_ids(table_name, len(missing))):
+                row[id_column] = new_id
+
+        columns = list(rows[0])
+        for name in [table_name] + columns:
+            if not IDENTIFIER_RE.match(name):
+                raise ValueError(f"Invalid table or column name: {name}")
+        if any(set(row) != set(columns) for row in rows):
+            raise ValueError("All rows passed to bulk_insert must have the same columns")
+
+        query = (f"INSERT INTO `{table_name}` ({', '.join(f'`{c}`' for c in columns)}) "
+                 f"VALUES ({', '.join(['%s'] * len(columns))})")
+        if upsert:
+            query += " ON DUPLICATE KEY UPDATE " + ", ".join(f"`{c}` = VALUES(`{c}`)" for c in columns)
+        values = [tuple(row[c] for c in columns) for row in rows]
+
+        try:
+            for start in range(0, len(values), batch_size):
+                self.cursor.executemany(query, values[start:start + batch_size])
+            self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            print(f"Bulk insert into {table_name} failed: {e}")
+            return None
+        return [row[id_column] for row in rows] if id_column else []
@@ -1,5 +1,11 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
 
 # Local database configuration
 DB_CONFIG = {
@@ -50,50 +56,209 @@ def close_db_connection(connection):
         connection.close()
         print("MySQL connection is closed")
 
+
+POOL_SIZE = 5
+CHECKOUT_TIMEOUT_S = 10.0
+# Idle connections older than this are pinged before they are handed out again
+HEALTH_CHECK_INTERVAL_S = 30.0
+MAX_CACHED_STATEMENTS = 32
+
+
+class ConnectionManager:
+    """
+    Pool of MySQL connections shared by every thread.
+
+    connection() checks a connection out for the calling thread; nested blocks on the same
+    thread get the same connection and it goes back to the pool when the outermost block
+    exits, with any unfinished transaction rolled back. Connections are opened on demand,
+    at most pool_size of them; a thread that finds them all checked out waits up to
+    checkout_timeout seconds. fetch_all() and execute() run positional (%s) statements
+    through prepared cursors cached per connection, so a repeated statement is parsed by the
+    server once per pooled connection instead of once per call.
+    """
+
+    def __init__(self, config=DB_CONFIG, pool_size=POOL_SIZE, checkout_timeout=CHECKOUT_TIMEOUT_S,
+                 health_check_interval=HEALTH_CHECK_INTERVAL_S, max_statements=MAX_CACHED_STATEMENTS):
+        self.config = dict(config)
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self.max_statements = max_statements
+        self.slots = threading.BoundedSemaphore(pool_size)
+        self.lock = threading.Lock()
+        self.idle = []  # (connection, last used, monotonic seconds)
+        self.statements = {}  # id(connection) -> OrderedDict(query -> prepared cursor)
+        self.local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Checkout
+    # ------------------------------------------------------------------
+    def acquire(self):
+        """Check out a connection; pair with release(). Raises PoolError when none frees up in time"""
+        if not self.slots.acquire(timeout=self.checkout_timeout):
+            raise PoolError(f"No MySQL connection available within {self.checkout_timeout:g} s")
+        try:
+            with self.lock:
+                connection, last_used = self.idle.pop() if self.idle else (None, 0.0)
+            if connection is not None and time.monotonic() - last_used > self.health_check_interval:
+                try:
+                    connection.ping(reconnect=False)
+                except Error:
+                    self._discard(connection)
+                    connection = None
+            if connection is None:
+                connection = mysql.connector.connect(**self.config)
+            return connection
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, connection, broken=False):
+        """Return a connection to the pool (closing it instead if it is broken)"""
+        try:
+            if not broken:
+                try:
+                    if connection.in_transaction:
+                        connection.rollback()
+                except Error:
+                    broken = True
+            if broken:
+                self._discard(connection)
+            else:
+                with self.lock:
+                    self.idle.append((connection, time.monotonic()))
+        finally:
+            self.slots.release()
+
+    def _discard(self, connection):
+        for cursor in self.statements.pop(id(connection), {}).values():
+            try:
+                cursor.close()
+            except Error:
+                pass
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    def close_all(self):
+        """Close the idle connections (checked-out ones are closed when they are released broken)"""
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+    # ------------------------------------------------------------------
+    # Context-manager API
+    # ------------------------------------------------------------------
+    @contextmanager
+    def connection(self):
+        """The calling thread's connection for the duration of the block"""
+        state = self.local
+        if getattr(state, 'connection', None) is not None:
+            yield state.connection
+            return
+        connection = self.acquire()
+        state.connection = connection
+        state.transaction_depth = 0
+        broken = False
+        try:
+            yield connection
+        except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+            broken = True
+            raise
+        finally:
+            state.connection = None
+            self.release(connection, broken)
+
+    @contextmanager
+    def cursor(self, dictionary=False, prepared=False):
+        """A cursor on the calling thread's connection, closed when the block exits"""
+        with self.connection() as connection:
+            cursor = connection.cursor(dictionary=dictionary, prepared=prepared)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaction(self):
+        """Commit when the outermost transaction block exits normally, roll back on an exception"""
+        with self.connection() as connection:
+            state = self.local
+            state.transaction_depth += 1
+            try:
+                yield connection
+                if state.transaction_depth == 1:
+                    connection.commit()
+            except BaseException:
+                if state.transaction_depth == 1:
+                    connection.rollback()
+                raise
+            finally:
+                state.transaction_depth -= 1
+
+    # ------------------------------------------------------------------
+    # Statements
+    # ------------------------------------------------------------------
+    def _prepared_cursor(self, connection, query):
+        with self.lock:
+            cache = self.statements.setdefault(id(connection), OrderedDict())
+            cursor = cache.pop(query, None)
+            if cursor is None:
+                cursor = connection.cursor(prepared=True)
+                if len(cache) >= self.max_statements:
+                    _, evicted = cache.popitem(last=False)
+                    evicted.close()
+            cache[query] = cursor
+        return cursor
+
+    def fetch_all(self, query, params=None):
+        """Rows of a SELECT as dicts"""
+        with self.connection() as connection:
+            if isinstance(params, dict):
+                # Named (%(name)s) parameters cannot be prepared
+                with self.cursor(dictionary=True) as cursor:
+                    cursor.execute(query, params)
+                    return cursor.fetchall()
+            cursor = self._prepared_cursor(connection, query)
+            cursor.execute(query, tuple(params or ()))
+            rows = cursor.fetchall()
+            return [dict(zip(cursor.column_names, row)) for row in rows]
+
+    def execute(self, query, params=None):
+        """Run an INSERT, UPDATE or DELETE in its own transaction (or the enclosing one); returns the row count"""
+        with self.transaction() as connection:
+            if isinstance(params, dict):
+                with self.cursor() as cursor:
+                    cursor.execute(query, params)
+                    return cursor.rowcount
+            cursor = self._prepared_cursor(connection, query)
+            cursor.execute(query, tuple(params or ()))
+            return cursor.rowcount
+
+
+db_pool = ConnectionManager()
+
+
 def execute_query(query, params=None):
     """
     Execute a SELECT query and return results
     """
-    connection = get_db_connection()
-    if connection is None:
-        return None
-    
     try:
-        cursor = connection.cursor(dictionary=True)
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        result = cursor.fetchall()
-        cursor.close()
-        return result
+        return db_pool.fetch_all(query, params)
     except Error as e:
         print(f"Error executing query: {e}")
         return None
-    finally:
-        close_db_connection(connection)
 
 def execute_update(query, params=None):
     """
     Execute an INSERT, UPDATE, or DELETE query
     """
-    connection = get_db_connection()
-    if connection is None:
-        return False
-    
     try:
-        cursor = connection.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        connection.commit()
-        print(f"Query executed successfully. Rows affected: {cursor.rowcount}")
-        cursor.close()
+        rowcount = db_pool.execute(query, params)
+        print(f"Query executed successfully. Rows affected: {rowcount}")
         return True
     except Error as e:
         print(f"Error executing update: {e}")
-        connection.rollback()
         return False
-    finally:
-        close_db_connection(connection)
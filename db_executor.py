@@ -0,0 +1,122 @@
+# db_executor.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+DB_WORKERS = 4
+DB_TIMEOUT_S = 15.0
+
+
+class DbTask(QObject):
+    """
+    Handle of a call submitted to a DbExecutor.
+
+    Exactly one of succeeded(result), failed(message) or cancelled() is emitted on the GUI
+    thread, followed by finished(); connect finished to end a loading state. A task that
+    does not complete within its timeout fails with a timeout message and its late result is
+    dropped. cancel() removes a call that has not started yet; a call already running on a
+    worker (e.g. a query on the server) runs to its end, but its result is dropped.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+    # Emitted from the worker thread, delivered queued on the GUI thread
+    _completed = pyqtSignal(object, object)
+
+    def __init__(self, timeout=None, parent=None):
+        super().__init__(parent)
+        self.future = None
+        self.done = False
+        self.timeout = timeout
+        self._completed.connect(self._on_completed)
+        self.timer = None
+        if timeout:
+            self.timer = QTimer(self)
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self._on_timeout)
+            self.timer.start(int(timeout * 1000))
+
+    def cancel(self):
+        if self.done:
+            return
+        if self.future is not None:
+            self.future.cancel()
+        self._finish(self.cancelled.emit)
+
+    def _on_timeout(self):
+        if not self.done:
+            if self.future is not None:
+                self.future.cancel()
+            self._finish(lambda: self.failed.emit(f"The database did not respond within {self.timeout:g} seconds."))
+
+    def _on_completed(self, result, error):
+        if self.done:
+            return
+        if error is not None:
+            self._finish(lambda: self.failed.emit(str(error) or type(error).__name__))
+        else:
+            self._finish(lambda: self.succeeded.emit(result))
+
+    def _finish(self, emit):
+        self.done = True
+        if self.timer is not None:
+            self.timer.stop()
+        emit()
+        self.finished.emit()
+
+
+class DbExecutor(QObject):
+    """
+    Worker threads for database calls (and other blocking work such as password hashing).
+
+    submit(fn, *args) runs fn on a worker and returns a DbTask whose signals arrive on the GUI
+    thread. Workers take their own connection from db_config.db_pool, so a slow server only
+    delays the task, never the event loop.
+    """
+
+    def __init__(self, max_workers=DB_WORKERS, parent=None):
+        super().__init__(parent)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self.tasks = set()
+
+    def submit(self, fn, *args, timeout=DB_TIMEOUT_S, **kwargs):
+        task = DbTask(timeout, self)
+        self.tasks.add(task)
+        task.finished.connect(lambda: self._forget(task))
+
+        def run():
+            try:
+                result, error = fn(*args, **kwargs), None
+            except Exception as e:
+                result, error = None, e
+            try:
+                task._completed.emit(result, error)
+            except RuntimeError:
+                pass  # the task was cancelled and deleted meanwhile
+
+        task.future = self.pool.submit(run)
+        return task
+
+    def _forget(self, task):
+        self.tasks.discard(task)
+        task.deleteLater()
+
+    def shutdown(self, wait=False):
+        for task in list(self.tasks):
+            task.cancel()
+        self.pool.shutdown(wait=wait)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor():
+    """Shared executor, created on first use (after the QApplication exists)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DbExecutor()
+        return _executor
@@ -0,0 +1,207 @@
+# dem_raster.py
+import os
+import numpy as np
+from scipy.spatial import cKDTree
+
+from point_cache import source_stat
+
+DEM_VERSION = 2
+# Filled cells kept at most; beyond it the cell size doubles until the cloud fits
+MAX_DEM_CELLS = 16_000_000
+
+
+class ElevationRaster:
+    """
+    Gridded DEM of a point cloud: per-cell min/max/mean (and optional percentile) Z.
+
+    Only filled cells are stored, as sorted cell ids (row * cols + col) with one value per
+    layer, so memory follows the number of filled cells instead of the XY bounding box (the
+    empty corners of a diagonal corridor cost nothing). When more than max_cells cells are
+    filled the cell size doubles until they fit. A lookup is a binary search per query cell;
+    empty cells take the value of the nearest filled cell, like the old nearest-neighbour
+    griddata did.
+    """
+
+    def __init__(self, origin, cell_size, shape, cell_ids, layers, counts, edge_cells=None):
+        self.origin = np.asarray(origin, dtype=np.float64)  # x, y of the lower-left cell corner
+        self.cell_size = float(cell_size)
+        self.shape = tuple(int(n) for n in shape)           # rows, cols of the whole grid
+        self.cell_ids = cell_ids                            # (M,) sorted int64 ids of the filled cells
+        self.layers = layers                                # name -> (M,) float32
+        self.counts = counts                                # (M,) points per filled cell
+        # Positions (into cell_ids) of filled cells next to an empty one: the nearest filled
+        # cell of any empty cell is always one of them, so only they are put in the KD-tree
+        self.edge_cells = self._find_edge_cells() if edge_cells is None else edge_cells
+        rows, cols = np.divmod(self.cell_ids[self.edge_cells], self.shape[1])
+        self.edge_tree = cKDTree(np.column_stack((rows, cols)).astype(np.float64)) if len(rows) else None
+
+    @classmethod
+    def from_points(cls, points, cell_size=0.5, percentiles=(), chunk_size=5_000_000, max_cells=MAX_DEM_CELLS,
+                    should_stop=None):
+        points = np.asarray(points)
+        if len(points) == 0:
+            raise ValueError("Cannot build an elevation raster from an empty point cloud")
+        mins = np.full(2, np.inf)
+        maxs = np.full(2, -np.inf)
+        for start in range(0, len(points), chunk_size):
+            block = points[start:start + chunk_size, :2]
+            mins = np.minimum(mins, block.min(axis=0))
+            maxs = np.maximum(maxs, block.max(axis=0))
+
+        while True:
+            cols = int(np.floor((maxs[0] - mins[0]) / cell_size)) + 1
+            rows = int(np.floor((maxs[1] - mins[1]) / cell_size)) + 1
+            cells = cls._aggregate(points, mins, cell_size, rows, cols, chunk_size, max_cells, should_stop)
+            if cells is not None:
+                break
+            cell_size *= 2
+
+        cell_ids, z_sum, counts, z_min, z_max = cells
+        layers = {'mean': (z_sum / counts).astype(np.float32),
+                  'min': z_min.astype(np.float32),
+                  'max': z_max.astype(np.float32)}
+        for p in percentiles:
+            layers[f'p{p:g}'] = cls._percentile_layer(points, mins, cell_size, rows, cols, counts, p)
+        return cls(mins, cell_size, (rows, cols), cell_ids, layers, counts.astype(np.int32))
+
+    @staticmethod
+    def _cell_ids(xy, origin, cell_size, rows, cols):
+        col = np.clip(((xy[:, 0] - origin[0]) / cell_size).astype(np.int64), 0, cols - 1)
+        row = np.clip(((xy[:, 1] - origin[1]) / cell_size).astype(np.int64), 0, rows - 1)
+        return row * cols + col
+
+    @classmethod
+    def _aggregate(cls, points, origin, cell_size, rows, cols, chunk_size, max_cells, should_stop):
+        """(ids, z sum, count, z min, z max) per filled cell, or None once more than max_cells are filled"""
+        parts = []
+        pending = 0
+        for start in range(0, len(points), chunk_size):
+            if should_stop and should_stop():
+                raise InterruptedError("Elevation raster build cancelled")
+            block = np.asarray(points[start:start + chunk_size], dtype=np.float64)
+            cells = cls._cell_ids(block[:, :2], origin, cell_size, rows, cols)
+            order = np.argsort(cells)
+            ids, starts, counts = np.unique(cells[order], return_index=True, return_counts=True)
+            z = block[order, 2]
+            parts.append((ids, np.add.reduceat(z, starts), counts,
+                          np.minimum.reduceat(z, starts), np.maximum.reduceat(z, starts)))
+            pending += len(ids)
+            if pending > max_cells:
+                # Merge the per-chunk cells so memory stays bounded by max_cells
+                parts = [cls._merge(parts)]
+                pending = len(parts[0][0])
+                if pending > max_cells:
+                    return None
+        merged = cls._merge(parts)
+        return merged if len(merged[0]) <= max_cells else None
+
+    @staticmethod
+    def _merge(parts):
+        if len(parts) == 1:
+            return parts[0]
+        ids, z_sum, counts, z_min, z_max = (np.concatenate(column) for column in zip(*parts))
+        order = np.argsort(ids, kind='stable')
+        ids, starts = np.unique(ids[order], return_index=True)
+        return (ids, np.add.reduceat(z_sum[order], starts), np.add.reduceat(counts[order], starts),
+                np.minimum.reduceat(z_min[order], starts), np.maximum.reduceat(z_max[order], starts))
+
+    @classmethod
+    def _percentile_layer(cls, points, origin, cell_size, rows, cols, counts, percentile):
+        """Per-cell Z percentile (nearest rank) from one sort of the points by (cell, z)"""
+        cells = cls._cell_ids(points[:, :2], origin, cell_size, rows, cols)
+        z = np.asarray(points[:, 2], dtype=np.float64)
+        z_sorted = z[np.lexsort((z, cells))]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        rank = np.floor(percentile / 100.0 * (counts - 1)).astype(np.int64)
+        return z_sorted[starts + rank].astype(np.float32)
+
+    def _find_edge_cells(self):
+        rows, cols = self.shape
+        row, col = np.divmod(self.cell_ids, cols)
+        edge = np.zeros(len(self.cell_ids), dtype=bool)
+        for d_row, d_col in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            n_row = row + d_row
+            n_col = col + d_col
+            inside = (n_row >= 0) & (n_row < rows) & (n_col >= 0) & (n_col < cols)
+            edge |= inside & ~self._filled(n_row * cols + n_col)
+        return np.flatnonzero(edge)
+
+    def _filled(self, ids):
+        pos = np.minimum(np.searchsorted(self.cell_ids, ids), len(self.cell_ids) - 1)
+        return self.cell_ids[pos] == ids
+
+    def cell_values(self, layer, rows, cols):
+        """Layer values at integer cell coordinates, from the nearest filled cell where a cell is empty"""
+        ids = rows * self.shape[1] + cols
+        pos = np.minimum(np.searchsorted(self.cell_ids, ids), len(self.cell_ids) - 1)
+        empty = self.cell_ids[pos] != ids
+        if empty.any():
+            _, nearest = self.edge_tree.query(np.column_stack((rows[empty], cols[empty])).astype(np.float64))
+            pos[empty] = self.edge_cells[nearest]
+        return layer[pos].astype(np.float64)
+
+    def elevation(self, points_xy, surface='mean', bilinear=True):
+        """Elevation at (N, 2) XY positions from the chosen surface layer"""
+        xy = np.asarray(points_xy, dtype=np.float64)[:, :2]
+        layer = self.layers[surface]
+        rows, cols = self.shape
+        # Continuous cell coordinates measured from the centre of cell (0, 0)
+        fx = (xy[:, 0] - self.origin[0]) / self.cell_size - 0.5
+        fy = (xy[:, 1] - self.origin[1]) / self.cell_size - 0.5
+        if not bilinear:
+            c = np.clip(np.rint(fx).astype(np.int64), 0, cols - 1)
+            r = np.clip(np.rint(fy).astype(np.int64), 0, rows - 1)
+            return self.cell_values(layer, r, c)
+
+        fx = np.clip(fx, 0, cols - 1)
+        fy = np.clip(fy, 0, rows - 1)
+        c0 = np.minimum(fx.astype(np.int64), max(cols - 2, 0))
+        r0 = np.minimum(fy.astype(np.int64), max(rows - 2, 0))
+        c1 = np.minimum(c0 + 1, cols - 1)
+        r1 = np.minimum(r0 + 1, rows - 1)
+        tx = fx - c0
+        ty = fy - r0
+        top = self.cell_values(layer, r0, c0) * (1 - tx) + self.cell_values(layer, r0, c1) * tx
+        bottom = self.cell_values(layer, r1, c0) * (1 - tx) + self.cell_values(layer, r1, c1) * tx
+        return top * (1 - ty) + bottom * ty
+
+    def save(self, path, source_path=None):
+        """
+        Write the raster as an uncompressed .npz (written to a temp file, then renamed). With
+        source_path, the size and mtime of the source cloud are stored for load() to check.
+        """
+        tmp_path = path + ".tmp.npz"
+        arrays = {f"layer_{name}": layer for name, layer in self.layers.items()}
+        if source_path:
+            arrays.update(source_stat(source_path))
+        np.savez(tmp_path, version=DEM_VERSION, origin=self.origin, cell_size=self.cell_size,
+                 shape=np.array(self.shape), cell_ids=self.cell_ids, counts=self.counts,
+                 edge_cells=self.edge_cells, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, source_path=None):
+        """
+        Read a raster written by save(), or return None if missing, from another version or,
+        with source_path, written for a different size or mtime of the source cloud.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != DEM_VERSION:
+                    return None
+                if source_path:
+                    stat = source_stat(source_path)
+                    if (int(data["source_size"]), int(data["source_mtime_ns"])) != \
+                            (stat["source_size"], stat["source_mtime_ns"]):
+                        return None
+                layers = {key[len("layer_"):]: data[key] for key in data.files if key.startswith("layer_")}
+                return cls(data["origin"], float(data["cell_size"]), data["shape"], data["cell_ids"], layers,
+                           data["counts"], data["edge_cells"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def dem_cache_path(cache_dir, source_key, cell_size):
+    return os.path.join(cache_dir, f"dem_{source_key}_{cell_size:g}m.npz")
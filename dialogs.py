@@ -16,6 +16,9 @@ import json
 from datetime import datetime
 import glob
 
+from baseline_store import BaselineColumns, ChainageIndex, read_baseline, read_baseline_columns
+from worksheet_catalog import get_catalog
+
 # ===========================================================================================================================
 # ** ZERO LINE DIALOG **
 # ===========================================================================================================================
@@ -1118,24 +1121,17 @@ class MeasurementNewDialog(QDialog):
         
         try:
             if os.path.exists(designs_path):
-                # Get all directories (design layer folders) in the designs folder
-                for item in sorted(os.listdir(designs_path)):
+                catalog = get_catalog()
+                # Design layer folders in the designs folder
+                for item in catalog.subdirectories(designs_path):
                     item_path = os.path.join(designs_path, item)
-                    if os.path.isdir(item_path):  # Only process folders, not files
-                        # Look for a config file to get the proper layer name
-                        config_path = os.path.join(item_path, "design_layer_config.txt")
-                        display_name = item  # Default to folder name
-                        
-                        if os.path.exists(config_path):
-                            try:
-                                with open(config_path, 'r', encoding='utf-8') as f:
-                                    config_data = json.load(f)
-                                    # Use the 'layer_name' from config if available
-                                    display_name = config_data.get('layer_name', item)
-                            except:
-                                pass  # Keep folder name if config read fails
-                        
-                        self.design_layer_combo.addItem(display_name, item_path)
+                    # Use the 'layer_name' from the config if available, else the folder name
+                    config_data = catalog.read_json(os.path.join(item_path, "design_layer_config.txt"))
+                    display_name = item
+                    if isinstance(config_data, dict):
+                        display_name = config_data.get('layer_name', item)
+
+                    self.design_layer_combo.addItem(display_name, item_path)
                 
                 if self.design_layer_combo.count() <= 1:  # Only has the default "Select" item
                     self.design_layer_combo.addItem("No design layers found")
@@ -1663,9 +1659,7 @@ class ConstructionNewDialog(QDialog):
             self.on_reference_layer_changed()
             return
         try:
-            folders = [name for name in os.listdir(designs_path)
-                       if os.path.isdir(os.path.join(designs_path, name))]
-            folders.sort()
+            folders = get_catalog().subdirectories(designs_path)
             if folders:
                 self.ref_layer_combo.addItems(folders)
             else:
@@ -1684,12 +1678,7 @@ class ConstructionNewDialog(QDialog):
         if not os.path.exists(layer_path):
             return []
         try:
-            json_files = [
-                name for name in os.listdir(layer_path)
-                if name.lower().endswith('.json') and os.path.isfile(os.path.join(layer_path, name))
-            ]
-            json_files.sort()
-            return json_files
+            return get_catalog().files(layer_path, '.json')
         except Exception:
             return []
 
@@ -1745,8 +1734,7 @@ class ConstructionNewDialog(QDialog):
                 continue
 
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_baseline(json_path)
 
                 color = data.get("color", self.preview_colors[color_idx % len(self.preview_colors)])
                 baseline_key = data.get("baseline_key", json_file.replace("_baseline.json", ""))
@@ -1947,7 +1935,7 @@ class ConstructionNewDialog(QDialog):
                     self.parent.renderer.AddActor(actor)
                     self.parent.construction_base_actors.append(actor)
 
-            self.parent.vtk_widget.GetRenderWindow().Render()
+            self.parent.request_render()
             self.parent.message_text.append(f"Base plane created from first selected baseline (width: {width:.2f}m)")
 
         self.accept()
@@ -2302,16 +2290,8 @@ class ExistingWorksheetDialog(QDialog):
             content_layout.addWidget(lbl)
         else:
             found = False
-            for folder_name in sorted(os.listdir(self.base_dir)):
-                folder_path = os.path.join(self.base_dir, folder_name)
-                if not os.path.isdir(folder_path):
-                    continue
-                config_path = os.path.join(folder_path, "worksheet_config.txt")
-                if not os.path.exists(config_path):
-                    continue
+            for folder_name, data in get_catalog().worksheets(self.base_dir):
                 try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
                     found = True
 
                     name = data.get("worksheet_name", folder_name)
@@ -2411,11 +2391,8 @@ class ExistingWorksheetDialog(QDialog):
 
                     # Find actual subfolders that exist
                     possible_subfolders = ["designs", "measurements", "construction"]
-                    existing = []
-                    for sf in possible_subfolders:
-                        path = os.path.join(self.selected_worksheet_folder, sf)
-                        if os.path.isdir(path):
-                            existing.append(sf)
+                    folders = set(get_catalog().subdirectories(self.selected_worksheet_folder))
+                    existing = [sf for sf in possible_subfolders if sf in folders]
 
                     self.subfolder_list.clear()
                     if existing:
@@ -2444,9 +2421,7 @@ class ExistingWorksheetDialog(QDialog):
 
             self.layer_list.clear()
             try:
-                layers = [d for d in os.listdir(sub_path)
-                          if os.path.isdir(os.path.join(sub_path, d))]
-                layers.sort()
+                layers = get_catalog().subdirectories(sub_path)
                 if layers:
                     for layer in layers:
                         self.layer_list.addItem(layer)
@@ -3529,8 +3504,7 @@ class NewMaterialLineDialog(QDialog):
 
         if baseline_path and os.path.exists(baseline_path):
             try:
-                with open(baseline_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_baseline(baseline_path)
                 polylines = data.get("polylines", [])
                 all_pts = []
                 for poly in polylines:
@@ -3558,18 +3532,15 @@ class NewMaterialLineDialog(QDialog):
             "worksheet_config.json"
         }
 
-        for filename in os.listdir(construction_path):
-            if not filename.lower().endswith(".json"):
-                continue
+        catalog = get_catalog()
+        for filename in catalog.files(construction_path, ".json"):
             if filename in known_non_material:
                 continue
 
             json_path = os.path.join(construction_path, filename)
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                if not (
+                data = catalog.read_json(json_path)
+                if not isinstance(data, dict) or not (
                     "material_line_name" in data or
                     "material_line_id" in data or
                     "segments" in data or
@@ -3854,6 +3825,9 @@ class MergerLayerConfigDialog(QDialog):
 
         # Add dictionary to store loaded baseline data for each layer
         self.loaded_baseline_data = {}
+
+        # Chainage index per baseline file: json_path -> (modification time, ChainageIndex)
+        self.chainage_indexes = {}
         
         self.setup_ui()
         
@@ -3967,6 +3941,24 @@ class MergerLayerConfigDialog(QDialog):
             }
         """)
         self.save_btn.clicked.connect(self.save_config)
+
+        self.verify_all_btn = QPushButton("Verify All")
+        self.verify_all_btn.setToolTip("Verify the chainage of every layer of every merger point")
+        self.verify_all_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                border: 2px solid #1976D2;
+                border-radius: 5px;
+                padding: 10px 20px;
+                font-weight: bold;
+                min-width: 100px;
+            }
+            QPushButton:hover {
+                background-color: #42A5F5;
+            }
+        """)
+        self.verify_all_btn.clicked.connect(self.verify_all_merger_points)
         
         self.cancel_btn = QPushButton("Cancel")
         self.cancel_btn.setObjectName("cancelBtn")  # Add object name for specific styling
@@ -3989,6 +3981,7 @@ class MergerLayerConfigDialog(QDialog):
         """)
         self.cancel_btn.clicked.connect(self.reject)
         
+        button_layout.addWidget(self.verify_all_btn)
         button_layout.addWidget(self.save_btn)
         button_layout.addWidget(self.cancel_btn)
         layout.addLayout(button_layout)
@@ -4267,25 +4260,17 @@ class MergerLayerConfigDialog(QDialog):
                         if layer_path in self.loaded_baseline_data:
                             layer_data = self.loaded_baseline_data[layer_path]
                             
-                            # Convert to the format expected by map_baselines_to_3d_planes_from_data
-                            for json_file, baseline_json in layer_data["baseline_files"].items():
+                            # Group the baseline columns by line type for map_baselines_to_3d_planes_from_data
+                            for json_file, baseline in layer_data["baseline_files"].items():
                                 # Determine line type
                                 if json_file == "road_surface_baseline.json":
                                     ltype = "road_surface"
                                 elif json_file == "deck_baseline.json":
                                     ltype = "deck_line"
                                 else:
-                                    ltype = baseline_json.get("baseline_key", f"type_{len(loaded_data_for_3d)}")
-                                
-                                if ltype not in loaded_data_for_3d:
-                                    loaded_data_for_3d[ltype] = {"polylines": []}
+                                    ltype = baseline.metadata.get("baseline_key", f"type_{len(loaded_data_for_3d)}")
                                 
-                                # Add polylines
-                                for polyline in baseline_json.get("polylines", []):
-                                    poly_data = {
-                                        "points": polyline.get("points", [])
-                                    }
-                                    loaded_data_for_3d[ltype]["polylines"].append(poly_data)
+                                loaded_data_for_3d.setdefault(ltype, []).append(baseline)
                         
                         print(f"✓ Loaded layer: {layer_name}")
                     else:
@@ -4306,8 +4291,8 @@ class MergerLayerConfigDialog(QDialog):
                 if loaded_data_for_3d and hasattr(self.parent(), 'map_baselines_to_3d_planes_from_data'):
                     # Get width (use first available width or default)
                     width = 10.0
-                    for ltype, data in loaded_data_for_3d.items():
-                        if data["polylines"]:
+                    for ltype, baselines in loaded_data_for_3d.items():
+                        if any(len(baseline) for baseline in baselines):
                             # Try to find width in metadata
                             for layer_path in self.loaded_baseline_data:
                                 layer_metadata = self.loaded_baseline_data[layer_path].get("metadata", {})
@@ -4320,7 +4305,9 @@ class MergerLayerConfigDialog(QDialog):
                         if width != 10.0:
                             break
                     
-                    # Call the 3D mapping function
+                    # Call the 3D mapping function (one set of columns per line type)
+                    loaded_data_for_3d = {ltype: BaselineColumns.concatenate(baselines)
+                                          for ltype, baselines in loaded_data_for_3d.items()}
                     self.parent().map_baselines_to_3d_planes_from_data(loaded_data_for_3d, width)
                     
             else:
@@ -4501,54 +4488,21 @@ class MergerLayerConfigDialog(QDialog):
             return
         
         # Check for baseline JSON files
-        json_files_to_check = ["road_surface_baseline.json", "deck_baseline.json"]
-        found_json_file = None
-        found_json_path = None
-        
-        for json_file in json_files_to_check:
-            json_path = os.path.join(layer_folder_path, json_file)
-            if os.path.exists(json_path):
-                found_json_file = json_file
-                found_json_path = json_path
-                break
+        found_json_file, found_json_path = self.find_layer_baseline(layer_folder_path)
         
         if not found_json_file:
             QMessageBox.warning(self, "Verification Failed", 
                             f"No baseline JSON file found in layer: {selected_layer}")
             return
         
-        # Read and parse the JSON file
+        # Look the chainage up in the (cached) chainage index of the baseline
         try:
-            with open(found_json_path, 'r') as f:
-                baseline_data = json.load(f)
-            
-            # Search for the chainage in the JSON data
-            world_coordinates = self.find_chainage_coordinates(baseline_data, chainage_value)
+            chainage_index = self.get_chainage_index(found_json_path)
+            world_coordinates = self.find_chainage_coordinates(chainage_index, chainage_value)
             
             if world_coordinates:
-                # Store the world coordinates in the dictionary using a unique key
-                # Format: {point_number}_{layer_number}: coordinates
-                key = f"point_{verify_btn.point_number}_layer_{layer_number}"
-                self.verified_coordinates[key] = {
-                    "layer_name": selected_layer,
-                    "chainage": chainage_value,
-                    "world_coordinates": world_coordinates,
-                    "baseline_type": baseline_data.get("baseline_type", "Unknown"),
-                    "json_file_name": found_json_file,
-                    "json_file_path": found_json_path,
-                    "layer_folder_path": layer_folder_path
-                }
-                
-                # Store references in the verify_btn object
-                verify_btn.world_coordinates = world_coordinates
-                verify_btn.layer_name = selected_layer
-                verify_btn.chainage_value = chainage_value
-                verify_btn.verification_key = key
-                verify_btn.json_file_path = found_json_path
-                verify_btn.baseline_type = baseline_data.get("baseline_type", "Unknown")
-                
-                # Mark as verified
-                self.mark_as_verified(verify_btn)
+                self.store_verification(verify_btn, layer_number, selected_layer, chainage_value, world_coordinates,
+                                        chainage_index, found_json_file, found_json_path, layer_folder_path)
                 
                 # Optional: Show success message
                 QMessageBox.information(self, "Verification Successful", 
@@ -4566,9 +4520,143 @@ class MergerLayerConfigDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Verification Error", 
                             f"Error reading JSON file: {str(e)}")
+
+    def store_verification(self, verify_btn, layer_number, selected_layer, chainage_value, world_coordinates,
+                           chainage_index, json_file, json_path, layer_folder_path):
+        """Record verified world coordinates for a layer and mark its verify button"""
+        baseline_type = chainage_index.metadata.get("baseline_type", "Unknown")
+        
+        # Store the world coordinates in the dictionary using a unique key
+        # Format: {point_number}_{layer_number}: coordinates
+        key = f"point_{verify_btn.point_number}_layer_{layer_number}"
+        self.verified_coordinates[key] = {
+            "layer_name": selected_layer,
+            "chainage": chainage_value,
+            "world_coordinates": world_coordinates,
+            "baseline_type": baseline_type,
+            "json_file_name": json_file,
+            "json_file_path": json_path,
+            "layer_folder_path": layer_folder_path
+        }
+        
+        # Store references in the verify_btn object
+        verify_btn.world_coordinates = world_coordinates
+        verify_btn.layer_name = selected_layer
+        verify_btn.chainage_value = chainage_value
+        verify_btn.verification_key = key
+        verify_btn.json_file_path = json_path
+        verify_btn.baseline_type = baseline_type
+        
+        # Mark as verified
+        self.mark_as_verified(verify_btn)
+
+    def find_layer_baseline(self, layer_folder_path):
+        """Return (file name, path) of the baseline used for merger points in a layer, or (None, None)"""
+        for json_file in ["road_surface_baseline.json", "deck_baseline.json"]:
+            json_path = os.path.join(layer_folder_path, json_file)
+            if os.path.exists(json_path):
+                return json_file, json_path
+        return None, None
+
+    def get_chainage_index(self, json_path):
+        """ChainageIndex of a baseline file, rebuilt only when the file changes"""
+        mtime = os.path.getmtime(json_path)
+        cached = self.chainage_indexes.get(json_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        # The zero line KM lets labels between the stored vertices be resolved too
+        start_km = None
+        zero_config_path = os.path.join(os.path.dirname(json_path), "zero_line_config.json")
+        if os.path.exists(zero_config_path):
+            try:
+                with open(zero_config_path, 'r', encoding='utf-8') as f:
+                    start_km = json.load(f).get("point1", {}).get("km")
+            except (OSError, ValueError):
+                pass
+        
+        chainage_index = ChainageIndex(read_baseline_columns(json_path), start_km=start_km)
+        self.chainage_indexes[json_path] = (mtime, chainage_index)
+        return chainage_index
+
+    def verify_all_merger_points(self):
+        """Verify every layer of every merger point in one pass (one index lookup per layer)"""
+        if not self.merger_points_widgets:
+            QMessageBox.warning(self, "Verify All", "Create merger points first.")
+            return
+        
+        failures = []
+        verified_count = 0
+        matched_points = []
+        mismatched_points = []
+        
+        for merger_point_widget in self.merger_points_widgets:
+            layout = merger_point_widget.layers_container.layers_layout
+            point_number = None
+            for i in range(layout.count()):
+                widget = layout.itemAt(i).widget()
+                if not widget or not hasattr(widget, 'verify_btn'):
+                    continue
+                verify_btn = widget.verify_btn
+                point_number = verify_btn.point_number
+                layer_number = verify_btn.layer_number
+                label = f"Point {point_number}, layer {layer_number}"
+                if verify_btn.text() == "✓":
+                    continue
+                
+                selected_layer = widget.layer_dropdown.currentText()
+                chainage_value = widget.chainage_input.text().strip()
+                if selected_layer in ["Select Layer", "No layers found", "Error loading layers"]:
+                    failures.append(f"{label}: no layer selected")
+                    continue
+                if not self.validate_chainage_format(chainage_value):
+                    failures.append(f"{label}: invalid chainage '{chainage_value}'")
+                    continue
+                
+                layer_folder_path = os.path.join(self.worksheet_root, "designs", selected_layer)
+                json_file, json_path = self.find_layer_baseline(layer_folder_path)
+                if not json_file:
+                    failures.append(f"{label}: no baseline JSON file in {selected_layer}")
+                    continue
+                
+                try:
+                    chainage_index = self.get_chainage_index(json_path)
+                except Exception as e:
+                    failures.append(f"{label}: error reading {json_file}: {e}")
+                    continue
+                world_coordinates = self.find_chainage_coordinates(chainage_index, chainage_value)
+                if not world_coordinates:
+                    failures.append(f"{label}: chainage {chainage_value} not found in {selected_layer}")
+                    continue
+                
+                self.store_verification(verify_btn, layer_number, selected_layer, chainage_value, world_coordinates,
+                                        chainage_index, json_file, json_path, layer_folder_path)
+                verified_count += 1
+            
+            if point_number is not None:
+                matched = self.check_coordinate_matching(point_number, show_message=False)
+                if matched is True:
+                    matched_points.append(str(point_number))
+                elif matched is False:
+                    mismatched_points.append(str(point_number))
+        
+        summary = f"Verified {verified_count} layer(s).\n"
+        if matched_points:
+            summary += f"\nCoordinates match for merger point(s): {', '.join(matched_points)}"
+        if mismatched_points:
+            summary += (f"\nCoordinates do not match within {self.coordinate_tolerance} m for merger point(s): "
+                        f"{', '.join(mismatched_points)}")
+        if failures:
+            summary += "\n\nNot verified:\n" + "\n".join(failures)
+            QMessageBox.warning(self, "Verify All", summary)
+        else:
+            QMessageBox.information(self, "Verify All", summary)
     
-    def check_coordinate_matching(self, point_number):
-        """Check if all verified layers have matching coordinates within tolerance"""
+    def check_coordinate_matching(self, point_number, show_message=True):
+        """
+        Check if all verified layers have matching coordinates within tolerance.
+        Returns True/False, or None while fewer than two layers are verified.
+        """
         # Find the merger point widget
         merger_point_widget = None
         for widget in self.merger_points_widgets:
@@ -4602,23 +4690,19 @@ class MergerLayerConfigDialog(QDialog):
         
         if not all_verified or len(verified_coordinates) < 2:
             # Not all layers are verified or only one layer is verified
-            return
+            return None
         
-        # Check if all coordinates match within tolerance
+        # Check if all coordinates match the first layer within tolerance (per axis)
+        coords_array = np.asarray(verified_coordinates, dtype=float)
         reference_coords = verified_coordinates[0]
-        coordinates_match = True
-        
-        for i, coords in enumerate(verified_coordinates[1:], 1):
-            if (abs(coords[0] - reference_coords[0]) > self.coordinate_tolerance or
-                abs(coords[1] - reference_coords[1]) > self.coordinate_tolerance or
-                abs(coords[2] - reference_coords[2]) > self.coordinate_tolerance):
-                coordinates_match = False
-                break
+        coordinates_match = bool(np.all(np.abs(coords_array - coords_array[0]) <= self.coordinate_tolerance))
         
         # Show/Hide Connect Layers button based on matching
+        merger_point_widget.connect_layers_btn.setVisible(coordinates_match)
+        if not show_message:
+            return coordinates_match
+        
         if coordinates_match:
-            merger_point_widget.connect_layers_btn.setVisible(True)
-            
             # Show success message
             QMessageBox.information(
                 self,
@@ -4628,8 +4712,6 @@ class MergerLayerConfigDialog(QDialog):
                 f"Tolerance: {self.coordinate_tolerance} meters"
             )
         else:
-            merger_point_widget.connect_layers_btn.setVisible(False)
-            
             # Show warning message
             coordinate_details = "\n".join([f"Layer {i+1}: X={coords[0]:.2f}, Y={coords[1]:.2f}, Z={coords[2]:.2f}" 
                                           for i, coords in enumerate(verified_coordinates)])
@@ -4641,39 +4723,12 @@ class MergerLayerConfigDialog(QDialog):
                 f"Coordinate details:\n{coordinate_details}\n\n" +
                 f"Tolerance: {self.coordinate_tolerance} meters" 
             )
+        return coordinates_match
             
-    def find_chainage_coordinates(self, baseline_data, chainage_value):
-        """Search for chainage in the baseline data and return world coordinates"""
+    def find_chainage_coordinates(self, chainage_index, chainage_value):
+        """Look the chainage up in a layer's ChainageIndex and return world coordinates (or None)"""
         try:
-            # Check if the data has polylines
-            if "polylines" not in baseline_data:
-                return None
-            
-            # Search through all polylines and their points
-            for polyline in baseline_data["polylines"]:
-                if "points" not in polyline:
-                    continue
-                
-                for point in polyline["points"]:
-                    # Check if chainage matches (comparing string representation)
-                    if point.get("chainage_str") == chainage_value:
-                        return point.get("world_coordinates")
-            
-            # If not found by string, try to find by chainage_m if chainage_value can be converted to float
-            try:
-                chainage_m = float(chainage_value)
-                for polyline in baseline_data["polylines"]:
-                    if "points" not in polyline:
-                        continue
-                    
-                    for point in polyline["points"]:
-                        # Find the closest chainage (within a small tolerance)
-                        if abs(point.get("chainage_m", 0) - chainage_m) < 0.001:
-                            return point.get("world_coordinates")
-            except ValueError:
-                pass  # chainage_value cannot be converted to float
-            
-            return None
+            return chainage_index.lookup(chainage_value)
         except Exception as e:
             print(f"Error finding chainage coordinates: {e}")
             return None
@@ -4723,13 +4778,10 @@ class MergerLayerConfigDialog(QDialog):
                 designs_path = os.path.join(self.worksheet_root, "designs")
                 
                 if os.path.exists(designs_path):
-                    # List all folders in designs directory
-                    for item in os.listdir(designs_path):
-                        item_path = os.path.join(designs_path, item)
-                        # Check if it's a directory (folder)
-                        if os.path.isdir(item_path):
-                            dropdown.addItem(item)
-                            layer_count += 1
+                    # All folders in the designs directory
+                    for item in get_catalog().subdirectories(designs_path):
+                        dropdown.addItem(item)
+                        layer_count += 1
             
             # If no layers found, clear dropdown and show message
             if layer_count == 0:
@@ -4919,7 +4971,8 @@ class MergerLayerConfigDialog(QDialog):
 
     def load_baselines_from_json(self, layer_path):
         """
-        Load baseline data from JSON files in the layer directory.
+        Load baseline data from the baseline files in the layer directory.
+        Files are kept as BaselineColumns (columnar .npz or legacy JSON on disk).
         Returns True if data was loaded successfully, False otherwise.
         """
         try:
@@ -4934,48 +4987,35 @@ class MergerLayerConfigDialog(QDialog):
                 "layer_path": layer_path,
                 "baseline_files": {},
                 "polylines": [],
-                "points": [],
                 "metadata": {}
             }
             
             files_loaded = 0
+            total_points = 0
             
             for json_file in json_files_to_check:
                 json_path = os.path.join(layer_path, json_file)
                 
                 if os.path.exists(json_path):
                     try:
-                        with open(json_path, 'r') as f:
-                            baseline_data = json.load(f)
+                        baseline = read_baseline_columns(json_path)
+                        baseline_data = baseline.metadata
                         
                         # Store the file data
-                        loaded_data["baseline_files"][json_file] = baseline_data
+                        loaded_data["baseline_files"][json_file] = baseline
                         files_loaded += 1
+                        total_points += baseline.point_count
                         
-                        # Extract and process polylines
-                        if "polylines" in baseline_data:
-                            for polyline in baseline_data["polylines"]:
-                                polyline_info = {
-                                    "baseline_file": json_file,
-                                    "start_chainage_m": polyline.get("start_chainage_m"),
-                                    "start_chainage_str": polyline.get("start_chainage_str"),
-                                    "end_chainage_m": polyline.get("end_chainage_m"),
-                                    "end_chainage_str": polyline.get("end_chainage_str"),
-                                    "points": []
-                                }
-                                
-                                if "points" in polyline:
-                                    for point in polyline["points"]:
-                                        point_info = {
-                                            "chainage_m": point.get("chainage_m"),
-                                            "chainage_str": point.get("chainage_str"),
-                                            "relative_elevation_m": point.get("relative_elevation_m"),
-                                            "world_coordinates": point.get("world_coordinates")
-                                        }
-                                        polyline_info["points"].append(point_info)
-                                        loaded_data["points"].append(point_info)
-                                
-                                loaded_data["polylines"].append(polyline_info)
+                        # Polyline ranges (the points stay in the baseline columns)
+                        for polyline in baseline_data.get("polylines", []):
+                            polyline_info = {
+                                "baseline_file": json_file,
+                                "start_chainage_m": polyline.get("start_chainage_m"),
+                                "start_chainage_str": polyline.get("start_chainage_str"),
+                                "end_chainage_m": polyline.get("end_chainage_m"),
+                                "end_chainage_str": polyline.get("end_chainage_str"),
+                            }
+                            loaded_data["polylines"].append(polyline_info)
                         
                         # Extract metadata
                         if json_file not in loaded_data["metadata"]:
@@ -4989,7 +5029,7 @@ class MergerLayerConfigDialog(QDialog):
                         
                         print(f"✓ Loaded {json_file} from {layer_path}")
                         print(f"  - Baseline type: {baseline_data.get('baseline_type', 'Unknown')}")
-                        print(f"  - Polylines: {len(baseline_data.get('polylines', []))}")
+                        print(f"  - Polylines: {len(baseline)}")
                         
                     except json.JSONDecodeError as e:
                         print(f"✗ Error parsing JSON file {json_file}: {e}")
@@ -5002,7 +5042,6 @@ class MergerLayerConfigDialog(QDialog):
             
             # Calculate summary statistics
             total_polylines = len(loaded_data["polylines"])
-            total_points = len(loaded_data["points"])
             
             loaded_data["summary"] = {
                 "files_loaded": files_loaded,
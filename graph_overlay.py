@@ -0,0 +1,97 @@
+# graph_overlay.py
+import numpy as np
+
+
+class LineVertexIndex:
+    """
+    Vertices of a group of matplotlib lines sorted by x (chainage).
+
+    nearest() binary-searches the x window around the cursor and only measures the
+    distance to the vertices inside it, instead of every vertex of every line.
+    """
+
+    def __init__(self, artists):
+        xs, ys = [], []
+        for artist in artists:
+            if not hasattr(artist, 'get_xdata'):
+                continue
+            x = np.asarray(artist.get_xdata(), dtype=np.float64)
+            y = np.asarray(artist.get_ydata(), dtype=np.float64)
+            if len(x) and len(x) == len(y):
+                xs.append(x)
+                ys.append(y)
+        xs = np.concatenate(xs) if xs else np.empty(0)
+        ys = np.concatenate(ys) if ys else np.empty(0)
+        order = np.argsort(xs, kind='stable')
+        self.xs = xs[order]
+        self.ys = ys[order]
+
+    @staticmethod
+    def signature(artists):
+        """Cheap key that changes whenever a line is added, removed or gets new data"""
+        key = []
+        for artist in artists:
+            if hasattr(artist, 'get_xdata'):
+                xdata = artist.get_xdata(orig=True)
+                key.append((id(artist), id(xdata), len(xdata)))
+        return tuple(key)
+
+    def nearest(self, x, y, max_distance):
+        """Return (x, y) of the closest vertex within max_distance of (x, y), or None"""
+        start = np.searchsorted(self.xs, x - max_distance, side='left')
+        stop = np.searchsorted(self.xs, x + max_distance, side='right')
+        if start >= stop:
+            return None
+        distances = np.hypot(self.xs[start:stop] - x, self.ys[start:stop] - y)
+        idx = int(np.argmin(distances))
+        if distances[idx] >= max_distance:
+            return None
+        return self.xs[start + idx], self.ys[start + idx]
+
+
+class BlitOverlay:
+    """
+    Animated artists drawn over a cached copy of the rest of the figure.
+
+    The background is captured on every full draw of the canvas; update() restores it and
+    redraws only the overlay artists, so moving a marker or an annotation does not redraw
+    the axes, lines and labels underneath.
+    """
+
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self.artists = []
+        self.background = None
+        self.cid_draw = canvas.mpl_connect('draw_event', self.on_draw)
+        for artist in artists:
+            self.add_artist(artist)
+
+    def add_artist(self, artist):
+        if artist not in self.artists:
+            artist.set_animated(True)
+            self.artists.append(artist)
+            # The cached background may still contain the artist drawn in place
+            self.background = None
+
+    def on_draw(self, event):
+        # Every full draw (layers changed, resize, zoom) refreshes the cached background
+        figure = self.canvas.figure
+        self.artists = [artist for artist in self.artists if artist.figure is figure]
+        self.background = self.canvas.copy_from_bbox(figure.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            # Artists removed from the figure (e.g. by ax.clear()) are skipped
+            if artist.figure is figure and artist.get_visible():
+                figure.draw_artist(artist)
+
+    def update(self):
+        """Redraw the overlay artists only (falls back to a full draw before the first one)"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
@@ -12,6 +12,7 @@ from PyQt5.QtCore import Qt, QTimer, QPointF, QRectF
 from PyQt5.QtGui import QCursor, QPixmap, QIcon, QPainter, QColor, QRadialGradient, QLinearGradient, QPainterPath, QPen
 from passlib.hash import django_pbkdf2_sha256
 from database import DatabaseHandler
+from db_executor import get_db_executor
 
 # Folder and file paths
 USER_FOLDER = r"E:\3D_Tool\user"
@@ -19,6 +20,54 @@ LAST_LOGIN_FILE = os.path.join(USER_FOLDER, "last_login.json")
 os.makedirs(USER_FOLDER, exist_ok=True)
 
 
+def authenticate_user(username, password):
+    """User row for valid credentials, otherwise None (runs on a database worker thread)"""
+    with DatabaseHandler() as db:
+        db.cursor.execute(
+            "SELECT user_id, user_full_name, user_email, user_username, user_password, "
+            "user_mobile_no, user_type, status, user_inserted_on, valid_till "
+            "FROM user_header_all WHERE user_username = %s AND status = 1",
+            (username,)
+        )
+        rows = db.cursor.fetchall()
+    user = rows[0] if rows else None
+    if not user or not django_pbkdf2_sha256.verify(password, user['user_password']):
+        return None
+    return user
+
+
+def register_user(full_name, email, username, mobile, password):
+    """Insert a new user; False if the username is taken (runs on a database worker thread)"""
+    with DatabaseHandler() as db:
+        # Check the username before reserving an ID for it
+        db.cursor.execute("SELECT 1 FROM user_header_all WHERE user_username = %s LIMIT 1", (username,))
+        if db.cursor.fetchall():
+            return False
+
+        user_id = db.get_next_id('user_header_all')
+        hashed_pw = django_pbkdf2_sha256.hash(password)
+        now = datetime.now()
+        future = datetime(9999, 12, 31, 23, 59, 59)
+
+        query = """
+        INSERT INTO user_header_all (
+            user_id, user_full_name, user_email, user_username, user_password,
+            user_mobile_no, user_type, status, user_inserted_on, valid_till,
+            permitted_operation, mobile_token
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+
+        values = (
+            user_id, full_name, email, username, hashed_pw,
+            mobile, 1, 1, now, future,
+            1, ''
+        )
+
+        db.cursor.execute(query, values)
+        db.connection.commit()
+    return True
+
+
 class Particle:
     """A glowing particle for the tech animation"""
     def __init__(self, x, y, speed, angle, size, color):
@@ -110,6 +159,7 @@ class LoginDialog(QDialog):
         
         self.logged_in_username = None
         self.logged_in_user_id = None
+        self.db_task = None  # login/registration running on the database executor
         self.load_last_login()
 
     def init_particles(self):
@@ -564,7 +614,7 @@ class LoginDialog(QDialog):
         # Login button
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
-        login_btn = QPushButton("  Login  ")
+        self.login_btn = login_btn = QPushButton("  Login  ")
         login_btn.setCursor(QCursor(Qt.PointingHandCursor))
         login_btn.setStyleSheet("""
             QPushButton {
@@ -726,7 +776,7 @@ class LoginDialog(QDialog):
         # Register button
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
-        reg_btn = QPushButton("  Create Account  ")
+        self.reg_btn = reg_btn = QPushButton("  Create Account  ")
         reg_btn.setCursor(QCursor(Qt.PointingHandCursor))
         reg_btn.setStyleSheet("""
             QPushButton {
@@ -770,54 +820,45 @@ class LoginDialog(QDialog):
             QMessageBox.warning(self, "Error", "Mobile number must be 10 digits!")
             return
 
-        db = DatabaseHandler()
-        if not db.connect():
-            QMessageBox.critical(self, "Error", "Cannot connect to database.")
+        task = self.run_db_task(register_user, self.reg_btn, "  Creating Account...  ",
+                                full_name, email, username, mobile, password)
+        if task is None:
             return
+        task.succeeded.connect(lambda created: self.on_registered(created, username))
+        task.failed.connect(lambda message: QMessageBox.critical(self, "Error", f"Registration failed:\n{message}"))
 
-        try:
-            user_id = db.get_next_id('user_header_all')
-
-            # Check username exists
-            db.cursor.execute("SELECT 1 FROM user_header_all WHERE user_username = %s LIMIT 1", (username,))
-            if db.cursor.fetchone():
-                QMessageBox.warning(self, "Error", "Username already exists!")
-                return
-
-            hashed_pw = django_pbkdf2_sha256.hash(password)
-            now = datetime.now()
-            future = datetime(9999, 12, 31, 23, 59, 59)
-
-            query = """
-            INSERT INTO user_header_all (
-                user_id, user_full_name, user_email, user_username, user_password,
-                user_mobile_no, user_type, status, user_inserted_on, valid_till,
-                permitted_operation, mobile_token
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-
-            values = (
-                user_id, full_name, email, username, hashed_pw,
-                mobile, 1, 1, now, future,
-                1, ''
-            )
-
-            db.cursor.execute(query, values)
-            db.connection.commit()
-
-            #QMessageBox.information(self, "Success", f"User '{username}' registered successfully!\nPlease login with your credentials.")
-            self.reg_full_name.clear()
-            self.reg_email.clear()
-            self.reg_username.clear()
-            self.reg_mobile.clear()
-            self.reg_password.clear()
-            self.reg_confirm.clear()
-            self.tabs.setCurrentIndex(0)
+    def on_registered(self, created, username):
+        if not created:
+            QMessageBox.warning(self, "Error", "Username already exists!")
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Registration failed:\n{str(e)}")
-        finally:
-            db.disconnect()
+        #QMessageBox.information(self, "Success", f"User '{username}' registered successfully!\nPlease login with your credentials.")
+        self.reg_full_name.clear()
+        self.reg_email.clear()
+        self.reg_username.clear()
+        self.reg_mobile.clear()
+        self.reg_password.clear()
+        self.reg_confirm.clear()
+        self.tabs.setCurrentIndex(0)
+
+    def run_db_task(self, fn, button, busy_text, *args):
+        """Run fn on the database executor with button showing busy_text until it finishes"""
+        if self.db_task is not None:
+            return None  # One request at a time
+        idle_text = button.text()
+        button.setEnabled(False)
+        button.setText(busy_text)
+        self.setCursor(Qt.BusyCursor)
+
+        def finished():
+            self.db_task = None
+            button.setEnabled(True)
+            button.setText(idle_text)
+            self.unsetCursor()
+
+        self.db_task = get_db_executor().submit(fn, *args)
+        self.db_task.finished.connect(finished)
+        return self.db_task
 
     def do_login(self):
         username = self.login_username.text().strip()
@@ -827,30 +868,19 @@ class LoginDialog(QDialog):
             QMessageBox.warning(self, "Error", "Please enter username and password!")
             return
 
-        db = DatabaseHandler()
-        if not db.connect():
-            QMessageBox.critical(self, "Error", "Cannot connect to database.")
+        task = self.run_db_task(authenticate_user, self.login_btn, "  Signing in...  ", username, password)
+        if task is None:
             return
+        task.succeeded.connect(lambda user: self.on_authenticated(user, username))
+        task.failed.connect(lambda message: QMessageBox.critical(self, "Error", f"Login error:\n{message}"))
 
-        try:
-            # Query database for user verification with all details
-            db.cursor.execute(
-                "SELECT user_id, user_full_name, user_email, user_username, user_password, "
-                "user_mobile_no, user_type, status, user_inserted_on, valid_till "
-                "FROM user_header_all WHERE user_username = %s AND status = 1",
-                (username,)
-            )
-            user = db.cursor.fetchone()
-
-            # Verify username and password
-            if not user:
-                QMessageBox.warning(self, "Login Failed", "Invalid username or password!")
-                return
-
-            if not django_pbkdf2_sha256.verify(password, user['user_password']):
-                QMessageBox.warning(self, "Login Failed", "Invalid username or password!")
-                return
+    def on_authenticated(self, user, username):
+        # Verify username and password
+        if not user:
+            QMessageBox.warning(self, "Login Failed", "Invalid username or password!")
+            return
 
+        try:
             # ========== LOGIN SUCCESSFUL ==========
             user_id = user['user_id']
             self.logged_in_username = username
@@ -898,12 +928,12 @@ class LoginDialog(QDialog):
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Login error:\n{str(e)}")
-        finally:
-            db.disconnect()
 
     def close_application(self):
         """Close the entire application when X button is clicked"""
         from PyQt5.QtWidgets import QApplication
+        if self.db_task is not None:
+            self.db_task.cancel()
         QApplication.quit()
 
     def resizeEvent(self, event):
@@ -1,17 +1,34 @@
 # main.py
 import sys
 import os
+import threading
 
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication, QDialog
 
-from pointcloudviewer import PointCloudViewer
+# Only PyQt5-based modules are imported before the login screen; pointcloudviewer pulls in
+# open3d, vtk, matplotlib, scipy and dialogs and is imported by preload_viewer meanwhile
 from login import LoginDialog
 from welcome_page import WelcomePage
 
+# Delay before the background import starts, so the login screen paints first
+PRELOAD_DELAY_MS = 300
+
+
+def preload_viewer():
+    """Import the main window module on a background thread while the user logs in"""
+    try:
+        import pointcloudviewer
+    except Exception as e:
+        # The import is repeated on the main thread, which reports the error properly
+        print(f"Background import of pointcloudviewer failed: {e}")
+
 
 def main():
     app = QApplication(sys.argv)
 
+    QTimer.singleShot(PRELOAD_DELAY_MS, lambda: threading.Thread(target=preload_viewer, daemon=True).start())
+
     # Show login dialog first
     login_dlg = LoginDialog()
     if login_dlg.exec_() != LoginDialog.Accepted:
@@ -39,6 +56,9 @@ def main():
         # User closed welcome page without clicking Start Now
         sys.exit(0)
 
+    # Already imported by preload_viewer unless the user was faster; then this waits for it
+    from pointcloudviewer import PointCloudViewer
+
     # Show main application window maximized (with taskbar visible)
     window = PointCloudViewer(username=username, user_id=user_id, user_full_name=user_full_name)
     window.showMaximized()
@@ -0,0 +1,307 @@
+# octree_lod.py
+import heapq
+import math
+import time
+from collections import OrderedDict
+
+import numpy as np
+import vtk
+
+from vtk_utils import create_point_cloud_polydata
+
+# Clouds larger than this are shown through OctreeLODRenderer instead of a single actor
+LOD_POINT_THRESHOLD = 3_000_000
+
+
+class OctreeNode:
+    """One cell of the octree; holds a random subsample of the points inside its cube"""
+    __slots__ = ('node_id', 'level', 'center', 'half_size', 'indices', 'children')
+
+    def __init__(self, node_id, level, center, half_size):
+        self.node_id = node_id
+        self.level = level
+        self.center = center
+        self.half_size = half_size
+        self.indices = None
+        self.children = []
+
+    @property
+    def bounds(self):
+        return (self.center[0] - self.half_size, self.center[0] + self.half_size,
+                self.center[1] - self.half_size, self.center[1] + self.half_size,
+                self.center[2] - self.half_size, self.center[2] + self.half_size)
+
+
+class PointCloudOctree:
+    """
+    Additive level-of-detail octree (the layout Potree uses).
+
+    Points are shuffled once, then every node keeps the first node_capacity points of its cube
+    and hands the rest to its eight children. Each node is therefore a uniform subsample of its
+    region and a parent plus its loaded children never duplicate points. Nodes only store index
+    arrays into the source arrays, which may be memory maps (see point_cache).
+    """
+
+    def __init__(self, points, colors=None, node_capacity=50_000, max_depth=16, chunk_size=5_000_000,
+                 seed=0, should_stop=None):
+        self.points = points
+        self.colors = colors
+        self.node_capacity = node_capacity
+        self.max_depth = max_depth
+        self.chunk_size = chunk_size
+        self.nodes = []
+
+        count = len(points)
+        index_dtype = np.int32 if count < 2 ** 31 else np.int64
+        order = np.arange(count, dtype=index_dtype)
+        np.random.default_rng(seed).shuffle(order)
+
+        mins, maxs = self._bounds(points)
+        center = (mins + maxs) / 2.0
+        half_size = max(float(np.max(maxs - mins)) / 2.0, 1e-6)
+        self.root = self._new_node(0, center, half_size)
+
+        stack = [(self.root, order)]
+        while stack:
+            if should_stop and should_stop():
+                raise InterruptedError("Octree build cancelled")
+            node, indices = stack.pop()
+            if len(indices) <= node_capacity or node.level >= max_depth:
+                node.indices = indices
+                continue
+            node.indices = indices[:node_capacity]
+            rest = indices[node_capacity:]
+            octants = self._octants(rest, node.center)
+            order = np.argsort(octants, kind='stable')
+            splits = np.cumsum(np.bincount(octants, minlength=8))[:-1]
+            quarter = node.half_size / 2.0
+            for octant, child_indices in enumerate(np.split(rest[order], splits)):
+                if not len(child_indices):
+                    continue
+                offset = np.array([quarter if octant & 1 else -quarter,
+                                   quarter if octant & 2 else -quarter,
+                                   quarter if octant & 4 else -quarter])
+                child = self._new_node(node.level + 1, node.center + offset, quarter)
+                node.children.append(child)
+                stack.append((child, child_indices))
+
+    def node_table(self):
+        """
+        Per-node arrays (level, center, half_size, parent id, offsets into the concatenated node
+        indices) plus node_capacity and max_depth; with the indices this is the whole tree.
+        """
+        num_nodes = len(self.nodes)
+        parents = np.full(num_nodes, -1, dtype=np.int64)
+        for node in self.nodes:
+            for child in node.children:
+                parents[child.node_id] = node.node_id
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum([len(node.indices) for node in self.nodes], out=offsets[1:])
+        return {
+            "levels": np.array([node.level for node in self.nodes], dtype=np.int32),
+            "centers": np.array([node.center for node in self.nodes], dtype=np.float64).reshape(-1, 3),
+            "half_sizes": np.array([node.half_size for node in self.nodes], dtype=np.float64),
+            "parents": parents,
+            "offsets": offsets,
+            "node_capacity": np.int64(self.node_capacity),
+            "max_depth": np.int64(self.max_depth),
+        }
+
+    @classmethod
+    def from_node_table(cls, points, colors, table, indices, chunk_size=5_000_000):
+        """
+        Rebuild an octree from node_table() and the concatenated node indices without touching
+        the points; node index arrays are slices of indices, so a memory map stays mapped.
+        """
+        octree = cls.__new__(cls)
+        octree.points = points
+        octree.colors = colors
+        octree.node_capacity = int(table["node_capacity"])
+        octree.max_depth = int(table["max_depth"])
+        octree.chunk_size = chunk_size
+        octree.nodes = []
+        offsets = table["offsets"]
+        # Parents always precede their children, so children keep their original order
+        for node_id, (level, center, half_size, parent) in enumerate(
+                zip(table["levels"], table["centers"], table["half_sizes"], table["parents"])):
+            node = octree._new_node(int(level), center, float(half_size))
+            node.indices = indices[offsets[node_id]:offsets[node_id + 1]]
+            if parent >= 0:
+                octree.nodes[parent].children.append(node)
+        octree.root = octree.nodes[0]
+        return octree
+
+    def _new_node(self, level, center, half_size):
+        node = OctreeNode(len(self.nodes), level, center, half_size)
+        self.nodes.append(node)
+        return node
+
+    def _bounds(self, points):
+        mins = np.full(3, np.inf)
+        maxs = np.full(3, -np.inf)
+        for start in range(0, len(points), self.chunk_size):
+            block = points[start:start + self.chunk_size]
+            mins = np.minimum(mins, block.min(axis=0))
+            maxs = np.maximum(maxs, block.max(axis=0))
+        return mins, maxs
+
+    def _octants(self, indices, center):
+        """Octant code (bit 0 = +x, bit 1 = +y, bit 2 = +z) of each point, computed in chunks"""
+        octants = np.empty(len(indices), dtype=np.uint8)
+        for start in range(0, len(indices), self.chunk_size):
+            block = self.points[indices[start:start + self.chunk_size]]
+            octants[start:start + len(block)] = ((block[:, 0] > center[0]).astype(np.uint8)
+                                                 | ((block[:, 1] > center[1]).astype(np.uint8) << 1)
+                                                 | ((block[:, 2] > center[2]).astype(np.uint8) << 2))
+        return octants
+
+    def node_polydata(self, node):
+        points = np.asarray(self.points[node.indices], dtype=np.float64)
+        colors = self.colors[node.indices] if self.colors is not None else None
+        return create_point_cloud_polydata(points, colors)
+
+
+class OctreeLODRenderer:
+    """
+    Keeps the octree nodes that matter for the current camera in a vtkAssembly.
+
+    update() walks the tree in order of projected node size, culls nodes outside the view
+    frustum, refines while a node's point spacing is wider than min_pixel_spacing on screen
+    and stops at point_budget. New node actors are only built for frame_budget_ms per call;
+    update() returns True when the shown nodes changed, and pending stays True while work is
+    left so the caller can schedule another pass.
+    """
+
+    def __init__(self, renderer, octree, point_size=2, point_budget=1_500_000, min_pixel_spacing=2.0,
+                 frame_budget_ms=8.0, cache_points=6_000_000, default_color=(0.0, 0.0, 0.0)):
+        self.renderer = renderer
+        self.octree = octree
+        self.point_size = point_size
+        self.point_budget = point_budget
+        self.min_pixel_spacing = min_pixel_spacing
+        self.frame_budget_ms = frame_budget_ms
+        self.cache_points = cache_points
+        self.default_color = default_color
+
+        self.assembly = vtk.vtkAssembly()
+        self.visible_ids = set()
+        self.actor_cache = OrderedDict()  # node_id -> actor, least recently used first
+        self.last_camera_state = None
+        self.pending = False
+
+        # The root is always shown so there is something on screen from the first frame
+        self._show_node(self.octree.root)
+
+    def _camera_state(self):
+        camera = self.renderer.GetActiveCamera()
+        return (camera.GetPosition(), camera.GetFocalPoint(), camera.GetViewUp(), camera.GetViewAngle(),
+                camera.GetParallelProjection(), camera.GetParallelScale(), tuple(self.renderer.GetSize()))
+
+    def _frustum_planes(self):
+        planes = [0.0] * 24
+        self.renderer.GetActiveCamera().GetFrustumPlanes(self.renderer.GetTiledAspectRatio(), planes)
+        return np.array(planes).reshape(6, 4)
+
+    @staticmethod
+    def _in_frustum(node, planes):
+        # Test the box corner furthest along each (inward pointing) plane normal
+        corner = node.center + np.where(planes[:, :3] >= 0, node.half_size, -node.half_size)
+        return bool(np.all(np.einsum('ij,ij->i', planes[:, :3], corner) + planes[:, 3] >= 0))
+
+    def _projected_spacing(self, node, camera, pixels_per_radian):
+        """Approximate on-screen distance (pixels) between neighbouring points of the node"""
+        spacing = 2.0 * node.half_size / math.sqrt(max(len(node.indices), 1))
+        if camera.GetParallelProjection():
+            return spacing * self.renderer.GetSize()[1] / (2.0 * max(camera.GetParallelScale(), 1e-9))
+        distance = np.linalg.norm(np.asarray(camera.GetPosition()) - node.center) - node.half_size * math.sqrt(3)
+        return spacing * pixels_per_radian / max(distance, 1e-6)
+
+    def select_nodes(self):
+        """Return the nodes to show for the current camera, most important first"""
+        camera = self.renderer.GetActiveCamera()
+        height = max(self.renderer.GetSize()[1], 1)
+        pixels_per_radian = height / (2.0 * math.tan(math.radians(camera.GetViewAngle()) / 2.0))
+        planes = self._frustum_planes()
+
+        root = self.octree.root
+        selected = [root]
+        total = len(root.indices)
+        heap = []
+        counter = 0
+        for child in root.children:
+            heapq.heappush(heap, (-self._projected_spacing(child, camera, pixels_per_radian), counter, child))
+            counter += 1
+        while heap:
+            neg_spacing, _, node = heapq.heappop(heap)
+            if total + len(node.indices) > self.point_budget:
+                continue
+            if not self._in_frustum(node, planes):
+                continue
+            selected.append(node)
+            total += len(node.indices)
+            if -neg_spacing > self.min_pixel_spacing:
+                for child in node.children:
+                    heapq.heappush(heap, (-self._projected_spacing(child, camera, pixels_per_radian), counter, child))
+                    counter += 1
+        return selected
+
+    def update(self, force=False):
+        """Swap node actors for the current camera; returns True if the shown nodes changed"""
+        state = self._camera_state()
+        if not force and not self.pending and state == self.last_camera_state:
+            return False
+        self.last_camera_state = state
+
+        selected = self.select_nodes()
+        selected_ids = {node.node_id for node in selected}
+        changed = False
+        for node_id in list(self.visible_ids - selected_ids):
+            self._hide_node(node_id)
+            changed = True
+
+        deadline = time.perf_counter() + self.frame_budget_ms / 1000.0
+        self.pending = False
+        for node in selected:
+            if node.node_id in self.visible_ids:
+                continue
+            if node.node_id not in self.actor_cache and time.perf_counter() > deadline:
+                self.pending = True
+                continue
+            self._show_node(node)
+            changed = True
+        self._trim_cache()
+        return changed
+
+    def _show_node(self, node):
+        actor = self.actor_cache.pop(node.node_id, None)
+        if actor is None:
+            mapper = vtk.vtkPolyDataMapper()
+            mapper.SetInputData(self.octree.node_polydata(node))
+            actor = vtk.vtkActor()
+            actor.SetMapper(mapper)
+            actor.GetProperty().SetPointSize(self.point_size)
+            if self.octree.colors is None:
+                actor.GetProperty().SetColor(self.default_color)
+        self.actor_cache[node.node_id] = actor
+        self.assembly.AddPart(actor)
+        self.visible_ids.add(node.node_id)
+
+    def _hide_node(self, node_id):
+        actor = self.actor_cache.get(node_id)
+        if actor is not None:
+            self.assembly.RemovePart(actor)
+        self.visible_ids.discard(node_id)
+
+    def _trim_cache(self):
+        """Drop the least recently used hidden node actors once the cache exceeds cache_points"""
+        cached = sum(len(self.octree.nodes[node_id].indices) for node_id in self.actor_cache)
+        for node_id in list(self.actor_cache):
+            if cached <= self.cache_points:
+                break
+            if node_id in self.visible_ids:
+                continue
+            cached -= len(self.octree.nodes[node_id].indices)
+            del self.actor_cache[node_id]
+
+    def visible_point_count(self):
+        return sum(len(self.octree.nodes[node_id].indices) for node_id in self.visible_ids)
@@ -0,0 +1,235 @@
+# point_cache.py
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+
+CACHE_VERSION = 1
+CACHE_FOLDER_NAME = "point_cloud_cache"
+# Optional octree of an entry (see save_point_octree); the node table is written last
+OCTREE_INDICES_FILE = "octree_indices.npy"
+OCTREE_NODES_FILE = "octree_nodes.npz"
+# Bytes hashed from the start, middle and end of the source file to build the cache key
+HASH_SAMPLE_BYTES = 1024 * 1024
+
+
+def cache_key(file_path):
+    """Content hash of the source file built from its size and start/middle/end samples"""
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha1(str(size).encode())
+    with open(file_path, 'rb') as f:
+        for offset in (0, max(0, size // 2 - HASH_SAMPLE_BYTES // 2), max(0, size - HASH_SAMPLE_BYTES)):
+            f.seek(offset)
+            digest.update(f.read(HASH_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+def source_stat(file_path):
+    stat = os.stat(file_path)
+    return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+
+
+class CachedPointCloud:
+    """
+    Point cloud opened from a cache entry: memory-mapped float64 positions and uint8 colors.
+
+    Display, octree, KD-tree and DEM read the arrays through point_cloud_arrays(), so opening
+    copies nothing. The open3d.geometry.PointCloud (a float64 copy of positions and colors) is
+    only built the first time .points, .colors or another open3d method is used.
+    """
+
+    def __init__(self, points, colors=None):
+        self.positions = points
+        self.rgb = colors
+        self._cloud = None
+
+    def has_points(self):
+        return len(self.positions) > 0
+
+    def has_colors(self):
+        return self.rgb is not None
+
+    def is_empty(self):
+        return not self.has_points()
+
+    def to_open3d(self):
+        if self._cloud is None:
+            self._cloud = open3d_point_cloud(self.positions, self.rgb)
+        return self._cloud
+
+    @property
+    def points(self):
+        return self.to_open3d().points
+
+    @property
+    def colors(self):
+        return self.to_open3d().colors
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.to_open3d(), name)
+
+
+def point_cloud_arrays(point_cloud):
+    """
+    (points, colors or None) of an open3d PointCloud (views of its buffers, colors 0-1 float)
+    or of a CachedPointCloud (memory map, colors 0-255 uint8); neither is copied.
+    """
+    if isinstance(point_cloud, CachedPointCloud):
+        return point_cloud.positions, point_cloud.rgb
+    points = np.asarray(point_cloud.points)
+    colors = np.asarray(point_cloud.colors) if point_cloud.has_colors() else None
+    return points, colors
+
+
+def open3d_point_cloud(points, colors=None):
+    """New open3d PointCloud from (N, 3) points and 0-1 float or 0-255 uint8 colors"""
+    import open3d as o3d
+    cloud = o3d.geometry.PointCloud()
+    cloud.points = o3d.utility.Vector3dVector(np.asarray(points, dtype=np.float64))
+    if colors is not None:
+        colors = np.asarray(colors)
+        cloud.colors = o3d.utility.Vector3dVector(colors / 255.0 if colors.dtype == np.uint8 else colors)
+    return cloud
+
+
+def load_point_cache(file_path, cache_dir):
+    """
+    Open the cached copy of file_path if it is still valid, otherwise return None.
+
+    Positions come back as a read-only memory map, so opening is O(1) in the point count.
+    Returns a dict with 'points' (N, 3) float64, 'colors' (N, 3) uint8 or None, 'bounds'
+    ([min_x, min_y, min_z], [max_x, max_y, max_z]) and 'octree', the (node table, memory-mapped
+    indices) pair saved by save_point_octree or None.
+    """
+    entry_dir = os.path.join(cache_dir, cache_key(file_path))
+    meta_path = os.path.join(entry_dir, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION:
+            return None
+        stat = source_stat(file_path)
+        if (meta.get("source_size"), meta.get("source_mtime_ns")) != (stat["source_size"], stat["source_mtime_ns"]):
+            return None
+        points = np.load(os.path.join(entry_dir, "positions.npy"), mmap_mode='r')
+        colors = None
+        if meta.get("has_colors"):
+            colors = np.load(os.path.join(entry_dir, "colors.npy"), mmap_mode='r')
+        if len(points) != meta.get("count") or (colors is not None and len(colors) != len(points)):
+            return None
+        octree = load_point_octree(entry_dir, len(points))
+        return {"points": points, "colors": colors, "bounds": meta.get("bounds"), "octree": octree}
+    except (OSError, ValueError):
+        return None
+
+
+def load_point_octree(entry_dir, count):
+    """(node table dict, indices memory map) of an entry's octree, or None if missing or inconsistent"""
+    nodes_path = os.path.join(entry_dir, OCTREE_NODES_FILE)
+    if not os.path.exists(nodes_path):
+        return None
+    try:
+        with np.load(nodes_path) as data:
+            table = {name: data[name] for name in data.files}
+        indices = np.load(os.path.join(entry_dir, OCTREE_INDICES_FILE), mmap_mode='r')
+        offsets, parents = table["offsets"], table["parents"]
+        num_nodes = len(parents)
+        if (num_nodes == 0 or len(offsets) != num_nodes + 1 or offsets[0] != 0 or offsets[-1] != len(indices)
+                or len(indices) != count or np.any(np.diff(offsets) < 0)
+                or parents[0] != -1 or np.any(parents[1:] >= np.arange(1, num_nodes)) or np.any(parents[1:] < 0)):
+            return None
+        return table, indices
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_point_octree(file_path, cache_dir, octree):
+    """
+    Add the node layout of a PointCloudOctree to the cache entry of file_path, so the next open
+    maps it instead of rebuilding it. The node index arrays are concatenated into
+    octree_indices.npy (memory-mapped on load) and the per-node table goes to octree_nodes.npz;
+    both are renamed into place, the table last, so a partial write is never picked up.
+    Returns False if there is no entry for the file.
+    """
+    entry_dir = os.path.join(cache_dir, cache_key(file_path))
+    if not os.path.exists(os.path.join(entry_dir, "meta.json")):
+        return False
+    table = octree.node_table()
+    offsets = table["offsets"]
+
+    indices_path = os.path.join(entry_dir, OCTREE_INDICES_FILE)
+    nodes_path = os.path.join(entry_dir, OCTREE_NODES_FILE)
+    if os.path.exists(nodes_path):
+        os.remove(nodes_path)
+    tmp_path = indices_path + ".tmp"
+    index_dtype = octree.nodes[0].indices.dtype
+    indices = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=index_dtype, shape=(int(offsets[-1]),))
+    for node, start, end in zip(octree.nodes, offsets[:-1], offsets[1:]):
+        indices[start:end] = node.indices
+    indices.flush()
+    del indices
+    os.replace(tmp_path, indices_path)
+
+    tmp_path = nodes_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **table)
+    os.replace(tmp_path, nodes_path)
+    return True
+
+
+def save_point_cache(file_path, cache_dir, points, colors=None):
+    """
+    Write positions (float64), colors (uint8) and bounds for file_path into cache_dir.
+
+    The entry is written to a temporary folder and renamed into place, so a crash never
+    leaves a half-written cache behind. Returns the entry folder.
+    """
+    key = cache_key(file_path)
+    entry_dir = os.path.join(cache_dir, key)
+    tmp_dir = entry_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    points = np.asarray(points, dtype=np.float64)
+    np.save(os.path.join(tmp_dir, "positions.npy"), points)
+    if colors is not None:
+        colors = np.asarray(colors)
+        if colors.dtype != np.uint8:
+            colors = np.round(np.clip(colors, 0.0, 1.0) * 255).astype(np.uint8)
+        np.save(os.path.join(tmp_dir, "colors.npy"), colors)
+
+    meta = {
+        "version": CACHE_VERSION,
+        "source_path": os.path.abspath(file_path),
+        "count": int(len(points)),
+        "has_colors": colors is not None,
+        "bounds": [points.min(axis=0).tolist(), points.max(axis=0).tolist()] if len(points) else None,
+    }
+    meta.update(source_stat(file_path))
+    with open(os.path.join(tmp_dir, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.replace(tmp_dir, entry_dir)
+    remove_stale_entries(cache_dir, file_path, keep=key)
+    return entry_dir
+
+
+def remove_stale_entries(cache_dir, file_path, keep=None):
+    """Delete cache entries of file_path left over from earlier versions of the file"""
+    source_path = os.path.abspath(file_path)
+    for name in os.listdir(cache_dir):
+        meta_path = os.path.join(cache_dir, name, "meta.json")
+        if name == keep or not os.path.exists(meta_path):
+            continue
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                if json.load(f).get("source_path") == source_path:
+                    shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        except (OSError, ValueError):
+            continue
@@ -0,0 +1,320 @@
+# point_cloud_loader.py
+import os
+import numpy as np
+import open3d as o3d
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from xyz_reader import read_xyz
+from point_cache import CachedPointCloud, load_point_cache, point_cloud_arrays, save_point_cache, save_point_octree
+from octree_lod import PointCloudOctree, LOD_POINT_THRESHOLD
+from spatial_index import PointCloudSpatialIndex
+from dem_raster import ElevationRaster
+
+# PLY property types -> numpy dtypes (little endian binary files only)
+PLY_DTYPES = {
+    'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1',
+    'short': '<i2', 'int16': '<i2', 'ushort': '<u2', 'uint16': '<u2',
+    'int': '<i4', 'int32': '<i4', 'uint': '<u4', 'uint32': '<u4',
+    'float': '<f4', 'float32': '<f4', 'double': '<f8', 'float64': '<f8',
+}
+
+
+class LoadCancelled(Exception):
+    """Raised inside the loader thread when the user cancels loading"""
+
+
+def read_ply_vertex_layout(file_path):
+    """
+    Parse a PLY header and return (vertex_dtype, vertex_count, header_size) when the file is
+    binary little endian with 'vertex' as its first element, otherwise None.
+    """
+    with open(file_path, 'rb') as f:
+        if f.readline().strip() != b'ply':
+            return None
+        fmt = None
+        elements = []
+        while True:
+            line = f.readline()
+            if not line:
+                return None
+            parts = line.decode('ascii', errors='ignore').split()
+            if not parts:
+                continue
+            if parts[0] == 'format':
+                fmt = parts[1]
+            elif parts[0] == 'element':
+                elements.append((parts[1], int(parts[2]), []))
+            elif parts[0] == 'property' and elements:
+                if parts[1] == 'list':
+                    elements[-1][2].append(None)
+                else:
+                    elements[-1][2].append((parts[2], PLY_DTYPES.get(parts[1])))
+            elif parts[0] == 'end_header':
+                header_size = f.tell()
+                break
+
+    if fmt != 'binary_little_endian' or not elements or elements[0][0] != 'vertex':
+        return None
+    name, count, properties = elements[0]
+    if any(p is None or p[1] is None for p in properties):
+        return None
+    names = [p[0] for p in properties]
+    if not all(axis in names for axis in ('x', 'y', 'z')):
+        return None
+    return np.dtype(properties), count, header_size
+
+
+class PointCloudLoader(QThread):
+    """
+    Reads a point cloud file on a worker thread so the GUI stays responsive.
+
+    A coarse subsample is emitted through preview_ready as soon as possible, progress is
+    reported through progress, and the finished point cloud arrives through loaded together
+    with a level-of-detail octree for clouds above LOD_POINT_THRESHOLD points.
+    The thread then keeps running to build the picking KD-tree and emits it via index_ready.
+    Call cancel() to stop; the thread then finishes without emitting loaded.
+
+    When cache_dir is given, a valid binary cache of the file (see point_cache) is opened
+    instead of parsing the source, and a freshly parsed file is written to the cache. A cache
+    hit is emitted as a CachedPointCloud over the memory-mapped arrays, with the octree read
+    back from the entry (built and added to it on the first open).
+    """
+    progress = pyqtSignal(int, str)
+    preview_ready = pyqtSignal(object, object)  # points (N, 3), colors (N, 3) or None
+    loaded = pyqtSignal(object, object)         # open3d PointCloud or CachedPointCloud, PointCloudOctree or None
+    index_ready = pyqtSignal(object, object)    # the same point cloud, PointCloudSpatialIndex
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, cache_dir=None, preview_points=250_000, chunk_points=2_000_000, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        self.preview_points = preview_points
+        self.chunk_points = chunk_points
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def check_cancelled(self):
+        if self._cancelled:
+            raise LoadCancelled()
+
+    def run(self):
+        try:
+            self.progress.emit(5, "Starting file loading...")
+            octree = None
+            cached = self.read_cache()
+            if cached is not None:
+                # Memory map and uint8 colors as they are; open3d copies are made only on demand
+                points, colors = cached["points"], cached["colors"]
+                point_cloud = CachedPointCloud(points, colors)
+                if cached["octree"] is not None:
+                    table, indices = cached["octree"]
+                    octree = PointCloudOctree.from_node_table(points, colors, table, indices)
+            else:
+                ext = os.path.splitext(self.file_path)[1].lower()
+                if ext == '.ply':
+                    points, colors = self.read_ply()
+                elif ext == '.pcd':
+                    points, colors = self.read_with_open3d()
+                elif ext == '.xyz':
+                    points, colors = self.read_xyz()
+                else:
+                    raise ValueError(f"Unsupported file format: {ext}")
+
+                if points is None or len(points) == 0:
+                    raise ValueError("No points found in the file.")
+                self.write_cache(points, colors)
+
+                self.check_cancelled()
+                self.progress.emit(85, "Building point cloud...")
+                point_cloud = o3d.geometry.PointCloud()
+                point_cloud.points = o3d.utility.Vector3dVector(points)
+                if colors is not None:
+                    point_cloud.colors = o3d.utility.Vector3dVector(colors)
+                # Open3D holds its own copy now: free the parsed arrays and build the octree and
+                # the KD-tree over views of its buffers instead
+                del points, colors
+                points, colors = point_cloud_arrays(point_cloud)
+
+            built_octree = False
+            if octree is None and len(points) > LOD_POINT_THRESHOLD:
+                self.progress.emit(88, "Building level of detail...")
+                octree = PointCloudOctree(points, colors, should_stop=lambda: self._cancelled)
+                built_octree = True
+            self.check_cancelled()
+            self.loaded.emit(point_cloud, octree)
+            if built_octree:
+                self.write_octree_cache(octree)
+
+            # The cloud is usable without the index (picking falls back to a brute force search)
+            index = PointCloudSpatialIndex(points)
+            self.check_cancelled()
+            self.index_ready.emit(point_cloud, index)
+        except (LoadCancelled, InterruptedError):
+            pass
+        except Exception as e:
+            if not self._cancelled:
+                self.failed.emit(str(e))
+
+    def emit_preview(self, points, colors=None):
+        """Emit an evenly strided subsample of the given arrays as a coarse preview"""
+        step = max(1, len(points) // self.preview_points)
+        preview_points = np.ascontiguousarray(points[::step], dtype=np.float64)
+        preview_colors = np.ascontiguousarray(colors[::step]) if colors is not None else None
+        self.preview_ready.emit(preview_points, preview_colors)
+
+    def read_cache(self):
+        """Open a valid cache entry for the file (see load_point_cache), returning None on a miss"""
+        if not self.cache_dir:
+            return None
+        cached = load_point_cache(self.file_path, self.cache_dir)
+        if cached is None:
+            return None
+        self.progress.emit(10, "Opening cached point cloud...")
+        # With a saved octree the root node is on screen at once, so no preview is needed
+        if cached["octree"] is None:
+            self.emit_preview(cached["points"], cached["colors"])
+        self.check_cancelled()
+        self.progress.emit(60, "Preparing visualization...")
+        return cached
+
+    def write_cache(self, points, colors):
+        """Store the parsed cloud in the cache; a failed write only costs the next reload"""
+        if not self.cache_dir:
+            return
+        self.check_cancelled()
+        self.progress.emit(80, "Writing point cache...")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            save_point_cache(self.file_path, self.cache_dir, points, colors)
+        except OSError:
+            pass
+
+    def write_octree_cache(self, octree):
+        """Add the octree to the cache entry so the next open maps it instead of rebuilding it"""
+        if not self.cache_dir:
+            return
+        try:
+            save_point_octree(self.file_path, self.cache_dir, octree)
+        except OSError:
+            pass
+
+    def read_ply(self):
+        """Memory-map binary PLY vertices for an instant preview, fall back to open3d otherwise"""
+        layout = read_ply_vertex_layout(self.file_path)
+        if layout is None:
+            return self.read_with_open3d()
+
+        dtype, count, header_size = layout
+        vertices = np.memmap(self.file_path, dtype=dtype, mode='r', offset=header_size, shape=(count,))
+        has_colors = all(c in dtype.names for c in ('red', 'green', 'blue'))
+        # Integer colors (uchar, ushort, ...) span their type's range; open3d scales them to 0-1 too
+        color_scale = None
+        if has_colors:
+            color_scale = np.array([np.iinfo(dtype[c]).max if np.issubdtype(dtype[c], np.integer) else 1.0
+                                    for c in ('red', 'green', 'blue')], dtype=np.float64)
+
+        def to_arrays(block):
+            xyz = np.stack([block['x'], block['y'], block['z']], axis=1).astype(np.float64)
+            rgb = None
+            if has_colors:
+                rgb = np.stack([block['red'], block['green'], block['blue']], axis=1).astype(np.float64)
+                rgb /= color_scale
+            return xyz, rgb
+
+        self.progress.emit(10, "Building preview...")
+        step = max(1, count // self.preview_points)
+        self.emit_preview(*to_arrays(vertices[::step]))
+
+        points = np.empty((count, 3), dtype=np.float64)
+        colors = np.empty((count, 3), dtype=np.float64) if has_colors else None
+        for start in range(0, count, self.chunk_points):
+            self.check_cancelled()
+            end = min(start + self.chunk_points, count)
+            xyz, rgb = to_arrays(vertices[start:end])
+            points[start:end] = xyz
+            if has_colors:
+                colors[start:end] = rgb
+            self.progress.emit(10 + int(70 * end / count), f"Loading points: {end:,}/{count:,}")
+        del vertices
+        return points, colors
+
+    def read_with_open3d(self):
+        """Generic path for formats open3d has to parse itself (ASCII PLY, PCD)"""
+        self.progress.emit(30, "Loading point cloud data...")
+        cloud = o3d.io.read_point_cloud(self.file_path)
+        self.check_cancelled()
+        points = np.asarray(cloud.points)
+        colors = np.asarray(cloud.colors) if cloud.has_colors() else None
+        if len(points):
+            self.emit_preview(points, colors)
+        self.progress.emit(70, "Processing colors..." if colors is not None else "Preparing visualization...")
+        return points, colors
+
+    def read_xyz(self):
+        """Stream XYZ text block by block, emitting the first block as a preview"""
+        previewed = []
+
+        def on_block(points):
+            if not previewed:
+                previewed.append(True)
+                self.emit_preview(points)
+
+        def on_progress(bytes_read, total_bytes):
+            self.progress.emit(10 + int(70 * bytes_read / total_bytes),
+                               f"Loading XYZ data: {bytes_read / (1024 * 1024):.0f}/{total_bytes / (1024 * 1024):.0f} MB")
+
+        result = read_xyz(self.file_path, keep_rgb=True, progress_callback=on_progress,
+                          block_callback=on_block, should_stop=lambda: self._cancelled)
+        self.check_cancelled()
+        if result is None:
+            return None, None
+        return result['points'], result['colors']
+
+
+class ElevationRasterBuilder(QThread):
+    """
+    Opens the cached DEM of a point cloud, or builds it (see dem_raster), on a worker thread.
+
+    ready(source, raster) and failed(source, message) carry the cloud object the raster was
+    requested for, so the receiver can drop results for a cloud that has been replaced.
+    """
+    ready = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+
+    def __init__(self, source, points, cell_size, cache_path=None, source_path=None, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.points = points
+        self.cell_size = cell_size
+        self.cache_path = cache_path
+        self.source_path = source_path
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            raster = ElevationRaster.load(self.cache_path, self.source_path) if self.cache_path else None
+            if raster is None:
+                raster = ElevationRaster.from_points(self.points, self.cell_size,
+                                                     should_stop=lambda: self._cancelled)
+                if self.cache_path:
+                    try:
+                        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                        raster.save(self.cache_path, self.source_path)
+                    except OSError:
+                        pass  # A failed write only costs a rebuild next time
+            if not self._cancelled:
+                self.ready.emit(self.source, raster)
+        except InterruptedError:
+            pass
+        except Exception as e:
+            if not self._cancelled:
+                self.failed.emit(self.source, str(e))
+        finally:
+            self.points = None
@@ -4,7 +4,6 @@ import numpy as np
 import open3d as o3d
 import time
 import json
-import matplotlib.path
 import math
 
 # PyQt imports
@@ -29,7 +28,20 @@ from vtkmodules.vtkFiltersGeneral import vtkTransformPolyDataFilter
 from datetime import datetime
 from math import sqrt, degrees, acos, atan2
             
-from utils import find_best_fitting_plane
+from utils import find_best_fitting_plane, tetrahedra_volume
+from vtk_utils import (o3d_to_vtk_polydata, create_point_cloud_polydata, create_segment_planes_polydata,
+                       numpy_to_vtk_points, polydata_points_to_numpy, create_curtain_polydata)
+from point_cloud_loader import PointCloudLoader, ElevationRasterBuilder
+from point_cache import CACHE_FOLDER_NAME, cache_key, point_cloud_arrays, open3d_point_cloud
+from dem_raster import dem_cache_path
+from alignment_index import AlignmentIndex
+from polygon_select import polygon_mask
+from graph_overlay import LineVertexIndex, BlitOverlay
+from render_scheduler import RenderScheduler
+from chainage_ticks import apply_chainage_ticks
+from baseline_store import BaselineColumns, read_baseline, read_baseline_columns, write_baseline_columns
+from octree_lod import PointCloudOctree, OctreeLODRenderer, LOD_POINT_THRESHOLD
+from spatial_index import PointCloudSpatialIndex, world_to_display
 from dialogs import (ConstructionConfigDialog, MaterialLineDialog, DesignNewDialog, WorksheetNewDialog, ConstructionNewDialog, HelpDialog,
                      CreateProjectDialog, CurveDialog, ZeroLineDialog, ExistingWorksheetDialog, RoadPlaneWidthDialog, MeasurementNewDialog,
                      MergerLayerConfigDialog, ElevationangleDialog)
@@ -43,6 +55,10 @@ from digging_point import DiggingPointInput
 class PointCloudViewer(ApplicationUI):
     def __init__(self, username=None):  # Add username parameter
         super().__init__()
+
+        # All renders of the main window go through request_render() and are coalesced
+        self.render_scheduler = RenderScheduler(self.vtk_widget.GetRenderWindow(), parent=self)
+
         self.current_user = username or "guest"  # Store logged-in user
 
         # Add these lines
@@ -175,6 +191,52 @@ class PointCloudViewer(ApplicationUI):
         # In your class initialization
         self.reference_actors = []
 
+        # Background point cloud loading (see start_point_cloud_loading)
+        self.point_cloud_loader = None
+        self.point_cloud_preview_actor = None
+        self.cancel_load_button.clicked.connect(self.cancel_point_cloud_loading)
+
+        # KD-tree used for click snapping (see get_point_cloud_index)
+        self.point_cloud_index = None
+        self.point_cloud_index_source = None
+        self.point_cloud_index_pending = None
+
+        # Gridded DEM for elevation lookups in cut/fill (see request_elevation_raster)
+        self.dem_cell_size = 0.5
+        self.elevation_raster = None
+        self.elevation_raster_source = None
+        self.elevation_raster_builder = None
+        self.elevation_raster_requests = []  # (on_ready, on_abort) waiting for the running builder
+        self.loaded_point_cloud = None
+
+        # Level-of-detail rendering for large clouds (see display_point_cloud)
+        self.point_cloud_lod = None
+        self.lod_update_timer = QTimer(self)
+        self.lod_update_timer.setSingleShot(True)
+        self.lod_update_timer.setInterval(30)
+        self.lod_update_timer.timeout.connect(self.update_point_cloud_lod)
+        self.vtk_widget.GetRenderWindow().AddObserver("EndEvent", lambda obj, event: self.schedule_point_cloud_lod_update())
+
+        # Graph hover: vertex index by chainage, rate-limited events, blitted annotation
+        self.hover_index = None
+        self.hover_index_key = None
+        self.pending_hover = None
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(16)
+        self.hover_timer.timeout.connect(self.on_hover_timer)
+        self.graph_overlay = BlitOverlay(self.canvas, [self.annotation])
+        # Slider marker and chainage cursor on the scale bar are blitted the same way
+        self.scale_overlay = BlitOverlay(self.scale_canvas, [self.scale_marker])
+
+    def request_render(self):
+        """Mark the 3D view dirty; it is rendered once on the next frame interval"""
+        self.render_scheduler.request()
+
+    def render_now(self):
+        """Render the 3D view synchronously (for screenshots or reading back pixels)"""
+        self.render_scheduler.render_now()
+
     def setup_label_click_handler(self):
         """Set up the label click event handler after canvas is fully initialized"""
         if self.canvas:
@@ -267,26 +329,40 @@ class PointCloudViewer(ApplicationUI):
 # =======================================================================================================================================
 # HOVER HANDLER FOR POINTS
     def on_hover(self, event):
-        if event.inaxes != self.ax:
-            self.annotation.set_visible(False)
-            self.canvas.draw_idle()
-            return
+        # Keep only the latest position; it is handled at most once per hover_timer interval
+        self.pending_hover = (event.inaxes == self.ax, event.xdata, event.ydata)
+        if not self.hover_timer.isActive():
+            self.process_hover()
+            self.hover_timer.start()
+
+    def on_hover_timer(self):
+        if self.pending_hover is not None:
+            self.process_hover()
+            self.hover_timer.start()
+
+    def get_hover_index(self):
+        """Sorted vertex index of the hoverable lines, rebuilt only when their data changes"""
+        artists = [artist for line_type in ['surface', 'construction', 'road_surface']
+                   for artist in self.line_types[line_type]['artists']]
+        key = LineVertexIndex.signature(artists)
+        if self.hover_index is None or key != self.hover_index_key:
+            self.hover_index = LineVertexIndex(artists)
+            self.hover_index_key = key
+        return self.hover_index
+
+    def process_hover(self):
+        in_axes, xdata, ydata = self.pending_hover
+        self.pending_hover = None
         vis = self.annotation.get_visible()
-        closest_point = None
-        min_dist = float('inf')
-        for line_type in ['surface', 'construction', 'road_surface']:
-            for artist in self.line_types[line_type]['artists']:
-                if len(artist.get_xdata()) == 0:
-                    continue
-                xs = artist.get_xdata()
-                ys = artist.get_ydata()
-                distances = np.hypot(xs - event.xdata, ys - event.ydata)
-                idx = np.argmin(distances)
-                if distances[idx] < 0.2: # threshold for hover detection
-                    if distances[idx] < min_dist:
-                        min_dist = distances[idx]
-                        closest_point = (xs[idx], ys[idx])
+        if not in_axes:
+            if vis:
+                self.annotation.set_visible(False)
+                self.graph_overlay.update()
+            return
+        closest_point = self.get_hover_index().nearest(xdata, ydata, 0.2)  # threshold for hover detection
         if closest_point is not None:
+            if vis and tuple(self.annotation.xy) == closest_point:
+                return
             x_dist, rel_elev = closest_point
             if self.zero_line_set and self.total_distance > 0:
                 t = x_dist / self.total_distance
@@ -299,10 +375,10 @@ class PointCloudViewer(ApplicationUI):
             self.annotation.xy = closest_point
             self.annotation.set_text(text)
             self.annotation.set_visible(True)
-            self.canvas.draw_idle()
+            self.graph_overlay.update()
         elif vis:
             self.annotation.set_visible(False)
-            self.canvas.draw_idle()
+            self.graph_overlay.update()
     
 # =======================================================================================================================================
     def reset_measurement_tools(self):
@@ -635,14 +711,14 @@ class PointCloudViewer(ApplicationUI):
         # Refresh rendering
         self.canvas.draw()
         if hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         # Auto-load point cloud if selected
         if point_cloud_file and os.path.exists(point_cloud_file):
             self.message_text.append("Auto-loading selected point cloud...")
             success = self.load_point_cloud_from_path(point_cloud_file)
             if success:
-                self.message_text.append("Point cloud loaded successfully!")
+                self.message_text.append("Point cloud is loading in the background...")
             else:
                 self.message_text.append("Failed to auto-load point cloud.")
         elif point_cloud_file:
@@ -884,7 +960,7 @@ class PointCloudViewer(ApplicationUI):
                     self.bridge_zero_line.setChecked(True)
 
             self.canvas.draw()
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # =======================================================================================================================================
     def open_construction_new_dialog(self):
@@ -1716,15 +1792,9 @@ class PointCloudViewer(ApplicationUI):
 
                 if os.path.exists(baseline_path):
                     try:
-                        with open(baseline_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
+                        baseline = read_baseline_columns(baseline_path)
                         ltype = "construction"  # default type for reference
-                        polylines_2d = []
-                        for poly in data.get("polylines", []):
-                            poly_2d = [(pt["chainage_m"], pt["relative_elevation_m"]) for pt in poly["points"]]
-                            if len(poly_2d) >= 2:
-                                polylines_2d.append(poly_2d)
-                        self.line_types[ltype]['polylines'] = polylines_2d
+                        self.line_types[ltype]['polylines'] = baseline.polylines_2d()
                         self.redraw_baseline_on_graph(ltype, style="dotted")
                         dotted_line_drawn = True
                     except Exception as e:
@@ -1846,7 +1916,7 @@ class PointCloudViewer(ApplicationUI):
 
         self.canvas.draw_idle()
         if hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
     
 # ================= Merger layer & its hierarchy creation =======================
     def create_merger_hierarchy(self, merger_data, full_layer_path):
@@ -2295,9 +2365,8 @@ class PointCloudViewer(ApplicationUI):
                     continue
                 
                 try:
-                    # Load the baseline JSON file
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        baseline_data = json.load(f)
+                    # Load the baseline file (columnar or legacy JSON)
+                    baseline_data = read_baseline(json_path)
                     
                     # Debug: Check if world_coordinates exist
                     has_world_coords = False
@@ -2518,8 +2587,7 @@ class PointCloudViewer(ApplicationUI):
             return loaded
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_baseline(filepath)
             
             baseline_type = key_map.get(filename)
             if baseline_type:
@@ -2585,7 +2653,7 @@ class PointCloudViewer(ApplicationUI):
             
             # Update render window
             if hasattr(self, 'vtk_widget'):
-                self.vtk_widget.GetRenderWindow().Render()
+                self.request_render()
             
             self.message_text.append(f"Removed {len(actors)} plane actors for {baseline_type}")
         else:
@@ -2649,7 +2717,7 @@ class PointCloudViewer(ApplicationUI):
         
         # Update render window
         if actors_to_remove and hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
         
         self.message_text.append(f"Removed all planes for layer '{layer_name}' ({len(actors_to_remove)} actors)")
         
@@ -2692,7 +2760,7 @@ class PointCloudViewer(ApplicationUI):
 
     def generate_3d_planes_for_baseline(self, baseline_data, baseline_type):
         """
-        Generate 3D plane actors for a specific baseline type using vtkPlaneSource.
+        Generate the merged 3D plane actor for a specific baseline type.
         This matches the existing map_baselines_to_3d_planes_from_data logic.
         
         Args:
@@ -2700,7 +2768,7 @@ class PointCloudViewer(ApplicationUI):
             baseline_type: Type of baseline (e.g., "road_surface", "surface", "construction")
             
         Returns:
-            list: List of VTK actors created for this baseline
+            list: List of VTK actors created for this baseline (a single merged actor)
         """
         if not self.zero_line_set:
             self.message_text.append(f"Cannot generate 3D planes for {baseline_type}: Zero line not set")
@@ -2708,105 +2776,32 @@ class PointCloudViewer(ApplicationUI):
         
         actors = []
         
-        # Get color and opacity for this baseline type
-        rgba = self.plane_colors.get(baseline_type, (0.5, 0.5, 0.5, 0.4))
-        color_rgb = rgba[:3]
-        opacity = rgba[3]
-        
-        # Get width from baseline data (default to 10.0 if not specified)
+        # Get width from baseline data (default to 10.0 if not specified);
+        # create_baseline_plane_actor picks the color and opacity of the baseline type
         width = baseline_data.get("width_meters", 10.0)
-        half_width = width / 2.0
         
         # Get zero line information
         if not hasattr(self, 'zero_start_point') or not hasattr(self, 'zero_end_point'):
             self.message_text.append("Zero line points not available")
             return []
         
-        zero_dir_vec = np.array(self.zero_end_point) - np.array(self.zero_start_point)
-        
-        # Process each polyline in the baseline data
-        for polyline in baseline_data.get("polylines", []):
-            points_3d = polyline.get("points", [])
-            if len(points_3d) < 2:
-                continue
-            
-            # Create plane for each segment
-            for i in range(len(points_3d) - 1):
-                pt1 = points_3d[i]
-                pt2 = points_3d[i + 1]
-                
-                # Get world coordinates
-                center1 = np.array(pt1.get("world_coordinates", [0, 0, 0]))
-                center2 = np.array(pt2.get("world_coordinates", [0, 0, 0]))
-                
-                # Calculate segment direction and length
-                seg_dir = center2 - center1
-                seg_len = np.linalg.norm(seg_dir)
-                if seg_len < 1e-6:
-                    continue
-                seg_unit = seg_dir / seg_len
-                
-                # Calculate perpendicular direction (same logic as map_baselines_to_3d_planes_from_data)
-                horiz = np.array([seg_unit[0], seg_unit[1], 0.0])
-                hlen = np.linalg.norm(horiz)
-                
-                if hlen < 1e-6:
-                    # If segment is vertical, use zero line direction for perpendicular
-                    zero_length = np.linalg.norm(zero_dir_vec)
-                    if zero_length < 1e-6:
-                        continue
-                    zero_unit = zero_dir_vec / zero_length
-                    perp = np.array([-zero_unit[1], zero_unit[0], 0.0])
-                else:
-                    horiz /= hlen
-                    perp = np.array([-horiz[1], horiz[0], 0.0])
-                
-                perp_len = np.linalg.norm(perp)
-                if perp_len > 0:
-                    perp /= perp_len
-                
-                # Calculate the 4 corners of the plane
-                c1 = center1 + perp * half_width
-                c2 = center1 - perp * half_width
-                c3 = center2 - perp * half_width
-                c4 = center2 + perp * half_width
-                
-                # Create the plane using vtkPlaneSource (same as original)
-                plane = vtk.vtkPlaneSource()
-                plane.SetOrigin(c1[0], c1[1], c1[2])
-                plane.SetPoint1(c4[0], c4[1], c4[2])
-                plane.SetPoint2(c2[0], c2[1], c2[2])
-                plane.SetXResolution(12)
-                plane.SetYResolution(2)
-                plane.Update()
-                
-                # Create mapper and actor
-                mapper = vtk.vtkPolyDataMapper()
-                mapper.SetInputConnection(plane.GetOutputPort())
-                
-                actor = vtk.vtkActor()
-                actor.SetMapper(mapper)
-                actor.GetProperty().SetColor(*color_rgb)
-                actor.GetProperty().SetOpacity(opacity)
-                actor.GetProperty().EdgeVisibilityOn()
-                actor.GetProperty().SetEdgeColor(*color_rgb)
-                actor.GetProperty().SetLineWidth(1.5)
-                
-                # Store identification properties
-                actor.baseline_type = baseline_type
-                actor.layer_path = baseline_data.get("layer_path", "")
-                
-                # Add actor to renderer
-                if hasattr(self, 'renderer'):
-                    self.renderer.AddActor(actor)
-                    actors.append(actor)
+        # One merged actor for the whole baseline type, one quad per segment
+        polylines = [[pt.get("world_coordinates", [0, 0, 0]) for pt in polyline.get("points", [])]
+                     for polyline in baseline_data.get("polylines", [])]
+        actor = self.create_baseline_plane_actor(polylines, baseline_type, width)
+        if actor is not None:
+            actor.layer_path = baseline_data.get("layer_path", "")
+            if hasattr(self, 'renderer'):
+                self.renderer.AddActor(actor)
+                actors.append(actor)
         
         if actors:
             # Update the render window
             if hasattr(self, 'vtk_widget'):
-                self.vtk_widget.GetRenderWindow().Render()
+                self.request_render()
             
-            self.message_text.append(f"✓ Generated {len(actors)} 3D plane segments for {baseline_type} (width: {width}m)")
+            segment_count = sum(actor.GetMapper().GetInput().GetNumberOfCells() for actor in actors)
+            self.message_text.append(f"✓ Generated {segment_count} 3D plane segments for {baseline_type} (width: {width}m)")
         
         return actors
 
@@ -2868,7 +2863,7 @@ class PointCloudViewer(ApplicationUI):
                 # Adjust camera to get better view of markers
                 camera = self.renderer.GetActiveCamera()
                 camera.Zoom(0.8)  # Zoom out a bit
-                self.vtk_widget.GetRenderWindow().Render()
+                self.request_render()
         
             self.message_text.append(f"  Successfully added orange marker for Merger Point {point_number}")
             return True
@@ -3000,24 +2995,12 @@ class PointCloudViewer(ApplicationUI):
                 # Convert list of [x,y,z] to numpy array
                 points_array = np.array(points_list, dtype=np.float32)
 
-                # Create VTK points
-                vtk_points = vtk.vtkPoints()
-                vtk_points.SetNumberOfPoints(len(points_array))
-
-                for i, pt in enumerate(points_array):
-                    vtk_points.SetPoint(i, pt[0], pt[1], pt[2])
-
-                # Create polydata
-                polydata = vtk.vtkPolyData()
-                polydata.SetPoints(vtk_points)
-
-                # Create vertex glyph for points
-                vertex_filter = vtk.vtkVertexGlyphFilter()
-                vertex_filter.SetInputData(polydata)
+                # Create polydata with vertex cells in bulk (no glyph filter pass needed)
+                polydata = create_point_cloud_polydata(points_array[:, :3])
 
                 # Mapper
                 mapper = vtk.vtkPolyDataMapper()
-                mapper.SetInputConnection(vertex_filter.GetOutputPort())
+                mapper.SetInputData(polydata)
 
                 # Actor
                 actor = vtk.vtkActor()
@@ -3036,7 +3019,7 @@ class PointCloudViewer(ApplicationUI):
                 self.message_text.append(f"Failed to load {filename} as point cloud: {str(e)}")
 
         if loaded_any:
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         return loaded_any
 
@@ -3065,7 +3048,7 @@ class PointCloudViewer(ApplicationUI):
         self.reference_actors.clear()
         
         # Also render the window
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
 # When creating a reference actor, add it to the list
@@ -3153,7 +3136,7 @@ class PointCloudViewer(ApplicationUI):
 # =======================================================================================================================================
     def load_all_baselines_from_layer(self, layer_path):
         """Load all *_baseline.json files from the given layer folder.
-        Returns dict of loaded data.
+        Returns dict of BaselineColumns (columnar or legacy JSON files).
         Does NOT draw on 2D graph — only stores data for 3D planes.
         """
         loaded = {}
@@ -3181,20 +3164,13 @@ class PointCloudViewer(ApplicationUI):
                 continue
 
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                baseline = read_baseline_columns(filepath)
 
                 ltype = key_map[filename]
-                loaded[ltype] = data
+                loaded[ltype] = baseline
 
                 # Store polylines in memory (for 3D planes only)
-                polylines_2d = []
-                for poly in data.get("polylines", []):
-                    poly_2d = [(pt["chainage_m"], pt["relative_elevation_m"]) for pt in poly["points"]]
-                    if len(poly_2d) >= 2:
-                        polylines_2d.append(poly_2d)
-
-                self.line_types[ltype]['polylines'] = polylines_2d
+                self.line_types[ltype]['polylines'] = baseline.polylines_2d()
 
                 # IMPORTANT: Do NOT redraw on graph here!
 
@@ -3234,75 +3210,19 @@ class PointCloudViewer(ApplicationUI):
         if not self.zero_line_set:
             return
 
-        half_width = width / 2.0
-        zero_dir_vec = self.zero_end_point - self.zero_start_point
-        zero_length = self.total_distance
-        ref_z = self.zero_start_z
-
         for ltype, baseline_data in loaded_baselines.items():
-            rgba = self.plane_colors.get(ltype, (0.5, 0.5, 0.5, 0.4))
-            color_rgb = rgba[:3]
-            opacity = rgba[3]
-
-            for poly in baseline_data.get("polylines", []):
-                points_3d = poly["points"]
-                if len(points_3d) < 2:
-                    continue
-
-                for i in range(len(points_3d) - 1):
-                    pt1 = points_3d[i]
-                    pt2 = points_3d[i + 1]
-
-                    center1 = np.array(pt1["world_coordinates"])
-                    center2 = np.array(pt2["world_coordinates"])
-
-                    seg_dir = center2 - center1
-                    seg_len = np.linalg.norm(seg_dir)
-                    if seg_len < 1e-6:
-                        continue
-                    seg_unit = seg_dir / seg_len
-
-                    horiz = np.array([seg_unit[0], seg_unit[1], 0.0])
-                    hlen = np.linalg.norm(horiz)
-                    if hlen < 1e-6:
-                        zero_unit = zero_dir_vec / np.linalg.norm(zero_dir_vec)
-                        perp = np.array([-zero_unit[1], zero_unit[0], 0.0])
-                    else:
-                        horiz /= hlen
-                        perp = np.array([-horiz[1], horiz[0], 0.0])
-
-                    perp_len = np.linalg.norm(perp)
-                    if perp_len > 0:
-                        perp /= perp_len
-
-                    c1 = center1 + perp * half_width
-                    c2 = center1 - perp * half_width
-                    c3 = center2 - perp * half_width
-                    c4 = center2 + perp * half_width
-
-                    plane = vtkPlaneSource()
-                    plane.SetOrigin(c1[0], c1[1], c1[2])
-                    plane.SetPoint1(c4[0], c4[1], c4[2])
-                    plane.SetPoint2(c2[0], c2[1], c2[2])
-                    plane.SetXResolution(12)
-                    plane.SetYResolution(2)
-                    plane.Update()
-
-                    mapper = vtkPolyDataMapper()
-                    mapper.SetInputConnection(plane.GetOutputPort())
-
-                    actor = vtkActor()
-                    actor.SetMapper(mapper)
-                    actor.GetProperty().SetColor(*color_rgb)
-                    actor.GetProperty().SetOpacity(opacity)
-                    actor.GetProperty().EdgeVisibilityOn()
-                    actor.GetProperty().SetEdgeColor(*color_rgb)
-                    actor.GetProperty().SetLineWidth(1.5)
-
-                    self.renderer.AddActor(actor)
-                    self.baseline_plane_actors.append(actor)
+            if isinstance(baseline_data, BaselineColumns):
+                polylines = baseline_data.world_polylines()
+            else:
+                polylines = [[pt["world_coordinates"] for pt in poly["points"]]
+                             for poly in baseline_data.get("polylines", [])]
+            actor = self.create_baseline_plane_actor(polylines, ltype, width)
+            if actor is None:
+                continue
+            self.renderer.AddActor(actor)
+            self.baseline_plane_actors.append(actor)
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def show_graph_section(self, category):
@@ -3360,84 +3280,12 @@ class PointCloudViewer(ApplicationUI):
 
 # =======================================================================================================================================
     def load_point_cloud_files(self, file_list):
-        """Load multiple point cloud files (merge or first one) - currently loads first file with progress bar"""
+        """Load multiple point cloud files (merge or first one) - currently loads first file in the background"""
         if not file_list:
             return
 
         # For simplicity, load first file
-        first_file = file_list[0]
-        file_path = first_file  # For consistency with the single-load method
-
-        # Store the loaded file path and name (same as single load)
-        self.loaded_file_path = file_path
-        self.loaded_file_name = os.path.splitext(os.path.basename(file_path))[0]
-
-        try:
-            # Show progress bar with file info
-            self.show_progress_bar(file_path)
-            self.update_progress(10, "Starting file loading...")
-
-            self.update_progress(30, "Loading point cloud data...")
-            self.point_cloud = o3d.io.read_point_cloud(file_path)
-
-            if self.point_cloud.is_empty():
-                raise ValueError("Point cloud is empty!")
-
-            self.update_progress(50, "Converting to VTK format...")
-
-            # Display in VTK
-            points = np.asarray(self.point_cloud.points)
-            colors = np.asarray(self.point_cloud.colors) if self.point_cloud.has_colors() else None
-
-            poly_data = vtk.vtkPolyData()
-            vtk_points = vtk.vtkPoints()
-            vertices = vtk.vtkCellArray()
-
-            for i, pt in enumerate(points):
-                vtk_points.InsertNextPoint(pt)
-                vertex = vtk.vtkVertex()
-                vertex.GetPointIds().SetId(0, i)
-                vertices.InsertNextCell(vertex)
-
-            poly_data.SetPoints(vtk_points)
-            poly_data.SetVerts(vertices)
-
-            if colors is not None:
-                self.update_progress(70, "Processing colors...")
-                vtk_colors = vtk.vtkUnsignedCharArray()
-                vtk_colors.SetNumberOfComponents(3)
-                vtk_colors.SetName("Colors")
-                for c in (colors * 255).astype(np.uint8):
-                    vtk_colors.InsertNextTuple(c)
-                poly_data.GetPointData().SetScalars(vtk_colors)
-            else:
-                self.update_progress(70, "Preparing visualization...")
-
-            mapper = vtk.vtkPolyDataMapper()
-            mapper.SetInputData(poly_data)
-
-            self.update_progress(90, "Creating visualization...")
-
-            if self.point_cloud_actor:
-                self.renderer.RemoveActor(self.point_cloud_actor)
-
-            self.point_cloud_actor = vtk.vtkActor()
-            self.point_cloud_actor.SetMapper(mapper)
-            self.point_cloud_actor.GetProperty().SetPointSize(2)
-
-            self.renderer.AddActor(self.point_cloud_actor)
-            self.renderer.ResetCamera()
-            self.vtk_widget.GetRenderWindow().Render()
-
-            self.update_progress(100, "Loading complete!")
-            QTimer.singleShot(500, self.hide_progress_bar)
-
-            self.message_text.append(f"Successfully loaded point cloud: {os.path.basename(file_path)}")
-
-        except Exception as e:
-            self.hide_progress_bar()
-            self.message_text.append(f"Failed to load point cloud '{os.path.basename(file_path)}': {str(e)}")
-            QMessageBox.warning(self, "Load Failed", f"Could not load point cloud:\n{file_path}\n\nError: {str(e)}")
+        self.load_point_cloud_from_path(file_list[0])
 
 # =======================================================================================================================================
     def show_help_dialog(self):
@@ -3859,21 +3707,6 @@ class PointCloudViewer(ApplicationUI):
             self.canvas.draw_idle()
             return
 
-        # Calculate tick positions
-        num_intervals = int(self.total_distance / self.zero_interval)
-        tick_positions = [i * self.zero_interval for i in range(num_intervals + 1)]
-        tick_labels = []
-        current_km = self.zero_start_km
-        remaining = self.total_distance
-        for i in range(num_intervals + 1):
-            interval_value = i * self.zero_interval
-            if interval_value >= 1000:
-                additional_km = int(interval_value // 1000)
-                current_km += additional_km
-                interval_value %= 1000
-            label = f"{current_km}+{int(interval_value):03d}"
-            tick_labels.append(label)
-
         # === UPDATE TOP CHAINAGE SCALE (Orange bar) ===
         if hasattr(self, 'scale_ax') and self.scale_ax:
             self.scale_ax.clear()
@@ -3881,8 +3714,8 @@ class PointCloudViewer(ApplicationUI):
             self.scale_ax.set_xlim(0, self.total_distance)
             self.scale_ax.set_ylim(-0.1, 1.2)
             self.scale_ax.set_yticks([])
-            self.scale_ax.set_xticks(tick_positions)
-            self.scale_ax.set_xticklabels(tick_labels, rotation=15, ha='right', fontsize=8)
+            # Ticks are generated per view by the locator, only for the visible range
+            apply_chainage_ticks(self.scale_ax, self.zero_interval, self.total_distance, self.zero_start_km)
             self.scale_ax.set_title("Chainage Scale", fontsize=10, pad=10, color='#D35400')
             self.scale_ax.spines['bottom'].set_visible(True)
             self.scale_ax.spines['top'].set_visible(False)
@@ -3895,8 +3728,7 @@ class PointCloudViewer(ApplicationUI):
 
         # === UPDATE MAIN GRAPH X-AXIS ===
         self.ax.set_xlim(0, self.total_distance)
-        self.ax.set_xticks(tick_positions)
-        self.ax.set_xticklabels(tick_labels, rotation=15, ha='right', fontsize=8)
+        apply_chainage_ticks(self.ax, self.zero_interval, self.total_distance, self.zero_start_km)
         self.ax.set_xlabel('Chainage (KM + Interval)', fontsize=10, labelpad=10)
         self.ax.grid(True, axis='x', linestyle='--', alpha=0.6, linewidth=1.2)
 
@@ -3924,7 +3756,9 @@ class PointCloudViewer(ApplicationUI):
         snapped_pos = round(pos / half_interval) * half_interval
         snapped_pos = max(0, min(snapped_pos, self.total_distance))  # Clamp
 
-        # Update vertical red line
+        # Update vertical red line (recreated if scale_ax was cleared)
+        if self.scale_marker.axes is not self.scale_ax:
+            self.scale_marker, = self.scale_ax.plot([0, 0], [0, 1], color='red', linewidth=2, linestyle='--')
         self.scale_marker.set_data([snapped_pos, snapped_pos], [0, 1])
 
         # === SAFE CHAINAGE LABEL ===
@@ -3936,29 +3770,29 @@ class PointCloudViewer(ApplicationUI):
 
         marker_label = f"Chainage: {start_km + km_offset}+{chainage_m:03d}"
 
-        # Remove old label
-        if hasattr(self, 'scale_marker_label'):
-            try:
-                self.scale_marker_label.remove()
-            except:
-                pass
-
-        # Add new label
-        self.scale_marker_label = self.scale_ax.text(
-            snapped_pos, 1.1, marker_label,
-            color='red', fontsize=10, fontweight='bold',
-            ha='center', va='bottom',
-            bbox=dict(boxstyle="round,pad=0.3", facecolor="white",
-                      edgecolor="red", alpha=0.9, linewidth=1)
-        )
+        # Move the label instead of recreating it
+        if not hasattr(self, 'scale_marker_label') or self.scale_marker_label.axes is not self.scale_ax:
+            self.scale_marker_label = self.scale_ax.text(
+                snapped_pos, 1.1, marker_label,
+                color='red', fontsize=10, fontweight='bold',
+                ha='center', va='bottom',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="white",
+                          edgecolor="red", alpha=0.9, linewidth=1)
+            )
+        else:
+            self.scale_marker_label.set_position((snapped_pos, 1.1))
+            self.scale_marker_label.set_text(marker_label)
 
         # Update bottom indicator line
-        if not hasattr(self, 'scale_marker_bottom'):
+        if not hasattr(self, 'scale_marker_bottom') or self.scale_marker_bottom.axes is not self.scale_ax:
             self.scale_marker_bottom, = self.scale_ax.plot([snapped_pos, snapped_pos], [0, 0.1], color='red', linewidth=2)
         else:
             self.scale_marker_bottom.set_data([snapped_pos, snapped_pos], [0, 0.1])
 
-        self.scale_canvas.draw()
+        # Only the marker artists are redrawn over the cached scale
+        for artist in (self.scale_marker, self.scale_marker_label, self.scale_marker_bottom):
+            self.scale_overlay.add_artist(artist)
+        self.scale_overlay.update()
 
 # =======================================================================================================================================
     def update_main_graph_marker(self, slider_value):
@@ -3969,7 +3803,7 @@ class PointCloudViewer(ApplicationUI):
         pos = slider_value / 100.0 * self.total_distance
 
         # Update vertical line
-        if not hasattr(self, 'main_graph_marker'):
+        if not hasattr(self, 'main_graph_marker') or self.main_graph_marker.axes is not self.ax:
             self.main_graph_marker = self.ax.axvline(x=pos, color='orange',
                                                      linestyle='--', alpha=0.7, linewidth=2)
         else:
@@ -3979,7 +3813,7 @@ class PointCloudViewer(ApplicationUI):
         chainage_label = self.get_chainage_label(pos)
 
         # Update label
-        if not hasattr(self, 'main_graph_marker_label'):
+        if not hasattr(self, 'main_graph_marker_label') or self.main_graph_marker_label.axes is not self.ax:
             self.main_graph_marker_label = self.ax.text(
                 pos, self.ax.get_ylim()[1] * 0.95,
                 f"← Chainage: {chainage_label}",
@@ -3990,7 +3824,10 @@ class PointCloudViewer(ApplicationUI):
             self.main_graph_marker_label.set_position((pos, self.ax.get_ylim()[1] * 0.95))
             self.main_graph_marker_label.set_text(f"← Chainage: {chainage_label}")
 
-        self.canvas.draw_idle()
+        # Only the marker artists are redrawn over the cached graph
+        self.graph_overlay.add_artist(self.main_graph_marker)
+        self.graph_overlay.add_artist(self.main_graph_marker_label)
+        self.graph_overlay.update()
 
 # =======================================================================================================================================
     def on_graph_scrolled(self):
@@ -4088,7 +3925,7 @@ class PointCloudViewer(ApplicationUI):
         self.scale_canvas.draw()
         self.canvas.draw()
         self.figure.tight_layout()
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
 # In the update_scale_ticks method, improve the tick labels:
@@ -4099,31 +3936,15 @@ class PointCloudViewer(ApplicationUI):
 
         self.scale_ax.clear()
 
-        interval = int(self.zero_interval)
         start_km = getattr(self, 'zero_start_km', 0) if hasattr(self, 'zero_start_km') else 0
 
-        tick_positions = []
-        tick_labels = []
-
-        current_pos = 0
-        while current_pos <= self.total_distance + interval:
-            tick_positions.append(current_pos)
-
-            interval_number = int(round(current_pos / interval))
-            interval_value_meters = interval_number * interval
-
-            tick_labels.append(f"{start_km}+{interval_value_meters:03d}")
-
-            current_pos += interval
-
         # Rebuild scale line and marker
         self.scale_line, = self.scale_ax.plot([0, self.total_distance], [0.5, 0.5],
                                               color='black', linewidth=3)
         self.scale_marker, = self.scale_ax.plot([0, 0], [0, 1], color='red',
                                                 linewidth=2, linestyle='--')
 
-        self.scale_ax.set_xticks(tick_positions)
-        self.scale_ax.set_xticklabels(tick_labels, rotation=30, ha='right')
+        apply_chainage_ticks(self.scale_ax, self.zero_interval, self.total_distance, start_km, rotation=30, fontsize=None)
         self.scale_ax.set_xlim(0, self.total_distance)
         self.scale_ax.set_ylim(0, 1.2)
         self.scale_ax.set_yticks([])
@@ -4972,7 +4793,7 @@ class PointCloudViewer(ApplicationUI):
                         points_3d.append(pos_3d)
                     for i in range(len(points_3d) - 1):
                         self.add_preview_line(points_3d[i], points_3d[i + 1], color)
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         self.message_text.append("Preview lines mapped on 3D point cloud.")
 
     def add_preview_line(self, p1, p2, color):
@@ -5035,85 +4856,27 @@ class PointCloudViewer(ApplicationUI):
         plane_count_this_time = 0
 
         for ltype, polylines in current_polylines.items():
-            rgba = self.plane_colors.get(ltype, (0.5, 0.5, 0.5, 0.4))
-            color_rgb = rgba[:3]
-            opacity = rgba[3]
-
+            # Graph (distance, relative z) vertices -> world positions along the zero line
+            polylines_3d = []
             for poly_2d in polylines:
-                if len(poly_2d) < 2:
-                    continue
+                poly = np.asarray(poly_2d, dtype=float).reshape(-1, 2)
+                positions = self.zero_start_point[:2] + (poly[:, :1] / zero_length) * zero_dir_vec[:2]
+                polylines_3d.append(np.column_stack((positions, ref_z + poly[:, 1])))
 
-                for i in range(len(poly_2d) - 1):
-                    dist1, rel_z1 = poly_2d[i]
-                    dist2, rel_z2 = poly_2d[i + 1]
-
-                    pos1 = self.zero_start_point + (dist1 / zero_length) * zero_dir_vec
-                    pos2 = self.zero_start_point + (dist2 / zero_length) * zero_dir_vec
-
-                    z1 = ref_z + rel_z1
-                    z2 = ref_z + rel_z2
-
-                    center1 = np.array([pos1[0], pos1[1], z1])
-                    center2 = np.array([pos2[0], pos2[1], z2])
+            actor = self.create_baseline_plane_actor(polylines_3d, ltype, width)
+            if actor is None:
+                continue
 
-                    seg_dir = center2 - center1
-                    seg_len = np.linalg.norm(seg_dir)
-                    if seg_len < 1e-6:
-                        continue
-                    seg_unit = seg_dir / seg_len
-
-                    # Compute horizontal perpendicular direction
-                    horiz = np.array([seg_unit[0], seg_unit[1], 0.0])
-                    hlen = np.linalg.norm(horiz)
-                    if hlen < 1e-6:
-                        # Fallback: perpendicular to zero line
-                        zero_unit = zero_dir_vec / np.linalg.norm(zero_dir_vec)
-                        perp = np.array([-zero_unit[1], zero_unit[0], 0.0])
-                    else:
-                        horiz /= hlen
-                        perp = np.array([-horiz[1], horiz[0], 0.0])
-
-                    # Normalize perp just in case
-                    perp_len = np.linalg.norm(perp)
-                    if perp_len > 0:
-                        perp /= perp_len
-
-                    # Four corners of the plane segment
-                    c1 = center1 + perp * half_width
-                    c2 = center1 - perp * half_width
-                    c3 = center2 - perp * half_width
-                    c4 = center2 + perp * half_width
-
-                    # Create rectangular plane
-                    plane = vtkPlaneSource()
-                    plane.SetOrigin(c1[0], c1[1], c1[2])
-                    plane.SetPoint1(c4[0], c4[1], c4[2])
-                    plane.SetPoint2(c2[0], c2[1], c2[2])
-                    plane.SetXResolution(12)
-                    plane.SetYResolution(2)
-                    plane.Update()
-
-                    mapper = vtkPolyDataMapper()
-                    mapper.SetInputConnection(plane.GetOutputPort())
-
-                    actor = vtkActor()
-                    actor.SetMapper(mapper)
-                    actor.GetProperty().SetColor(*color_rgb)
-                    actor.GetProperty().SetOpacity(opacity)
-                    actor.GetProperty().EdgeVisibilityOn()
-                    actor.GetProperty().SetEdgeColor(*color_rgb)
-                    actor.GetProperty().SetLineWidth(1.5)
-
-                    # Add to scene and store
-                    self.renderer.AddActor(actor)
-                    self.baseline_plane_actors.append(actor)
-                    plane_count_this_time += 1
+            # Add to scene and store
+            self.renderer.AddActor(actor)
+            self.baseline_plane_actors.append(actor)
+            plane_count_this_time += actor.GetMapper().GetInput().GetNumberOfCells()
 
         # Final render
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
         # Feedback
-        total_planes = len(self.baseline_plane_actors)
+        total_planes = sum(actor.GetMapper().GetInput().GetNumberOfCells() for actor in self.baseline_plane_actors)
         self.message_text.append(f"Added {plane_count_this_time} new plane segments (width: {width:.2f}m). Total visible: {total_planes}")
         
         QMessageBox.information(
@@ -5133,6 +4896,31 @@ class PointCloudViewer(ApplicationUI):
             "• Material → Yellow"
         )
 
+    def create_baseline_plane_actor(self, polylines, baseline_type, width):
+        """
+        Create one actor holding a plane quad for every segment of the given 3D polylines.
+        Cell data 'PolylineId' / 'SegmentId' identify the segment of a picked cell.
+        Returns None when there is no segment to draw.
+        """
+        zero_dir_vec = np.array(self.zero_end_point) - np.array(self.zero_start_point)
+        polydata = create_segment_planes_polydata(polylines, width / 2.0, zero_dir_vec)
+        if polydata.GetNumberOfCells() == 0:
+            return None
+
+        rgba = self.plane_colors.get(baseline_type, (0.5, 0.5, 0.5, 0.4))
+        mapper = vtkPolyDataMapper()
+        mapper.SetInputData(polydata)
+
+        actor = vtkActor()
+        actor.SetMapper(mapper)
+        actor.GetProperty().SetColor(*rgba[:3])
+        actor.GetProperty().SetOpacity(rgba[3])
+        actor.GetProperty().EdgeVisibilityOn()
+        actor.GetProperty().SetEdgeColor(*rgba[:3])
+        actor.GetProperty().SetLineWidth(1.5)
+        actor.baseline_type = baseline_type
+        return actor
+
     def clear_baseline_planes(self):
         """Remove ALL accumulated baseline plane actors — used only on reset or new worksheet."""
         for actor in self.baseline_plane_actors:
@@ -5140,7 +4928,7 @@ class PointCloudViewer(ApplicationUI):
             self.renderer.RemoveActor(actor)
         self.baseline_plane_actors.clear()
         if hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # =======================================================================================================================================
     def reset_zero_drawing(self):
@@ -5180,7 +4968,7 @@ class PointCloudViewer(ApplicationUI):
             camera.SetViewUp(0, 0, 1)
             camera.SetViewAngle(15.0)
             self.renderer.ResetCameraClippingRange()
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
         except Exception as e:
             print(f"Error in full cloud focus: {e}")
 
@@ -5232,7 +5020,7 @@ class PointCloudViewer(ApplicationUI):
             # Optional: slightly tighter clipping for cleaner view
             self.renderer.ResetCameraClippingRange()
 
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         except Exception as e:
             print(f"Error updating camera view: {e}")
@@ -5283,14 +5071,14 @@ class PointCloudViewer(ApplicationUI):
 
         # Always update position
         self.slider_marker_actor.SetPosition(world_pos[0], world_pos[1], world_pos[2])
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
     def remove_slider_marker(self):
         """Remove the slider position sphere from the scene"""
         if self.slider_marker_actor is not None:
             self.renderer.RemoveActor(self.slider_marker_actor)
             self.slider_marker_actor = None
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # =======================================================================================================================================
     def save_current_design_layer(self):
@@ -5349,7 +5137,7 @@ class PointCloudViewer(ApplicationUI):
                 continue
 
             # Prepare data structure
-            baseline_data = {
+            metadata = {
                 "baseline_type": ltype.replace('_', ' ').title(),
                 "baseline_key": ltype,
                 "color": self.line_types[ltype]['color'],
@@ -5358,43 +5146,31 @@ class PointCloudViewer(ApplicationUI):
                 "zero_line_end": self.zero_end_point.tolist(),
                 "zero_start_elevation": float(ref_z),
                 "total_chainage_length": float(zero_length),
-                "polylines": []
             }
 
-            # Convert each polyline
+            # Convert each polyline to point columns
+            columns = []
             for poly_2d in polylines:
-                poly_3d_points = []
-                for dist, rel_z in poly_2d:
-                    t = dist / zero_length
-                    pos_along = self.zero_start_point + t * dir_vec
-                    abs_z = ref_z + rel_z
-                    world_point = [float(pos_along[0]), float(pos_along[1]), float(abs_z)]
-
-                    poly_3d_points.append({
-                        "chainage_m": float(dist),
-                        "relative_elevation_m": float(rel_z),
-                        "world_coordinates": world_point
-                    })
-
-                if len(poly_3d_points) >= 2:
-                    start_chainage = poly_3d_points[0]["chainage_m"]
-                    end_chainage = poly_3d_points[-1]["chainage_m"]
-                    baseline_data["polylines"].append({
-                        "start_chainage_m": float(start_chainage),
-                        "end_chainage_m": float(end_chainage),
-                        "points": poly_3d_points
-                    })
+                if len(poly_2d) < 2:
+                    continue
+                dist, rel_z = np.asarray(poly_2d, dtype=np.float64).T
+                t = dist / zero_length
+                world = self.zero_start_point + t[:, None] * dir_vec
+                world[:, 2] = ref_z + rel_z
+                columns.append((
+                    {"start_chainage_m": float(dist[0]), "end_chainage_m": float(dist[-1])},
+                    {"chainage_m": dist, "relative_elevation_m": rel_z, "world_coordinates": world}
+                ))
 
-            if not baseline_data["polylines"]:
+            if not columns:
                 continue
 
-            # Save to JSON file named after baseline type
+            # Metadata in <ltype>_baseline.json, point columns in <ltype>_baseline.npz
             json_filename = f"{ltype}_baseline.json"
             json_path = os.path.join(layer_folder, json_filename)
 
             try:
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(baseline_data, f, indent=4, ensure_ascii=False)
+                write_baseline_columns(json_path, BaselineColumns.from_polylines(metadata, columns))
 
                 saved_count += 1
                 saved_files.append(json_filename)
@@ -5542,7 +5318,7 @@ class PointCloudViewer(ApplicationUI):
 
             # Refresh 3D view
             if hasattr(self, 'vtk_widget'):
-                self.vtk_widget.GetRenderWindow().Render()
+                self.request_render()
 
             # === CRITICAL: Save zero line config to current design layer ===
             success = self.save_zero_line_config_to_current_layer()
@@ -5612,7 +5388,7 @@ class PointCloudViewer(ApplicationUI):
             text_actor.SetCamera(self.renderer.GetActiveCamera())
             self.measurement_actors.append(text_actor)
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         return actor  
     
 # =======================================================================================================================================
@@ -5682,7 +5458,7 @@ class PointCloudViewer(ApplicationUI):
             text_actor.SetCamera(self.renderer.GetActiveCamera())
             self.measurement_actors.append(text_actor)
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return actor
         
 # =======================================================================================================================================
@@ -5710,7 +5486,7 @@ class PointCloudViewer(ApplicationUI):
         text_actor.SetCamera(self.renderer.GetActiveCamera())
         self.measurement_actors.append(text_actor)
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         
 # =======================================================================================================================================
 # Define a fucntion for the add text label on point cloud data
@@ -5749,7 +5525,7 @@ class PointCloudViewer(ApplicationUI):
                 self.measurement_actors.append(text_actor)
 
             # Render update
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         except Exception as e:
             print(f"Error adding text label: {e}")
@@ -5763,7 +5539,7 @@ class PointCloudViewer(ApplicationUI):
                 if self.point_cloud and self.renderer:
                     self.renderer.ResetCamera()
                     if self.vtk_widget:
-                        self.vtk_widget.GetRenderWindow().Render()
+                        self.request_render()
             elif state == Qt.WindowMinimized:
                 pass # No specific action needed for minimize
 
@@ -5771,7 +5547,7 @@ class PointCloudViewer(ApplicationUI):
     def resizeEvent(self, event):
         super(PointCloudViewer, self).resizeEvent(event)
         if self.vtk_widget:
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 
 #                                   =============================================================
@@ -5788,151 +5564,215 @@ class PointCloudViewer(ApplicationUI):
             "Point Cloud Files (*.ply *.pcd *.xyz);;All Files (*)")
         if not file_path:
             return
-        try:
-            # --- Store the loaded file path and name for later use ---
-            self.loaded_file_path = file_path
-            self.loaded_file_name = os.path.splitext(os.path.basename(file_path))[0]
-            # Show progress bar with file name
-            self.show_progress_bar(file_path)
-            self.update_progress(10, "Starting file loading...")
-            # Read the file directly without intermediate processing steps
-            if file_path.endswith('.ply') or file_path.endswith('.pcd'):
-                self.update_progress(30, "Loading point cloud data...")
-                self.point_cloud = o3d.io.read_point_cloud(file_path)
-  
-            elif file_path.endswith('.xyz'):
-                self.update_progress(30, "Loading XYZ data...")
-                # For XYZ files, use numpy's faster loading
-                data = np.loadtxt(file_path, usecols=(0, 1, 2)) # Only load XYZ columns
-                self.point_cloud = o3d.geometry.PointCloud()
-                self.point_cloud.points = o3d.utility.Vector3dVector(data[:, :3])
-            if not self.point_cloud.has_points():
-                raise ValueError("No points found in the file.")
-            # Skip color processing if not needed for faster loading
-            if self.point_cloud.has_colors():
-                self.update_progress(70, "Processing colors...")
-            else:
-                self.update_progress(70, "Preparing visualization...")
-            # Directly convert to VTK format without intermediate steps
-            self.update_progress(90, "Creating visualization...")
-            self.display_point_cloud()
-            # self.start_button.setEnabled(True)
-            # Final update before hiding
-            self.update_progress(100, "Loading complete!")
-            QTimer.singleShot(100, self.hide_progress_bar)
-        except Exception as e:
-            self.hide_progress_bar()
+        self.start_point_cloud_loading(file_path)
 
 # =======================================================================================================================================
     def load_point_cloud_from_path(self, file_path: str):
         """
         Load a point cloud from a given file path without showing QFileDialog.
         Used for auto-loading point clouds linked to a project after creating a new worksheet.
-        Reuses the same logic as load_point_cloud() for consistency.
+        Reading happens in the background (see start_point_cloud_loading), so a True result
+        means loading has started, not that it has finished.
         """
         if not file_path or not os.path.exists(file_path):
             self.message_text.append(f"Point cloud file not found or invalid: {file_path}")
             return False
 
-        try:
-            # Store the loaded file path and name
-            self.loaded_file_path = file_path
-            self.loaded_file_name = os.path.splitext(os.path.basename(file_path))[0]
-
-            # Show progress bar with file info
-            self.show_progress_bar(file_path)
-            self.update_progress(10, "Starting file loading...")
-
-            # Read the file
-            if file_path.lower().endswith(('.ply', '.pcd')):
-                self.update_progress(30, "Loading point cloud data...")
-                self.point_cloud = o3d.io.read_point_cloud(file_path)
-
-            elif file_path.lower().endswith('.xyz'):
-                self.update_progress(30, "Loading XYZ data...")
-                data = np.loadtxt(file_path, usecols=(0, 1, 2))
-                self.point_cloud = o3d.geometry.PointCloud()
-                self.point_cloud.points = o3d.utility.Vector3dVector(data[:, :3])
-
-            else:
-                raise ValueError(f"Unsupported file format: {os.path.splitext(file_path)[1]}")
+        if not file_path.lower().endswith(('.ply', '.pcd', '.xyz')):
+            self.message_text.append(f"Failed to load point cloud '{os.path.basename(file_path)}': "
+                                     f"Unsupported file format: {os.path.splitext(file_path)[1]}")
+            return False
 
-            if not self.point_cloud.has_points():
-                raise ValueError("No points found in the file.")
+        return self.start_point_cloud_loading(file_path)
 
-            if self.point_cloud.has_colors():
-                self.update_progress(70, "Processing colors...")
-            else:
-                self.update_progress(70, "Preparing visualization...")
+# =======================================================================================================================================
+    def start_point_cloud_loading(self, file_path):
+        """Read the file on a PointCloudLoader thread, showing a coarse preview while it runs"""
+        if self.point_cloud_loader:
+            self.point_cloud_loader.cancel()
 
-            self.update_progress(90, "Creating visualization...")
-            self.display_point_cloud()
+        # Store the loaded file path and name for later use
+        self.loaded_file_path = file_path
+        self.loaded_file_name = os.path.splitext(os.path.basename(file_path))[0]
 
-            self.update_progress(100, "Loading complete!")
-            QTimer.singleShot(500, self.hide_progress_bar)
+        self.show_progress_bar(file_path)
+        self.cancel_load_button.setVisible(True)
+        self.update_progress(5, "Starting file loading...")
+
+        loader = PointCloudLoader(file_path, cache_dir=self.get_point_cloud_cache_dir(), parent=self)
+        loader.progress.connect(self.on_point_cloud_load_progress)
+        loader.preview_ready.connect(self.display_point_cloud_preview)
+        loader.loaded.connect(self.on_point_cloud_loaded)
+        loader.index_ready.connect(self.on_point_cloud_index_ready)
+        loader.failed.connect(self.on_point_cloud_load_failed)
+        loader.finished.connect(loader.deleteLater)
+        self.point_cloud_loader = loader
+        loader.start()
+        return True
+
+    def get_point_cloud_cache_dir(self):
+        """Binary point cache folder of the current worksheet (None when no worksheet is open)"""
+        if not self.current_worksheet_name:
+            return None
+        return os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name, CACHE_FOLDER_NAME)
 
-            self.message_text.append(f"Successfully loaded point cloud: {os.path.basename(file_path)}")
-            return True
+    def cancel_point_cloud_loading(self):
+        """Stop the running background load and drop its preview"""
+        if not self.point_cloud_loader:
+            return
+        self.point_cloud_loader.cancel()
+        self.point_cloud_loader = None
+        self.remove_point_cloud_preview()
+        self.hide_progress_bar()
+        self.request_render()
+        self.message_text.append("Point cloud loading cancelled.")
 
-        except Exception as e:
-            self.hide_progress_bar()
-            self.message_text.append(f"Failed to load point cloud '{os.path.basename(file_path)}': {str(e)}")
-            QMessageBox.warning(self, "Load Failed", f"Could not load point cloud:\n{file_path}\n\nError: {str(e)}")
-            return False
+    def on_point_cloud_load_progress(self, value, message):
+        # Ignore signals from a loader that has been cancelled or replaced
+        if self.sender() is not self.point_cloud_loader:
+            return
+        self.update_progress(value, message)
 
-# =======================================================================================================================================
-    def display_point_cloud(self):
+    def display_point_cloud_preview(self, points, colors):
+        """Show the coarse subsample emitted by the loader until the full cloud is ready"""
+        if self.sender() is not self.point_cloud_loader:
+            return
+        self.remove_point_cloud_preview()
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputData(create_point_cloud_polydata(points, colors))
+        self.point_cloud_preview_actor = vtk.vtkActor()
+        self.point_cloud_preview_actor.SetMapper(mapper)
+        self.point_cloud_preview_actor.GetProperty().SetPointSize(2)
+        if colors is None:
+            self.point_cloud_preview_actor.GetProperty().SetColor(self.colors.GetColor3d("Black"))
+        self.renderer.AddActor(self.point_cloud_preview_actor)
+        self.renderer.ResetCamera()
+        self.request_render()
+
+    def remove_point_cloud_preview(self):
+        if self.point_cloud_preview_actor:
+            self.renderer.RemoveActor(self.point_cloud_preview_actor)
+            self.point_cloud_preview_actor = None
+
+    def on_point_cloud_loaded(self, point_cloud, octree):
+        if self.sender() is not self.point_cloud_loader:
+            return
+        self.point_cloud_loader = None
+        self.cancel_load_button.setVisible(False)
+        if self.elevation_raster_builder:
+            self.elevation_raster_builder.cancel()
+            self.elevation_raster_builder = None
+        self.abort_elevation_raster_requests("A new point cloud was loaded before its elevation model was ready.")
+        self.point_cloud = point_cloud
+        self.loaded_point_cloud = point_cloud
+        self.point_cloud_index_pending = point_cloud
+        self.remove_point_cloud_preview()
+        self.update_progress(90, "Creating visualization...")
+        self.display_point_cloud(octree)
+        self.update_progress(100, "Loading complete!")
+        QTimer.singleShot(500, self.hide_progress_bar)
+        self.message_text.append(f"Successfully loaded point cloud: {os.path.basename(self.loaded_file_path)}")
+
+    def on_point_cloud_index_ready(self, point_cloud, index):
+        # The loader keeps building the index after loaded; drop it if another cloud replaced this one
+        if point_cloud is not self.point_cloud:
+            return
+        self.point_cloud_index = index
+        self.point_cloud_index_source = point_cloud
+        self.point_cloud_index_pending = None
+        # Prepare the cut/fill DEM in the background so the first volume query does not wait
+        self.start_elevation_raster_build()
+
+    def get_point_cloud_index(self):
+        """KD-tree of self.point_cloud for snapping, or None while the loader is still building it"""
+        if not self.point_cloud:
+            return None
+        if self.point_cloud_index is not None and self.point_cloud_index_source is self.point_cloud:
+            return self.point_cloud_index
+        if self.point_cloud_index_pending is self.point_cloud:
+            return None
+        # Clouds replaced outside the loader (cropping etc.) are indexed on first use
+        self.point_cloud_index = PointCloudSpatialIndex(point_cloud_arrays(self.point_cloud)[0])
+        self.point_cloud_index_source = self.point_cloud
+        return self.point_cloud_index
+
+    def on_point_cloud_load_failed(self, error):
+        if self.sender() is not self.point_cloud_loader:
+            return
+        self.point_cloud_loader = None
+        self.remove_point_cloud_preview()
+        self.hide_progress_bar()
+        file_path = self.loaded_file_path
+        self.message_text.append(f"Failed to load point cloud '{os.path.basename(file_path)}': {error}")
+        QMessageBox.warning(self, "Load Failed", f"Could not load point cloud:\n{file_path}\n\nError: {error}")
+
+    def closeEvent(self, event):
+        # Let running loader threads (including ones still building an index) stop before
+        # the window, their parent, is destroyed
+        self.point_cloud_loader = None
+        self.elevation_raster_builder = None
+        self.elevation_raster_requests = []
+        for loader in self.findChildren(PointCloudLoader) + self.findChildren(ElevationRasterBuilder):
+            loader.cancel()
+            loader.wait()
+        super().closeEvent(event)
+
+# =======================================================================================================================================
+    def display_point_cloud(self, octree=None):
         if not self.point_cloud:
             return
         # Clear previous point cloud if any
         if self.point_cloud_actor:
             self.renderer.RemoveActor(self.point_cloud_actor)
+        self.point_cloud_lod = None
         self.update_progress(92, "Converting to VTK format...")
-        # Convert Open3D point cloud to VTK format
-        points = np.asarray(self.point_cloud.points)
-        # Create VTK points
-        vtk_points = vtk.vtkPoints()
-        for i, point in enumerate(points):
-            vtk_points.InsertNextPoint(point[0], point[1], point[2])
-            # Update progress every 1000 points
-            if i % 1000 == 0:
-                progress = 92 + int(6 * (i / len(points)))
-                self.update_progress(min(progress, 98), f"Processing points: {i}/{len(points)}")
-        # Create VTK polydata
-        polydata = vtk.vtkPolyData()
-        polydata.SetPoints(vtk_points)
-        # Create vertex cells
-        vertices = vtk.vtkCellArray()
-        for i in range(points.shape[0]):
-            vertices.InsertNextCell(1)
-            vertices.InsertCellPoint(i)
-        polydata.SetVerts(vertices)
-        # Add color information if available
-        if self.point_cloud.has_colors():
-            self.update_progress(95, "Processing colors...")
-            colors = np.asarray(self.point_cloud.colors) * 255 # Convert from 0-1 to 0-255
-            vtk_colors = vtk.vtkUnsignedCharArray()
-            vtk_colors.SetNumberOfComponents(3)
-            vtk_colors.SetName("Colors")
-            for color in colors:
-                vtk_colors.InsertNextTuple3(color[0], color[1], color[2])
-            polydata.GetPointData().SetScalars(vtk_colors)
-        # Create mapper and actor
-        self.update_progress(97, "Creating visualization...")
-        mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInputData(polydata)
-        self.point_cloud_actor = vtk.vtkActor()
-        self.point_cloud_actor.SetMapper(mapper)
-        self.point_cloud_actor.GetProperty().SetPointSize(2)
-        # Only set color if no vertex colors are present
-        if not self.point_cloud.has_colors():
-            self.point_cloud_actor.GetProperty().SetColor(self.colors.GetColor3d("Black"))
+        # Open3D buffers or the memory-mapped cache arrays, never a copy
+        points, colors = point_cloud_arrays(self.point_cloud)
+        if octree is None and len(points) > LOD_POINT_THRESHOLD:
+            self.update_progress(93, "Building level of detail...")
+            octree = PointCloudOctree(points, colors)
+        if octree is not None:
+            # Large clouds: only the octree nodes needed for the current view are turned into actors
+            self.update_progress(97, "Creating visualization...")
+            self.point_cloud_lod = OctreeLODRenderer(self.renderer, octree,
+                                                     default_color=self.colors.GetColor3d("Black"))
+            self.point_cloud_actor = self.point_cloud_lod.assembly
+        else:
+            # Hand the point buffer to VTK in bulk (points are shared, not copied point by point)
+            if colors is not None:
+                self.update_progress(95, "Processing colors...")
+            polydata = o3d_to_vtk_polydata(self.point_cloud)
+            # Create mapper and actor
+            self.update_progress(97, "Creating visualization...")
+            mapper = vtk.vtkPolyDataMapper()
+            mapper.SetInputData(polydata)
+            self.point_cloud_actor = vtk.vtkActor()
+            self.point_cloud_actor.SetMapper(mapper)
+            self.point_cloud_actor.GetProperty().SetPointSize(2)
+            # Only set color if no vertex colors are present
+            if colors is None:
+                self.point_cloud_actor.GetProperty().SetColor(self.colors.GetColor3d("Black"))
         self.renderer.AddActor(self.point_cloud_actor)
         self.renderer.ResetCamera()
+        if self.point_cloud_lod:
+            self.point_cloud_lod.update(force=True)
         self.update_progress(99, "Finalizing...")
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         self.update_progress(100, "Ready!")
 
+    def schedule_point_cloud_lod_update(self):
+        """Called after every render; refreshes the LOD nodes once the camera has settled for a frame"""
+        if self.point_cloud_lod and not self.lod_update_timer.isActive():
+            self.lod_update_timer.start()
+
+    def update_point_cloud_lod(self):
+        if not self.point_cloud_lod:
+            return
+        if self.point_cloud_lod.update():
+            self.request_render()
+        elif self.point_cloud_lod.pending:
+            self.lod_update_timer.start()
+
 # =======================================================================================================================================
 # Define the function for the update the mesurement metrics as per the selected metrics::
     def update_measurement_metrics(self):
@@ -5967,7 +5807,7 @@ class PointCloudViewer(ApplicationUI):
                 except:
                     continue
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def get_current_units(self):
@@ -6174,28 +6014,28 @@ class PointCloudViewer(ApplicationUI):
         camera = self.renderer.GetActiveCamera()
         camera.Elevation(-degrees)  # Negative for upward rotation
         camera.OrthogonalizeViewUp()
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
     def rotate_down(self, degrees=15):
         """Rotate the view downward"""
         camera = self.renderer.GetActiveCamera()
         camera.Elevation(degrees)  # Positive for downward rotation
         camera.OrthogonalizeViewUp()
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
     def rotate_left(self, degrees=15):
         """Rotate the view to the left"""
         camera = self.renderer.GetActiveCamera()
         camera.Azimuth(-degrees)  # Negative for left rotation
         camera.OrthogonalizeViewUp()
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
     def rotate_right(self, degrees=15):
         """Rotate the view to the right"""
         camera = self.renderer.GetActiveCamera()
         camera.Azimuth(degrees)  # Positive for right rotation
         camera.OrthogonalizeViewUp()
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
             
 # =======================================================================================================================================
 # Define function for Key press handler for Space bar freeze/unfreeze
@@ -6227,7 +6067,7 @@ class PointCloudViewer(ApplicationUI):
                 style = vtkInteractorStyleTrackballCamera()
                 interactor.SetInteractorStyle(style)
                 # self.output_list.addItem("View unfrozen")
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         if key == 'escape' and self.active_line_type and self.current_points:
             self.finish_current_polyline()
@@ -6306,11 +6146,15 @@ class PointCloudViewer(ApplicationUI):
             clicked_point = np.array(cell_picker.GetPickPosition())
             
             # Find the nearest actual point in the point cloud to our picked position
-            points = np.asarray(self.point_cloud.points)
-            if len(points) > 0:
-                distances = np.sum((points - clicked_point)**2, axis=1)
-                nearest_idx = np.argmin(distances)
-                clicked_point = points[nearest_idx]
+            index = self.get_point_cloud_index()
+            if index is not None:
+                _, clicked_point = index.nearest(clicked_point)
+            else:
+                points = point_cloud_arrays(self.point_cloud)[0]
+                if len(points) > 0:
+                    distances = np.sum((points - clicked_point)**2, axis=1)
+                    nearest_idx = np.argmin(distances)
+                    clicked_point = points[nearest_idx]
         
         # If still no point found, use the neighborhood search
         if clicked_point is None:
@@ -6396,7 +6240,7 @@ class PointCloudViewer(ApplicationUI):
                     self.measurement_widget.add_line((points[-2], points[-1]))
                     self.measurement_widget.update()
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         if self.current_measurement == 'ohe_pole_angle_with_rail':
@@ -6413,7 +6257,7 @@ class PointCloudViewer(ApplicationUI):
             ))
 
             self.process_ohe_pole_angle_measurement()
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return            
         
         if self.current_measurement == 'all_angles':
@@ -6441,7 +6285,7 @@ class PointCloudViewer(ApplicationUI):
                     self.measurement_widget.update()
 
             self.process_all_angles()
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
 
         if self.current_measurement == 'defect_angle':
@@ -6457,7 +6301,7 @@ class PointCloudViewer(ApplicationUI):
                 int(clicked_point[1] * 10 + 100)
             ))
             self.process_defect_angle()
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
 
         if self.current_measurement == 'distance_between_catenary_to_raillevel':           
@@ -6472,7 +6316,7 @@ class PointCloudViewer(ApplicationUI):
                 int(clicked_point[0] * 10 + 100),
                 int(clicked_point[1] * 10 + 100)
             ))
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         if self.current_measurement == 'distance_between_contact_to_raillevel':           
@@ -6487,7 +6331,7 @@ class PointCloudViewer(ApplicationUI):
                 int(clicked_point[0] * 10 + 100),
                 int(clicked_point[1] * 10 + 100)
             ))
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         if self.current_measurement == 'contact_wire_points':
@@ -6501,7 +6345,7 @@ class PointCloudViewer(ApplicationUI):
                 int(clicked_point[0] * 10 + 100),
                 int(clicked_point[1] * 10 + 100)
             ))
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         if self.current_measurement == 'distance_between_catenary_to_contact':
@@ -6516,7 +6360,7 @@ class PointCloudViewer(ApplicationUI):
                 int(clicked_point[0] * 10 + 100),
                 int(clicked_point[1] * 10 + 100)
             ))
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
 
         # Handle measurement line case (3 base points)
@@ -6542,7 +6386,7 @@ class PointCloudViewer(ApplicationUI):
             if len(self.measurement_line_points) == 3:
                 self.process_measurement_line()
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         # Handle vertical line case (after measurement line is set)
@@ -6559,7 +6403,7 @@ class PointCloudViewer(ApplicationUI):
                 # Calculate and display all measurements
                 self.process_measurement_with_vertical()
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         # Handle vertical line measurement with baseline snapping
@@ -6598,7 +6442,7 @@ class PointCloudViewer(ApplicationUI):
                 
                 self.process_vertical_line_measurement()
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         # Handle horizontal line measurement
@@ -6611,7 +6455,7 @@ class PointCloudViewer(ApplicationUI):
             
             self.process_horizontal_line_measurement()
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         # Handle polygon measurement
@@ -6628,7 +6472,7 @@ class PointCloudViewer(ApplicationUI):
                     int(clicked_point[0] * 10 + 100),
                     int(clicked_point[1] * 10 + 100)
                 ))
-                self.vtk_widget.GetRenderWindow().Render()
+                self.request_render()
                 return
                     
             # For regular clicks (adding points)
@@ -6654,7 +6498,7 @@ class PointCloudViewer(ApplicationUI):
                     self.measurement_widget.add_line((points[-2], points[-1]))
                     self.measurement_widget.update()              
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def find_nearest_point_in_neighborhood(self, click_pos, search_radius=4):
@@ -6669,27 +6513,19 @@ class PointCloudViewer(ApplicationUI):
         """
         if not hasattr(self, 'point_cloud') or not self.point_cloud:
             return None
-        
-        points = np.asarray(self.point_cloud.points)
+
+        # Project only the points near the pick ray when the KD-tree is available
+        index = self.get_point_cloud_index()
+        if index is not None:
+            return index.pick(self.renderer, click_pos[0], click_pos[1], search_radius)
+
+        points = point_cloud_arrays(self.point_cloud)[0]
         if len(points) == 0:
             return None
-    
-        # Convert all points to display coordinates
-        renderer = self.renderer
-        display_coords = []
-    
-        for point in points:
-            try:
-                display_coord = renderer.WorldToDisplay(point[0], point[1], point[2])
-                display_coords.append(display_coord[:2])  # Only need x,y
-            except:
-                continue
-    
-        if not display_coords:
-            return None
-        
-        display_coords = np.array(display_coords)
-    
+
+        # Index still being built: project all points in one vectorized pass
+        display_coords, _ = world_to_display(self.renderer, points)
+
         # Calculate distances from click position
         distances = np.sqrt(
             (display_coords[:, 0] - click_pos[0])**2 + 
@@ -7285,7 +7121,7 @@ class PointCloudViewer(ApplicationUI):
             label_pos = centroid - np.array([0, 0, value_meters/2])
             self.add_text_label(label_pos, f"d={value_meters:.2f}m", "White")
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def remove_height_visualization(self):
@@ -7300,7 +7136,7 @@ class PointCloudViewer(ApplicationUI):
             if actor in self.measurement_actors:
                 self.measurement_actors.remove(actor)
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def remove_depth_visualization(self):
@@ -7315,7 +7151,7 @@ class PointCloudViewer(ApplicationUI):
             if actor in self.measurement_actors:
                 self.measurement_actors.remove(actor)
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================    
     def remove_volume_visualization(self):
@@ -7346,7 +7182,7 @@ class PointCloudViewer(ApplicationUI):
             if actor in self.measurement_actors:
                 self.measurement_actors.remove(actor)
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def hide_surface_controls(self):
@@ -7436,7 +7272,7 @@ class PointCloudViewer(ApplicationUI):
         label_text = f"{angle_deg:.1f}°"
         self.add_text_label(inter_pt, label_text, color="Blue", scale=0.4) 
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
     
 # =======================================================================================================================================
 # Define function for the All Angle Measurements:
@@ -7474,7 +7310,7 @@ class PointCloudViewer(ApplicationUI):
         label_text = f"{angle_deg:.1f}°"
         self.add_text_label(p2, label_text, color="Blue", scale=0.4)
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================    
 # Define function for the Defect Angle Measurements:
@@ -7554,7 +7390,7 @@ class PointCloudViewer(ApplicationUI):
             "label": f"{theta_deg:.2f}°"
         })
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================    
 # Define function for the Complete Curve Measurements:
@@ -7591,12 +7427,9 @@ class PointCloudViewer(ApplicationUI):
 
         # --- Prepare spline points ---
         pts = np.array(self.measurement_points, dtype=float)
-        vtk_pts = vtk.vtkPoints()
-        for p in pts:
-            vtk_pts.InsertNextPoint(float(p[0]), float(p[1]), float(p[2]))
 
         spline = vtk.vtkParametricSpline()
-        spline.SetPoints(vtk_pts)
+        spline.SetPoints(numpy_to_vtk_points(pts))
 
         func_src = vtk.vtkParametricFunctionSource()
         func_src.SetParametricFunction(spline)
@@ -7614,11 +7447,7 @@ class PointCloudViewer(ApplicationUI):
         self.measurement_actors.append(actor)
 
         # Sample spline points
-        out_pd = func_src.GetOutput()
-        n_sample = out_pd.GetPoints().GetNumberOfPoints()
-        sampled = np.zeros((n_sample, 3), dtype=float)
-        for i in range(n_sample):
-            sampled[i] = out_pd.GetPoints().GetPoint(i)
+        sampled = polydata_points_to_numpy(func_src.GetOutput())
 
         # Baseline vector (horizontal only)
         baseline_vec = pts[-1] - pts[0]
@@ -7701,7 +7530,7 @@ class PointCloudViewer(ApplicationUI):
         {"pos": list(map(float, p1)), "text": f"{interior_start:.1f}°"},
         {"pos": list(map(float, p2)), "text": f"{interior_end:.1f}°"}]
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
         if self.current_measurement == 'distance_between_catenary_to_raillevel':
 
@@ -7787,27 +7616,8 @@ class PointCloudViewer(ApplicationUI):
         bottom_points = sampled.copy()
         bottom_points[:, 2] = OHE_baseline_z  # flatten all to baseline z
 
-        # Build vtk points
-        vtk_points = vtk.vtkPoints()
-        for p_top, p_bottom in zip(sampled, bottom_points):
-            vtk_points.InsertNextPoint(*p_top)
-            vtk_points.InsertNextPoint(*p_bottom)
-
-        # Create quads (pairs between consecutive spline segments)
-        quads = vtk.vtkCellArray()
-        for i in range(len(sampled) - 1):
-            quad = vtk.vtkQuad()
-            # top i, bottom i, bottom i+1, top i+1
-            quad.GetPointIds().SetId(0, 2*i)
-            quad.GetPointIds().SetId(1, 2*i + 1)
-            quad.GetPointIds().SetId(2, 2*(i+1) + 1)
-            quad.GetPointIds().SetId(3, 2*(i+1))
-            quads.InsertNextCell(quad)
-
-        # Create polydata and actor
-        plane_polydata = vtk.vtkPolyData()
-        plane_polydata.SetPoints(vtk_points)
-        plane_polydata.SetPolys(quads)
+        # Quads between consecutive spline samples and their baseline feet
+        plane_polydata = create_curtain_polydata(sampled, bottom_points)
 
         mapper = vtk.vtkPolyDataMapper()
         mapper.SetInputData(plane_polydata)
@@ -7821,7 +7631,7 @@ class PointCloudViewer(ApplicationUI):
 
         self.renderer.AddActor(actor)
         self.measurement_actors.append(actor)
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
         # --- Vertical height measurement every 3m along baseline ---
 
@@ -7861,12 +7671,12 @@ class PointCloudViewer(ApplicationUI):
             )
 
         self.output_list.addItem("----------------------------------------------")
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
         # Hide Complete curve button
         self.complete_curve_button.setVisible(False)
         self.complete_curve_button.setStyleSheet("")
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         
 # =======================================================================================================================================    
 # Define function for the Elevation between Catenary and Contact Wire:
@@ -7874,12 +7684,9 @@ class PointCloudViewer(ApplicationUI):
 
         # --- Prepare and draw contact wire spline (lower) ---
         contact_pts = np.array(contact_wire_points, dtype=float)
-        vtk_pts = vtk.vtkPoints()
-        for p in contact_pts:
-            vtk_pts.InsertNextPoint(*map(float, p))
 
         spline = vtk.vtkParametricSpline()
-        spline.SetPoints(vtk_pts)
+        spline.SetPoints(numpy_to_vtk_points(contact_pts))
 
         func_src = vtk.vtkParametricFunctionSource()
         func_src.SetParametricFunction(spline)
@@ -7896,9 +7703,7 @@ class PointCloudViewer(ApplicationUI):
         self.measurement_actors.append(actor)
 
         # --- Extract sampled contact points ---
-        out_pd = func_src.GetOutput()
-        n_sample = out_pd.GetPoints().GetNumberOfPoints()
-        contact_sampled = np.array([out_pd.GetPoints().GetPoint(i) for i in range(n_sample)])
+        contact_sampled = polydata_points_to_numpy(func_src.GetOutput())
 
         # --- Find first and last matching verticals between measured and contact splines ---
         def find_closest_spline_point(point, sampled_points):
@@ -7942,26 +7747,8 @@ class PointCloudViewer(ApplicationUI):
         if len(lower_pts) != len(upper_pts):
             lower_pts = resample_spline(lower_pts, len(upper_pts))
 
-        n_pairs = len(upper_pts)
-
         # --- Build purple semi-transparent plane between splines ---
-        vtk_points = vtk.vtkPoints()
-        for up, low in zip(upper_pts, lower_pts):
-            vtk_points.InsertNextPoint(*up)
-            vtk_points.InsertNextPoint(*low)
-
-        quads = vtk.vtkCellArray()
-        for i in range(n_pairs - 1):
-            quad = vtk.vtkQuad()
-            quad.GetPointIds().SetId(0, 2*i)
-            quad.GetPointIds().SetId(1, 2*i + 1)
-            quad.GetPointIds().SetId(2, 2*(i+1) + 1)
-            quad.GetPointIds().SetId(3, 2*(i+1))
-            quads.InsertNextCell(quad)
-
-        plane_polydata = vtk.vtkPolyData()
-        plane_polydata.SetPoints(vtk_points)
-        plane_polydata.SetPolys(quads)
+        plane_polydata = create_curtain_polydata(upper_pts, lower_pts)
 
         mapper = vtk.vtkPolyDataMapper()
         mapper.SetInputData(plane_polydata)
@@ -8016,7 +7803,7 @@ class PointCloudViewer(ApplicationUI):
         # Hide "Complete Curve" button
         self.complete_curve_button.setVisible(False)
         self.complete_curve_button.setStyleSheet("")
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def process_vertical_line_measurement(self):
@@ -8095,7 +7882,7 @@ class PointCloudViewer(ApplicationUI):
         }
         })
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def process_horizontal_line_measurement(self):
@@ -8379,7 +8166,7 @@ class PointCloudViewer(ApplicationUI):
             # Show surface-related buttons in Measurement section
             self.show_surface_controls_in_measurement()
                 
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         
 # =======================================================================================================================================        
 # Define function for the Polygon Measurements:
@@ -8659,7 +8446,7 @@ class PointCloudViewer(ApplicationUI):
                 actor.GetProperty().SetColor(self.colors.GetColor3d(color_name))
                 break
     
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def show_surface_controls_in_measurement(self):
@@ -8800,7 +8587,7 @@ class PointCloudViewer(ApplicationUI):
         self.update_polygon_digging_combos()
 
         # Render the changes
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
         return label
     
@@ -8828,7 +8615,7 @@ class PointCloudViewer(ApplicationUI):
             to_label = self.to_digging_combo.currentText()
             self.change_digging_point_color(to_label, "Yellow")
     
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
 # Function for the change the digging point color:
@@ -8946,7 +8733,7 @@ class PointCloudViewer(ApplicationUI):
             to_label = self.digging_points_info[to_idx]['label']
             self.change_digging_point_color(to_label, "Yellow")
     
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
 # Define the function for the change the color of digging points while conecting the points:
@@ -9086,7 +8873,7 @@ class PointCloudViewer(ApplicationUI):
         self.change_digging_point_color(digging_label, "Yellow")
 
         # Render changes
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def add_point_to_round_pillar_polygon(self, point):
@@ -9111,7 +8898,7 @@ class PointCloudViewer(ApplicationUI):
                 self.measurement_widget.add_line((self.measurement_widget.points[-2], 
                                             self.measurement_widget.points[-1]))
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
     def update_surface_combo(self):
@@ -9220,7 +9007,7 @@ class PointCloudViewer(ApplicationUI):
             # Add label at centroid
             self.add_text_label(center, surface['label'], "White")
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
 # Define the function for identify the side surface of the 3D polygon:
@@ -9333,26 +9120,15 @@ class PointCloudViewer(ApplicationUI):
             # self.output_list.addItem("Selected surface doesn't have enough points")
             return
         
-        # Create a polygon path from surface points (projected to XY plane)
-        polygon_path = matplotlib.path.Path([(p[0], p[1]) for p in surface_points])
-        
-        # Get all points from the point cloud
-        points = np.asarray(self.point_cloud.points)
-        colors = np.asarray(self.point_cloud.colors) if self.point_cloud.has_colors() else None
+        # Get all points from the point cloud (the cached memory map when opened from the cache)
+        points, colors = point_cloud_arrays(self.point_cloud)
         
-        # Find points inside the polygon
-        inside = polygon_path.contains_points(points[:, :2])
-        outside_points = points[~inside]
-        
-        if colors is not None:
-            outside_colors = colors[~inside]
+        # Find points inside the polygon formed by the surface points (projected to XY plane)
+        inside = polygon_mask(points, np.array([(p[0], p[1]) for p in surface_points]))
+        outside = ~inside
         
         # Create new point cloud with only points outside the polygon
-        new_cloud = o3d.geometry.PointCloud()
-        new_cloud.points = o3d.utility.Vector3dVector(outside_points)
-        
-        if colors is not None:
-            new_cloud.colors = o3d.utility.Vector3dVector(outside_colors)
+        new_cloud = open3d_point_cloud(points[outside], colors[outside] if colors is not None else None)
         
         # Replace the original point cloud
         self.point_cloud = new_cloud
@@ -9372,7 +9148,7 @@ class PointCloudViewer(ApplicationUI):
         # self.output_list.addItem(f"Cut {surface['label']} - removed {np.sum(inside)} points")
         self.cutting_mode = False
         self.cut_surface_button.setChecked(False)
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
 # Define the function remove the surface color:
@@ -9699,22 +9475,14 @@ class PointCloudViewer(ApplicationUI):
             return
         
         try:
-            # Get all points from the point cloud
-            points = np.asarray(self.point_cloud.points)
-            colors = np.asarray(self.point_cloud.colors) if self.point_cloud.has_colors() else None
+            # Get all points from the point cloud (the cached memory map when opened from the cache)
+            points, colors = point_cloud_arrays(self.point_cloud)
             
-            # Create a polygon path from measurement points (projected to XY plane)
-            polygon_path = matplotlib.path.Path([(p[0], p[1]) for p in self.measurement_points])
-            
-            # Find points inside the polygon
-            inside = polygon_path.contains_points(points[:, :2])
+            # Find points inside the polygon formed by the measurement points (projected to XY plane)
+            inside = polygon_mask(points, np.array([(p[0], p[1]) for p in self.measurement_points]))
             
             # Create new point cloud with only points inside the polygon
-            self.cropped_cloud = o3d.geometry.PointCloud()
-            self.cropped_cloud.points = o3d.utility.Vector3dVector(points[inside])
-            
-            if colors is not None:
-                self.cropped_cloud.colors = o3d.utility.Vector3dVector(colors[inside])
+            self.cropped_cloud = open3d_point_cloud(points[inside], colors[inside] if colors is not None else None)
             
             # Display the cropped cloud
             self.display_cropped_cloud()
@@ -9839,36 +9607,31 @@ class PointCloudViewer(ApplicationUI):
 
 # =======================================================================================================================================    
 # Volume calculation of Extracted 3D Polygon Geometry by using the Delaunay Triangulation
-    def calculate_volume(self, points):
+    def calculate_volume(self, points, use_convex_hull=True):
         """
         Calculates the volume of an irregular 3D shape using Delaunay triangulation.
-    
+
+        The Delaunay tetrahedra of a point set always fill its convex hull, so the hull volume
+        from Qhull is the same number and is used as the fast path. With use_convex_hull=False
+        the tetrahedra are triangulated and summed in one vectorized pass.
+
         Args:
             points: A numpy array of shape (n, 3) representing the vertices of the shape.
-        
+            use_convex_hull: Use scipy ConvexHull instead of summing the Delaunay tetrahedra.
+
         Returns:
             The volume of the shape.
         """
         try:
-            from scipy.spatial import Delaunay
-            import numpy as np
-        
+            from scipy.spatial import Delaunay, ConvexHull
+
+            points = np.asarray(points, dtype=np.float64)
+            if use_convex_hull:
+                return float(ConvexHull(points).volume)
+
             tri = Delaunay(points)
-            tetrahedra = points[tri.simplices]
-        
-            total_volume = 0
-            for tetrahedron in tetrahedra:
-                x0, y0, z0 = tetrahedron[0]
-                x1, y1, z1 = tetrahedron[1]
-                x2, y2, z2 = tetrahedron[2]
-                x3, y3, z3 = tetrahedron[3]
-            
-                volume = (1/6) * abs(np.linalg.det(np.array([[x1-x0, y1-y0, z1-z0],
-                                                         [x2-x0, y2-y0, z2-z0],
-                                                         [x3-x0, y3-y0, z3-z0]])))
-                total_volume += volume
-            return total_volume
-        
+            return tetrahedra_volume(points, tri.simplices)
+
         except ImportError:
             self.output_list.addItem("Error: scipy package required for volume calculation")
             return None
@@ -9921,7 +9684,7 @@ class PointCloudViewer(ApplicationUI):
                                 break
             
             # self.output_list.addItem(f"Highlighted {surface_label} in green")
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # =======================================================================================================================================
 # Define function to process pillar dimensions
@@ -10013,7 +9776,7 @@ class PointCloudViewer(ApplicationUI):
         
         try:
             # Calculate minimum Z of point cloud
-            points = np.asarray(self.point_cloud.points)
+            points = point_cloud_arrays(self.point_cloud)[0]
             if len(points) == 0:
                 self.output_list.addItem("No points in cloud to calculate baseline")
                 return
@@ -10072,7 +9835,7 @@ class PointCloudViewer(ApplicationUI):
             self.output_list.addItem(f"Baseline created at Z = {baseline_z:.2f} (min Z: {min_z:.2f} + height: {height:.2f})")
             self.output_list.addItem(f"Baseline dimensions: X = {(max_pt[0]-min_pt[0]):.2f}m, Y = {(max_pt[1]-min_pt[1]):.2f}m")
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             
         except Exception as e:
             self.output_list.addItem(f"Error creating baseline: {str(e)}")
@@ -10183,7 +9946,7 @@ class PointCloudViewer(ApplicationUI):
         label_pos = p2 + np.array([0.2, 0.2, 0])  # Offset slightly
         self.add_text_label(label_pos, f"{angle:.1f}°", "Yellow")
         
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
 # Define the function for the handle the Presized button action:
@@ -10284,7 +10047,7 @@ class PointCloudViewer(ApplicationUI):
             except Exception as e:
                 self.output_list.addItem(f"")
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         if (hasattr(self, 'current_measurement') and 
@@ -10374,7 +10137,7 @@ class PointCloudViewer(ApplicationUI):
             except Exception as e:
                 self.output_list.addItem(f"")
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         
         if (hasattr(self, 'current_measurement') and self.current_measurement == 'vertical_line' and \
@@ -10485,7 +10248,7 @@ class PointCloudViewer(ApplicationUI):
                     
                 except Exception as e:
                     self.output_list.addItem(f"Error in presizing measurement: {str(e)}")
-                self.vtk_widget.GetRenderWindow().Render()
+                self.request_render()
                 return
 
 # =======================================================================================================================================      
@@ -10645,7 +10408,7 @@ class PointCloudViewer(ApplicationUI):
             }
             self.measurement_widget.update()
             
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
             return distance_meters
             
@@ -11463,7 +11226,7 @@ class PointCloudViewer(ApplicationUI):
 
         self.current_measurement = None
         if hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         # for polygon and its volume 
         self.polygon_points = [] 
@@ -11910,7 +11673,7 @@ class PointCloudViewer(ApplicationUI):
 
         # Render the VTK window
         if hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         # Clear all curve labels
         if hasattr(self, 'curve_labels'):
@@ -11936,7 +11699,7 @@ class PointCloudViewer(ApplicationUI):
         self.curve_start_point_3d = None
 
         # Re-render the vtk window
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
         # Clear reference actors using the fixed method
         self.clear_reference_actors()
@@ -11970,10 +11733,12 @@ class PointCloudViewer(ApplicationUI):
             if actor in self.measurement_actors:
                 self.measurement_actors.remove(actor)
         # Reset point cloud
+        self.cancel_point_cloud_loading()
         if self.point_cloud_actor:
             self.renderer.RemoveActor(self.point_cloud_actor)
             self.point_cloud_actor = None
             self.point_cloud = None
+            self.point_cloud_lod = None
 
         self.railway_menu_checkbox.setChecked(False)
         self.road_menu_checkbox.setChecked(False)
@@ -12063,11 +11828,7 @@ class PointCloudViewer(ApplicationUI):
             import numpy as np
             
             # Extract reference points
-            if isinstance(reference_data[0], dict):
-                ref_points = np.array([p['world_coordinates'] for p in reference_data 
-                                    if 'world_coordinates' in p])
-            else:
-                ref_points = np.array(reference_data)
+            ref_points = self.reference_points(reference_data)
         
             if len(ref_points) == 0:
                 return None
@@ -12249,7 +12010,7 @@ class PointCloudViewer(ApplicationUI):
             return None
 
     def load_reference_baseline_data(self, design_layer_path, reference_line_type):
-        """Load reference baseline data from JSON file"""
+        """Reference baseline of a design layer as a list of (N, 3) world coordinate arrays, one per polyline"""
         try:
             # Determine which file to load
             if reference_line_type == "Road Surface Line":
@@ -12274,26 +12035,21 @@ class PointCloudViewer(ApplicationUI):
                     print(f"Reference file not found: {json_path}")
                     return None
             
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extract points from the JSON structure
-            # Based on your construction_baseline.json structure
-            if 'polylines' in data and len(data['polylines']) > 0:
-                points = []
-                for polyline in data['polylines']:
-                    if 'points' in polyline:
-                        for point_data in polyline['points']:
-                            if 'world_coordinates' in point_data:
-                                # Convert to [x, y, z]
-                                points.append(point_data['world_coordinates'])
-                return points
+            baseline = read_baseline_columns(json_path)
+            data = baseline.metadata
+            
+            # One (N, 3) world coordinate array per polyline, so no consumer joins the end of
+            # one polyline to the start of the next
+            if len(baseline) > 0:
+                return baseline.world_polylines(min_points=1)
             elif 'points' in data:
                 # Direct points array
-                return data['points']
+                points = [p['world_coordinates'] if isinstance(p, dict) else p for p in data['points']
+                          if not isinstance(p, dict) or 'world_coordinates' in p]
+                return [np.asarray(points, dtype=np.float64).reshape(-1, 3)] if points else []
             elif 'world_coordinates' in data:
                 # Single point
-                return [data['world_coordinates']]
+                return [np.asarray([data['world_coordinates']], dtype=np.float64)]
             else:
                 print(f"Unknown JSON structure in {filename}")
                 return None
@@ -12302,6 +12058,21 @@ class PointCloudViewer(ApplicationUI):
             print(f"Error loading reference baseline: {e}")
             return None
 
+    def reference_polylines(self, reference_data):
+        """(N, 3) arrays, one per polyline, of load_reference_baseline_data's result or a flat point list"""
+        if reference_data is None or len(reference_data) == 0:
+            return []
+        if isinstance(reference_data[0], np.ndarray) and reference_data[0].ndim == 2:
+            return [np.asarray(polyline, dtype=np.float64).reshape(-1, 3) for polyline in reference_data]
+        if isinstance(reference_data[0], dict):
+            reference_data = [p['world_coordinates'] for p in reference_data if 'world_coordinates' in p]
+        return [np.asarray(reference_data, dtype=np.float64).reshape(-1, 3)] if len(reference_data) else []
+
+    def reference_points(self, reference_data):
+        """All reference points as one (N, 3) array, polylines back to back"""
+        polylines = self.reference_polylines(reference_data)
+        return np.concatenate(polylines) if polylines else np.empty((0, 3))
+
     def extract_reference_points_from_config(self, measurement_layer_name):
         """Extract reference points from saved measurement layer config"""
         try:
@@ -12337,58 +12108,93 @@ class PointCloudViewer(ApplicationUI):
             return None
     
     def points_inside_polygon(self, points, polygon_vertices):
-        """Check if points are inside polygon"""
-        import numpy as np
-        
-        # Simple ray casting algorithm
-        x = points[:, 0]
-        y = points[:, 1]
-        n = len(polygon_vertices)
-        inside = np.zeros(len(points), dtype=bool)
-        
-        for i in range(n):
-            j = (i + 1) % n
-            # Check if point is between y values of edge
-            cond = ((polygon_vertices[i, 1] > y) != (polygon_vertices[j, 1] > y)) & \
-                (x < (polygon_vertices[j, 0] - polygon_vertices[i, 0]) * (y - polygon_vertices[i, 1]) / 
-                    (polygon_vertices[j, 1] - polygon_vertices[i, 1]) + polygon_vertices[i, 0])
-            inside ^= cond
-        
-        return inside
+        """Check if points are inside polygon (tiled ray casting, see polygon_select)"""
+        return polygon_mask(points, polygon_vertices)
     
     def get_elevation_from_pointcloud(self, points_xy):
-        """Get elevation from point cloud at given XY coordinates"""
-        import numpy as np
-        from scipy.interpolate import griddata
-        
-        if hasattr(self, 'point_cloud') and self.point_cloud:
-            # Get point cloud data
-            cloud_points = np.asarray(self.point_cloud.points)
-            
-            if len(cloud_points) == 0:
-                return np.zeros(len(points_xy))
-            
-            # Use existing polygon points if point cloud is not available
-            cloud_xy = cloud_points[:, :2]
-            cloud_z = cloud_points[:, 2]
-            
-            # Interpolate using nearest neighbor
-            elevations = griddata(cloud_xy, cloud_z, points_xy, method='nearest', fill_value=np.nan)
-            
-            # Fill NaN values with minimum elevation
-            if np.any(np.isnan(elevations)):
-                min_elev = np.nanmin(elevations) if not np.all(np.isnan(elevations)) else 0
-                elevations[np.isnan(elevations)] = min_elev
-            
-            return elevations
-        
-        # Fallback: return average of polygon points
-        if hasattr(self, 'measurement_points'):
-            poly_points = np.array(self.measurement_points)
-            return np.full(len(points_xy), np.mean(poly_points[:, 2]))
-        
-        return np.zeros(len(points_xy))
-    
+        """
+        Elevation of the point cloud at given XY coordinates, from its DEM.
+        Callers go through request_elevation_raster first; without a DEM this raises ValueError.
+        """
+        raster = self.current_elevation_raster()
+        if raster is None:
+            raise ValueError("The elevation model of the point cloud is not available.")
+        # Bilinear lookup in the cached DEM instead of a griddata pass over the whole cloud
+        return raster.elevation(np.asarray(points_xy), surface='mean')
+
+    def current_elevation_raster(self):
+        """DEM of self.point_cloud if it has been built, otherwise None (never waits)"""
+        if self.point_cloud and self.elevation_raster is not None and self.elevation_raster_source is self.point_cloud:
+            return self.elevation_raster
+        return None
+
+    def request_elevation_raster(self, on_ready, on_abort):
+        """
+        Call on_ready(raster) with the DEM of self.point_cloud, at once if it exists, otherwise
+        when the background build finishes. If the build fails or the cloud is replaced or
+        reloaded first, on_abort(message) is called instead.
+        """
+        raster = self.current_elevation_raster()
+        if raster is not None:
+            on_ready(raster)
+            return
+        if not self.point_cloud:
+            on_abort("No point cloud is loaded.")
+            return
+        self.start_elevation_raster_build()
+        self.elevation_raster_requests.append((on_ready, on_abort))
+        self.message_text.append("Preparing elevation model...")
+
+    def abort_elevation_raster_requests(self, message):
+        requests, self.elevation_raster_requests = self.elevation_raster_requests, []
+        for _, on_abort in requests:
+            on_abort(message)
+
+    def start_elevation_raster_build(self):
+        """Start (or return the running) ElevationRasterBuilder for self.point_cloud"""
+        builder = self.elevation_raster_builder
+        if builder is not None:
+            if builder.source is self.point_cloud:
+                return builder
+            builder.cancel()
+            self.abort_elevation_raster_requests("The point cloud changed while its elevation model was being built.")
+
+        # Only the cloud read from loaded_file_path can be matched to a file on disk
+        cache_path = None
+        cache_dir = self.get_point_cloud_cache_dir()
+        if cache_dir and self.point_cloud is self.loaded_point_cloud and self.loaded_file_path \
+                and os.path.exists(self.loaded_file_path):
+            cache_path = dem_cache_path(cache_dir, cache_key(self.loaded_file_path), self.dem_cell_size)
+
+        builder = ElevationRasterBuilder(self.point_cloud, point_cloud_arrays(self.point_cloud)[0],
+                                         self.dem_cell_size, cache_path, self.loaded_file_path, parent=self)
+        builder.ready.connect(self.on_elevation_raster_ready)
+        builder.failed.connect(self.on_elevation_raster_failed)
+        builder.finished.connect(builder.deleteLater)
+        self.elevation_raster_builder = builder
+        builder.start()
+        return builder
+
+    def on_elevation_raster_ready(self, source, raster):
+        if self.sender() is not self.elevation_raster_builder:
+            return
+        self.elevation_raster_builder = None
+        if source is not self.point_cloud:
+            self.abort_elevation_raster_requests("The point cloud changed while its elevation model was being built.")
+            return
+        self.elevation_raster = raster
+        self.elevation_raster_source = source
+        requests, self.elevation_raster_requests = self.elevation_raster_requests, []
+        for on_ready, _ in requests:
+            on_ready(raster)
+
+    def on_elevation_raster_failed(self, source, error):
+        if self.sender() is not self.elevation_raster_builder:
+            return
+        self.elevation_raster_builder = None
+        self.message_text.append(f"Could not build elevation model: {error}")
+        self.abort_elevation_raster_requests(f"Could not build the elevation model: {error}")
+
     def process_cut_hill_volume(self):
         """Main function to calculate cut volume considering road width"""
         
@@ -12415,9 +12221,26 @@ class PointCloudViewer(ApplicationUI):
         # Get road width from reference configuration
         road_width = self.get_road_width_from_reference(self.current_measurement_layer)
         
+        # Terrain elevations come from the DEM, which may still be building in the background;
+        # the calculation continues in finish_cut_hill_volume once it is ready
+        polygon_points = list(self.measurement_points)
+        self.cut_hill_button.setEnabled(False)
+        self.request_elevation_raster(
+            lambda raster: self.finish_cut_hill_volume(polygon_points, reference_data, road_width),
+            self.abort_cut_hill_volume)
+
+    def abort_cut_hill_volume(self, message):
+        self.cut_hill_button.setEnabled(True)
+        QMessageBox.warning(self, "Calculation Cancelled",
+                        f"Could not calculate cut volume:\n{message}")
+
+    def finish_cut_hill_volume(self, polygon_points, reference_data, road_width):
+        """Second half of process_cut_hill_volume, run once the DEM of the point cloud exists"""
+        self.cut_hill_button.setEnabled(True)
+        
         # Calculate cut volume with width consideration
         volume_result = self.calculate_cut_volume_with_width(
-            self.measurement_points, 
+            polygon_points, 
             reference_data,
             road_width
         )
@@ -12432,7 +12255,7 @@ class PointCloudViewer(ApplicationUI):
         
         # Extract and visualize cropped area
         self.extract_and_visualize_excavation_with_width(
-            polygon_points=self.measurement_points,
+            polygon_points=polygon_points,
             reference_data=reference_data,
             volume_result=volume_result,
             road_width=road_width
@@ -12498,11 +12321,7 @@ class PointCloudViewer(ApplicationUI):
             # Convert inputs
             poly_array = np.array(polygon_points)
             
-            if isinstance(reference_data[0], dict):
-                ref_points = np.array([p['world_coordinates'] for p in reference_data 
-                                    if 'world_coordinates' in p])
-            else:
-                ref_points = np.array(reference_data)
+            ref_points = self.reference_points(reference_data)
             
             if len(ref_points) < 2:
                 QMessageBox.warning(self, "Insufficient Reference Data",
@@ -12773,7 +12592,7 @@ class PointCloudViewer(ApplicationUI):
             
             try:
                 # Convert point cloud to numpy array
-                all_points = np.asarray(self.point_cloud.points)
+                all_points = point_cloud_arrays(self.point_cloud)[0]
                 
                 if len(all_points) == 0:
                     return None
@@ -12781,23 +12600,12 @@ class PointCloudViewer(ApplicationUI):
                 # Convert polygon to numpy
                 poly_array = np.array(polygon_points)
                 
-                # Get polygon bounds
-                min_x, min_y = poly_array[:, 0].min(), poly_array[:, 1].min()
-                max_x, max_y = poly_array[:, 0].max(), poly_array[:, 1].max()
-                
-                # First filter by bounding box (fast)
-                bbox_mask = (all_points[:, 0] >= min_x) & (all_points[:, 0] <= max_x) & \
-                            (all_points[:, 1] >= min_y) & (all_points[:, 1] <= max_y)
+                # Bounding box, tile lookup and exact test only near the polygon edges
+                cropped_points = all_points[polygon_mask(all_points, poly_array[:, :2])]
                 
-                bbox_points = all_points[bbox_mask]
-                
-                if len(bbox_points) == 0:
+                if len(cropped_points) == 0:
                     return None
                 
-                # Then filter by exact polygon (slower but accurate)
-                inside_mask = self.points_inside_polygon(bbox_points[:, :2], poly_array[:, :2])
-                cropped_points = bbox_points[inside_mask]
-                
                 print(f"Cropped {len(cropped_points)} points from polygon area")
                 return cropped_points
                 
@@ -12812,11 +12620,7 @@ class PointCloudViewer(ApplicationUI):
             poly_array = np.array(polygon_points)
             
             # Convert reference points
-            if isinstance(reference_points[0], dict):
-                ref_array = np.array([p['world_coordinates'] for p in reference_points 
-                                    if 'world_coordinates' in p])
-            else:
-                ref_array = np.array(reference_points)
+            ref_array = self.reference_points(reference_points)
             
             # Find the reference line segment that runs through/under the polygon
             # For simplicity, use the reference points closest to polygon center
@@ -12891,13 +12695,9 @@ class PointCloudViewer(ApplicationUI):
             # Convert inputs
             poly_array = np.array(polygon_points)
             
-            if isinstance(reference_points[0], dict):
-                ref_array = np.array([p['world_coordinates'] for p in reference_points 
-                                    if 'world_coordinates' in p])
-            else:
-                ref_array = np.array(reference_points)
+            ref_polylines = self.reference_polylines(reference_points)
             
-            if len(ref_array) == 0:
+            if not ref_polylines:
                 return None
             
             # Get polygon bounds
@@ -12934,11 +12734,9 @@ class PointCloudViewer(ApplicationUI):
             # Calculate elevations
             terrain_elev = self.get_elevation_from_pointcloud(inside_points)
             
-            # Get reference elevations (nearest neighbor)
-            from scipy.spatial import distance
-            distances = distance.cdist(inside_points, ref_array[:, :2], 'euclidean')
-            nearest_idx = np.argmin(distances, axis=1)
-            ref_elev = ref_array[nearest_idx, 2]
+            # Reference elevations interpolated along the reference polylines (never across the
+            # gap between two of them)
+            ref_elev = AlignmentIndex.from_polylines(ref_polylines).elevation(inside_points)
             
             # Calculate cut volume
             cut_depth = terrain_elev - ref_elev
@@ -26,6 +26,8 @@ from datetime import datetime
 from math import sqrt, degrees
 
 from utils import find_best_fitting_plane
+from vtk_utils import create_curtain_polydata
+from baseline_store import BaselineColumns, read_baseline, read_baseline_columns, write_baseline, write_baseline_columns
 from application_ui import ApplicationUI
 from dialogs import (ConstructionConfigDialog, CurveDialog, ZeroLineDialog, MaterialLineDialog, MeasurementDialog,
                     DesignNewDialog, WorksheetNewDialog, HelpDialog, ConstructionNewDialog, CreateProjectDialog, ExistingWorksheetDialog,
@@ -1657,19 +1659,18 @@ class PointCloudViewer(ApplicationUI):
             # === RECREATE CURVE LABELS FROM SAVED ANGLES ===
             self.clear_curve_labels()
             recreated_curve_count = 0
-            for ltype, baseline_data in loaded_baselines.items():
-                for poly in baseline_data.get("polylines", []):
-                    for pt in poly.get("points", []):
-                        if "angle_deg" in pt:
-                            chainage = pt["chainage_m"]
-                            config_dict = {
-                                'angle': pt["angle_deg"],
-                                'inner_curve': pt.get("inner_curve", False),
-                                'outer_curve': pt.get("outer_curve", False)
-                            }
-                            self.curve_labels.append({'chainage': chainage, 'config': config_dict})
-                            self.add_curve_label_at_x(chainage, config_dict)
-                            recreated_curve_count += 1
+            for ltype, baseline in loaded_baselines.items():
+                for index in np.flatnonzero(baseline.present("angle_deg")):
+                    pt = baseline.point(index)
+                    chainage = pt["chainage_m"]
+                    config_dict = {
+                        'angle': pt["angle_deg"],
+                        'inner_curve': pt.get("inner_curve", False),
+                        'outer_curve': pt.get("outer_curve", False)
+                    }
+                    self.curve_labels.append({'chainage': chainage, 'config': config_dict})
+                    self.add_curve_label_at_x(chainage, config_dict)
+                    recreated_curve_count += 1
 
             if recreated_curve_count > 0:
                 self.message_text.append(f"Recreated {recreated_curve_count} curve label(s) → curved road ready!")
@@ -1701,15 +1702,10 @@ class PointCloudViewer(ApplicationUI):
 
                 if os.path.exists(baseline_path):
                     try:
-                        with open(baseline_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        ltype = data.get("baseline_key", "construction")
-                        color = data.get("color", "gray")
-                        polylines_2d = []
-                        for poly in data.get("polylines", []):
-                            poly_2d = [(pt["chainage_m"], pt["relative_elevation_m"]) for pt in poly.get("points", [])]
-                            if len(poly_2d) >= 2:
-                                polylines_2d.append(poly_2d)
+                        baseline = read_baseline_columns(baseline_path)
+                        ltype = baseline.metadata.get("baseline_key", "construction")
+                        color = baseline.metadata.get("color", "gray")
+                        polylines_2d = baseline.polylines_2d()
                         if ltype not in self.line_types:
                             self.line_types[ltype] = {'color': color, 'polylines': [], 'artists': []}
                         for artist in self.line_types[ltype]['artists']:
@@ -1784,13 +1780,13 @@ class PointCloudViewer(ApplicationUI):
             #self.clear_baseline_planes()
             planes_generated = 0
             width_summary = []
-            for ltype, baseline_data in loaded_baselines.items():
-                width_m = baseline_data.get("width_meters")
+            for ltype, baseline in loaded_baselines.items():
+                width_m = baseline.metadata.get("width_meters")
                 if width_m is None or width_m <= 0:
                     self.message_text.append(f"Warning: Invalid width in {ltype}_baseline.json. Skipping.")
                     continue
                 self.baseline_widths[ltype] = float(width_m)
-                self.map_baselines_to_3d_planes_from_data({ltype: baseline_data})
+                self.map_baselines_to_3d_planes_from_data({ltype: baseline})
                 planes_generated += 1
                 width_summary.append(f"{ltype.replace('_', ' ').title()}: {width_m:.2f} m")
                 self.message_text.append(f"Generated 3D plane for '{ltype}' → width {width_m:.2f} m")
@@ -2090,7 +2086,7 @@ class PointCloudViewer(ApplicationUI):
 
     def load_all_baselines_from_layer(self, layer_path):
         """Load all *_baseline.json files from the given layer folder.
-        Returns dict of loaded data.
+        Returns dict of BaselineColumns (columnar or legacy JSON files).
         Does NOT draw on 2D graph — only stores data for 3D planes.
         """
         loaded = {}
@@ -2118,20 +2114,13 @@ class PointCloudViewer(ApplicationUI):
                 continue
 
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                baseline = read_baseline_columns(filepath)
 
                 ltype = key_map[filename]
-                loaded[ltype] = data
+                loaded[ltype] = baseline
 
                 # Store polylines in memory (for 3D planes only)
-                polylines_2d = []
-                for poly in data.get("polylines", []):
-                    poly_2d = [(pt["chainage_m"], pt["relative_elevation_m"]) for pt in poly["points"]]
-                    if len(poly_2d) >= 2:
-                        polylines_2d.append(poly_2d)
-
-                self.line_types[ltype]['polylines'] = polylines_2d
+                self.line_types[ltype]['polylines'] = baseline.polylines_2d()
 
                 # IMPORTANT: Do NOT redraw on graph here!
 
@@ -2186,9 +2175,7 @@ class PointCloudViewer(ApplicationUI):
             json_path = os.path.join(layer_folder, json_filename)
             if os.path.exists(json_path):
                 try:
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    loaded_baselines[ltype] = data
+                    loaded_baselines[ltype] = read_baseline(json_path)
                 except Exception as e:
                     self.message_text.append(f"Error loading {ltype}: {str(e)}")
 
@@ -2235,8 +2222,7 @@ class PointCloudViewer(ApplicationUI):
             path = os.path.join(layer_folder, fname)
             if os.path.exists(path):
                 try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = read_baseline_columns(path)
                     if key == "surface":
                         surface_data = data
                     elif key == "construction":
@@ -2281,7 +2267,7 @@ class PointCloudViewer(ApplicationUI):
 
             width_m = self.baseline_widths[ltype]
 
-            baseline_data = {
+            metadata = {
                 "baseline_type": ltype.replace('_', ' ').title(),
                 "baseline_key": ltype,
                 "color": self.line_types[ltype]['color'],
@@ -2290,80 +2276,55 @@ class PointCloudViewer(ApplicationUI):
                 "zero_line_end": self.zero_end_point.tolist(),
                 "zero_start_elevation": float(ref_z),
                 "total_chainage_length": float(zero_length),
-                "polylines": []
             }
 
+            columns = []
             for poly_2d in polylines:
-                poly_3d_points = []
-                for dist, rel_z in poly_2d:
-                    t = dist / zero_length if zero_length > 0 else 0
-                    pos_along = self.zero_start_point + t * dir_vec
-                    abs_z = ref_z + rel_z
-
-                    world_point = [float(pos_along[0]), float(pos_along[1]), float(abs_z)]
-
-                    point_entry = {
-                        "chainage_m": float(dist),
-                        "chainage_str": self.format_chainage(dist, for_dialog=True),
-                        "relative_elevation_m": float(rel_z),
-                        "world_coordinates": world_point
-                    }
-
-                    # Height differences (reference only)
-                    if ltype == "construction" and surface_data:
-                        min_diff = float('inf')
-                        surface_rel = None
-                        for poly in surface_data.get("polylines", []):
-                            for pt in poly.get("points", []):
-                                d = abs(pt["chainage_m"] - dist)
-                                if d < min_diff:
-                                    min_diff = d
-                                    surface_rel = pt["relative_elevation_m"]
-                        if surface_rel is not None:
-                            diff = abs(round(surface_rel - rel_z, 3))
-                            point_entry["surface_to_construction_diff_m"] = diff
-
-                    elif ltype == "road_surface" and construction_data:
-                        min_diff = float('inf')
-                        const_rel = None
-                        for poly in construction_data.get("polylines", []):
-                            for pt in poly.get("points", []):
-                                d = abs(pt["chainage_m"] - dist)
-                                if d < min_diff:
-                                    min_diff = d
-                                    const_rel = pt["relative_elevation_m"]
-                        if const_rel is not None:
-                            diff = abs(round(const_rel - rel_z, 3))
-                            point_entry["construction_to_road_surface_diff_m"] = diff
-
-                    poly_3d_points.append(point_entry)
-
-                if len(poly_3d_points) >= 2:
-                    start_ch = poly_3d_points[0]["chainage_m"]
-                    end_ch = poly_3d_points[-1]["chainage_m"]
-                    baseline_data["polylines"].append({
-                        "start_chainage_m": float(start_ch),
-                        "start_chainage_str": self.format_chainage(start_ch, for_dialog=True),
-                        "end_chainage_m": float(end_ch),
-                        "end_chainage_str": self.format_chainage(end_ch, for_dialog=True),
-                        "points": poly_3d_points
-                    })
+                if len(poly_2d) < 2:
+                    continue
+                dist, rel_z = np.asarray(poly_2d, dtype=np.float64).T
+                t = dist / zero_length if zero_length > 0 else np.zeros_like(dist)
+                world = self.zero_start_point + t[:, None] * dir_vec
+                world[:, 2] = ref_z + rel_z
+
+                fields = {
+                    "chainage_m": dist,
+                    "chainage_str": np.array([self.format_chainage(d, for_dialog=True) for d in dist]),
+                    "relative_elevation_m": rel_z,
+                    "world_coordinates": world
+                }
 
-            if not baseline_data["polylines"]:
+                # Height differences (reference only) to the point nearest in chainage
+                if ltype == "construction" and surface_data is not None and surface_data.point_count:
+                    surface_rel, _ = surface_data.nearest(dist)
+                    fields["surface_to_construction_diff_m"] = np.abs(np.round(surface_rel - rel_z, 3))
+                elif ltype == "road_surface" and construction_data is not None and construction_data.point_count:
+                    const_rel, _ = construction_data.nearest(dist)
+                    fields["construction_to_road_surface_diff_m"] = np.abs(np.round(const_rel - rel_z, 3))
+
+                columns.append(({
+                    "start_chainage_m": float(dist[0]),
+                    "start_chainage_str": self.format_chainage(dist[0], for_dialog=True),
+                    "end_chainage_m": float(dist[-1]),
+                    "end_chainage_str": self.format_chainage(dist[-1], for_dialog=True),
+                }, fields))
+
+            if not columns:
                 continue
 
+            # Metadata in <ltype>_baseline.json, point columns in <ltype>_baseline.npz
             json_filename = f"{ltype}_baseline.json"
             json_path = os.path.join(layer_folder, json_filename)
 
             try:
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(baseline_data, f, indent=4, ensure_ascii=False)
+                baseline = BaselineColumns.from_polylines(metadata, columns)
+                write_baseline_columns(json_path, baseline)
                 saved_count += 1
                 saved_files.append(json_filename)
 
                 if ltype == "road_surface":
                     road_surface_just_saved = True
-                    road_surface_data = baseline_data  # update reference
+                    road_surface_data = baseline  # update reference
 
             except Exception as e:
                 QMessageBox.critical(self, "Save Failed", f"Error saving {json_filename}:\n{str(e)}")
@@ -2372,29 +2333,19 @@ class PointCloudViewer(ApplicationUI):
         # ────────────────────────────────────────────────────────────────
         #   After road surface save → add diff + realistic earthwork config
         # ────────────────────────────────────────────────────────────────
-        if road_surface_just_saved and surface_data and road_surface_data:
+        if road_surface_just_saved and surface_data is not None and road_surface_data is not None:
 
             # 1. Add surface_to_road_surface_diff_m to road surface points
-            for poly in road_surface_data["polylines"]:
-                for pt in poly["points"]:
-                    ch = pt["chainage_m"]
-                    min_d = float('inf')
-                    surf_rel = None
-                    for s_poly in surface_data.get("polylines", []):
-                        for s_pt in s_poly.get("points", []):
-                            d = abs(s_pt["chainage_m"] - ch)
-                            if d < min_d:
-                                min_d = d
-                                surf_rel = s_pt["relative_elevation_m"]
-                    if surf_rel is not None:
-                        abs_diff = abs(round(surf_rel - pt["relative_elevation_m"], 3))
-                        pt["surface_to_road_surface_diff_m"] = abs_diff
+            if surface_data.point_count:
+                surf_rel, _ = surface_data.nearest(road_surface_data.columns["chainage_m"])
+                road_surface_data.columns["surface_to_road_surface_diff_m"] = np.abs(
+                    np.round(surf_rel - road_surface_data.columns["relative_elevation_m"], 3))
+                road_surface_data.point_keys.append("surface_to_road_surface_diff_m")
 
             # Save updated road_surface
             rs_path = os.path.join(layer_folder, "road_surface_baseline.json")
             try:
-                with open(rs_path, 'w', encoding='utf-8') as f:
-                    json.dump(road_surface_data, f, indent=4, ensure_ascii=False)
+                write_baseline_columns(rs_path, road_surface_data)
                 self.message_text.append("Updated road_surface_baseline.json with surface diff")
             except Exception as e:
                 self.message_text.append(f"Warning: Could not update road surface json: {e}")
@@ -2403,9 +2354,10 @@ class PointCloudViewer(ApplicationUI):
 
             operations = []
 
-            if road_surface_data.get("polylines"):
-                main_poly = road_surface_data["polylines"][0]  # assuming single main alignment
-                points = main_poly["points"]
+            if len(road_surface_data):
+                # assuming single main alignment
+                chainages = road_surface_data.polyline(0, "chainage_m")
+                chainage_strs = road_surface_data.polyline(0, "chainage_str").tolist()
 
                 TOL_BALANCED = 0.20   # meters - adjust if needed
                 TOL_SURF_ROAD = 0.04  # old small tolerance - can keep or merge with above
@@ -2414,38 +2366,30 @@ class PointCloudViewer(ApplicationUI):
                 w_construction = self.baseline_widths.get("construction", 20.0)
                 w_road_surface = self.baseline_widths.get("road_surface", 12.0)
 
-                for i in range(len(points) - 1):
-                    p1 = points[i]
-                    p2 = points[i + 1]
+                def get_abs_elev(baseline, chainages, ref_z):
+                    """Absolute Z of the nearest point within 10 m chainage, None where there is none"""
+                    if baseline is None:
+                        return [None] * len(chainages)
+                    rel_elev, distance = baseline.nearest(chainages)
+                    return [ref_z + float(z) if d < 10.0 else None for z, d in zip(rel_elev, distance)]
 
-                    ch1 = p1["chainage_m"]
-                    ch2 = p2["chainage_m"]
-                    str1 = p1["chainage_str"]
-                    str2 = p2["chainage_str"]
+                surf_z   = get_abs_elev(surface_data,      chainages, ref_z)
+                road_z   = get_abs_elev(road_surface_data, chainages, ref_z)
+                const_z  = get_abs_elev(construction_data, chainages, ref_z)
+
+                for i in range(len(chainages) - 1):
+                    ch1 = float(chainages[i])
+                    ch2 = float(chainages[i + 1])
+                    str1 = chainage_strs[i]
+                    str2 = chainage_strs[i + 1]
 
                     length = ch2 - ch1
                     if length <= 0:
                         continue
 
-                    def get_abs_elev(baseline_data, chainage, ref_z):
-                        min_d = float('inf')
-                        rel_elev = None
-                        for poly in baseline_data.get("polylines", []):
-                            for pt in poly["points"]:
-                                d = abs(pt["chainage_m"] - chainage)
-                                if d < min_d:
-                                    min_d = d
-                                    rel_elev = pt["relative_elevation_m"]
-                        if rel_elev is not None and min_d < 10.0:
-                            return ref_z + rel_elev
-                        return None
-
-                    surf_z1   = get_abs_elev(surface_data,   ch1, ref_z)
-                    surf_z2   = get_abs_elev(surface_data,   ch2, ref_z)
-                    road_z1   = get_abs_elev(road_surface_data, ch1, ref_z)
-                    road_z2   = get_abs_elev(road_surface_data, ch2, ref_z)
-                    const_z1  = get_abs_elev(construction_data, ch1, ref_z) if construction_data else None
-                    const_z2  = get_abs_elev(construction_data, ch2, ref_z) if construction_data else None
+                    surf_z1, surf_z2 = surf_z[i], surf_z[i + 1]
+                    road_z1, road_z2 = road_z[i], road_z[i + 1]
+                    const_z1, const_z2 = const_z[i], const_z[i + 1]
 
                     segment = {
                         "from_chainage_str": str1,
@@ -2552,7 +2496,7 @@ class PointCloudViewer(ApplicationUI):
 
 # ===========================================================================================================================================================
     def map_baselines_to_3d_planes_from_data(self, loaded_baselines):
-        """Generate 3D planes from loaded baseline data — NOW WITH REAL CURVES using self.curve_labels"""
+        """Generate 3D planes from loaded BaselineColumns — NOW WITH REAL CURVES using self.curve_labels"""
         if not self.zero_line_set:
             self.message_text.append("Zero line not set - cannot generate 3D planes.")
             return
@@ -2575,8 +2519,8 @@ class PointCloudViewer(ApplicationUI):
                 'left_turn': cfg['inner_curve']  # inner = left turn
             }
 
-        for ltype, baseline_data in loaded_baselines.items():
-            width_m = baseline_data.get("width_meters")
+        for ltype, baseline in loaded_baselines.items():
+            width_m = baseline.metadata.get("width_meters")
             if width_m is None or width_m <= 0:
                 self.message_text.append(f"Invalid width for {ltype}. Skipping.")
                 continue
@@ -2590,128 +2534,84 @@ class PointCloudViewer(ApplicationUI):
             opacity = rgba[3]
 
             # Start from zero line start
-            current_pos = np.array(self.zero_start_point)
-            current_dir = (self.zero_end_point - self.zero_start_point)
-            dir_len = np.linalg.norm(current_dir)
+            start_pos = np.array(self.zero_start_point, dtype=float)
+            start_dir = np.asarray(self.zero_end_point - self.zero_start_point, dtype=float)
+            dir_len = np.linalg.norm(start_dir)
             if dir_len > 0:
-                current_dir /= dir_len
-
-            left_points = []
-            right_points = []
-
-            for poly in baseline_data.get("polylines", []):
-                points = poly.get("points", [])
-                if len(points) < 2:
-                    continue
-
-                # Dense sampling for smooth curve
-                for i in range(len(points) - 1):
-                    pt1 = points[i]
-                    pt2 = points[i + 1]
-
-                    ch1 = pt1["chainage_m"]
-                    ch2 = pt2["chainage_m"]
-                    
-                    # Use stored relative elevation (height above zero line) directly
-                    # Fallback to world coord calc only if missing (for legacy support)
-                    z1 = pt1.get("relative_elevation_m", pt1["world_coordinates"][2] - self.zero_start_z)
-                    z2 = pt2.get("relative_elevation_m", pt2["world_coordinates"][2] - self.zero_start_z)
-
-                    # Sample segment
-                    samples = max(10, int((ch2 - ch1) / 0.5) + 1)
-
-                    # Calculate scaling factor for angle (distribute rotation over the segment)
-                    step_angle = 0
-                    step_rotation_matrix = None
-                    
-                    if ch1 in curve_lookup:
-                        angle = curve_lookup[ch1]['angle']
-                        left_turn = curve_lookup[ch1]['left_turn']
-                        
-                        # Convert total angle to radians
-                        total_rad = np.deg2rad(angle)
-                        if not left_turn:
-                            total_rad = -total_rad
-                            
-                        # Calculate angle per sample step
-                        if samples > 1:
-                            step_rad = total_rad / (samples - 1)
-                            step_angle = step_rad
-                            
-                            # Pre-calculate rotation matrix for one step
-                            sin_val = np.sin(step_rad)
-                            cos_val = np.cos(step_rad)
-                            step_rotation_matrix = np.array([
-                                [cos_val, -sin_val, 0],
-                                [sin_val, cos_val, 0],
-                                [0, 0, 1]
-                            ])
-
-                    # Sample segment
-                    for s in range(samples):
-                        t = s / (samples - 1) if samples > 1 else 0
-                        ch = ch1 + t * (ch2 - ch1)
-                        rel_z = z1 + t * (z2 - z1)
-                        # Use current 3D position Z (which tracks slope) + relative elevation
-                        abs_z = current_pos[2] + rel_z
-
-                        # Advance position AND direction
-                        if s > 0:
-                            # 1. Rotate direction if we are in a curve
-                            if step_rotation_matrix is not None:
-                                current_dir = step_rotation_matrix @ current_dir
-                                # Normalize to prevent drift
-                                norm = np.linalg.norm(current_dir)
-                                if norm > 0:
-                                    current_dir /= norm
-
-                            # 2. Move forward
-                            step = (ch2 - ch1) / (samples - 1)
-                            current_pos += current_dir * step
-
-                        center = np.array([current_pos[0], current_pos[1], abs_z])
-
-                        # Perpendicular
-                        perp = np.array([-current_dir[1], current_dir[0], 0.0])
-                        if np.linalg.norm(perp) > 0:
-                            perp /= np.linalg.norm(perp)
-
-                        left = center + perp * half_width
-                        right = center - perp * half_width
+                start_dir = start_dir / dir_len
+            # Curves only rotate about Z, so the direction is a heading plus a fixed slope
+            heading0 = np.arctan2(start_dir[1], start_dir[0])
+            horizontal = np.hypot(start_dir[0], start_dir[1])
+
+            # Segments between consecutive points of the same polyline, in file order
+            same_polyline = np.ones(max(baseline.point_count - 1, 0), dtype=bool)
+            breaks = baseline.offsets[1:-1]
+            same_polyline[breaks[(breaks > 0) & (breaks < baseline.point_count)] - 1] = False
+            first = np.flatnonzero(same_polyline)
+            if not len(first):
+                continue
 
-                        left_points.append(left)
-                        right_points.append(right)
-
-            # Create smooth continuous surface
-            if len(left_points) >= 2:
-                points = vtk.vtkPoints()
-                cells = vtk.vtkCellArray()
-                for i in range(len(left_points)):
-                    points.InsertNextPoint(left_points[i])
-                    points.InsertNextPoint(right_points[i])
-                for i in range(len(left_points) - 1):
-                    quad = vtk.vtkQuad()
-                    quad.GetPointIds().SetId(0, 2*i)
-                    quad.GetPointIds().SetId(1, 2*i + 1)
-                    quad.GetPointIds().SetId(2, 2*(i+1) + 1)
-                    quad.GetPointIds().SetId(3, 2*(i+1))
-                    cells.InsertNextCell(quad)
+            # Use stored relative elevation (height above zero line) directly
+            # Fallback to world coord calc only if missing (for legacy support)
+            has_rel = baseline.present("relative_elevation_m")
+            all_rel_z = np.zeros(baseline.point_count)
+            if has_rel.any():
+                all_rel_z[has_rel] = baseline.columns["relative_elevation_m"][has_rel]
+            if not has_rel.all():
+                all_rel_z[~has_rel] = baseline.columns["world_coordinates"][~has_rel, 2] - self.zero_start_z
+
+            chainages = baseline.columns["chainage_m"].astype(float)
+            ch1, ch2 = chainages[first], chainages[first + 1]
+            z1, z2 = all_rel_z[first], all_rel_z[first + 1]
+
+            # Dense sampling for smooth curve: at least 10 samples, one every 0.5 m
+            samples = np.maximum(((ch2 - ch1) / 0.5).astype(int) + 1, 10)
+            step_len = (ch2 - ch1) / (samples - 1)
+            # Curve angle is distributed over the segment that starts at the curve label
+            step_rad = np.zeros(len(first))
+            for k, ch in enumerate(ch1.tolist()):
+                if ch in curve_lookup:
+                    total_rad = np.deg2rad(curve_lookup[ch]['angle'])
+                    if not curve_lookup[ch]['left_turn']:
+                        total_rad = -total_rad
+                    step_rad[k] = total_rad / (samples[k] - 1)
+
+            segment = np.repeat(np.arange(len(first)), samples)
+            s_index = np.arange(len(segment)) - np.repeat(np.cumsum(samples) - samples, samples)
+            t = s_index / (samples[segment] - 1)
+            rel_z = z1[segment] + t * (z2[segment] - z1[segment])
+
+            # Every sample after the first of a segment rotates the direction, then moves forward
+            moving = s_index > 0
+            heading = heading0 + np.cumsum(np.where(moving, step_rad[segment], 0.0))
+            direction = np.column_stack((horizontal * np.cos(heading), horizontal * np.sin(heading),
+                                         np.full(len(heading), start_dir[2])))
+            moves = direction * np.where(moving, step_len[segment], 0.0)[:, None]
+            positions = start_pos + np.cumsum(moves, axis=0)
+
+            # Z is the position before the move (zero line Z tracking the slope) + relative elevation
+            center = positions.copy()
+            center[:, 2] = np.concatenate(([start_pos[2]], positions[:-1, 2])) + rel_z
+
+            if horizontal > 0:
+                perp = np.column_stack((-np.sin(heading), np.cos(heading), np.zeros(len(heading))))
+            else:
+                perp = np.zeros((len(heading), 3))
 
-                polydata = vtk.vtkPolyData()
-                polydata.SetPoints(points)
-                polydata.SetPolys(cells)
+            # Create smooth continuous surface (one strip through all polylines of the type)
+            polydata = create_curtain_polydata(center + perp * half_width, center - perp * half_width)
 
-                mapper = vtk.vtkPolyDataMapper()
-                mapper.SetInputData(polydata)
+            mapper = vtk.vtkPolyDataMapper()
+            mapper.SetInputData(polydata)
 
-                actor = vtk.vtkActor()
-                actor.SetMapper(mapper)
-                actor.GetProperty().SetColor(*color_rgb)
-                actor.GetProperty().SetOpacity(opacity)
+            actor = vtk.vtkActor()
+            actor.SetMapper(mapper)
+            actor.GetProperty().SetColor(*color_rgb)
+            actor.GetProperty().SetOpacity(opacity)
 
-                self.renderer.AddActor(actor)
-                self.baseline_plane_actors.append(actor)
-                planes_generated += 1
+            self.renderer.AddActor(actor)
+            self.baseline_plane_actors.append(actor)
+            planes_generated += 1
 
         # Render
         rw = (self.vtk_widget if hasattr(self, 'vtk_widget') else self.vtkWidget).GetRenderWindow()
@@ -2794,10 +2694,9 @@ class PointCloudViewer(ApplicationUI):
                 }
                 baseline_data["curves"].append(curve_entry)
 
-        # Save to file
+        # Save to file (metadata sidecar + .npz point columns)
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(baseline_data, f, indent=4)
+            write_baseline(json_path, baseline_data)
             return True
         except Exception as e:
             self.message_text.append(f"Failed to save {os.path.basename(json_path)}: {str(e)}")
@@ -2815,8 +2714,7 @@ class PointCloudViewer(ApplicationUI):
             return False
 
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_baseline(json_path)
         except Exception as e:
             self.message_text.append(f"Error reading {os.path.basename(json_path)}: {str(e)}")
             return False
@@ -7550,14 +7448,11 @@ class PointCloudViewer(ApplicationUI):
             #   Prepare polyline_points WITH absolute coordinates
             # ===================================================
             polyline_points = []
-            for p in self.material_drawing_points:
+            centers = self.interpolate_xyz_batch([round(p[0], 3) for p in self.material_drawing_points])
+            for p, (X, Y, Z_center) in zip(self.material_drawing_points, centers):
                 chainage = round(p[0], 3)
                 rel_elev = round(p[1], 3)
 
-                X, Y, Z_center = self.get_real_coordinates_from_chainage(chainage)
-                if X is None or Y is None or Z_center is None:
-                    X, Y, Z_center = self.interpolate_xyz(chainage)
-
                 abs_z = Z_center + rel_elev
 
                 polyline_points.append({
@@ -7823,6 +7718,10 @@ class PointCloudViewer(ApplicationUI):
             else:
                 self.message_text.append(f"Reference baseline loaded successfully with {len(ref_xs)} points")
 
+            # Alignment positions of all drawn points in one batch
+            point_centers = self.interpolate_xyz_batch([round(x, 3) for x, _ in self.material_drawing_points])
+            vertex_centers = self.interpolate_xyz_batch([x for x, _ in self.material_drawing_points])
+
             # Build segments with REAL thickness calculation
             segments = []
             for i in range(num_points - 1):
@@ -7830,8 +7729,8 @@ class PointCloudViewer(ApplicationUI):
                 seg_to_m = self.material_drawing_points[i + 1][0]
                 seg_num = i + 1
 
-                from_X, from_Y, from_Z = self.interpolate_xyz(seg_from_m)
-                to_X, to_Y, to_Z = self.interpolate_xyz(seg_to_m)
+                from_X, from_Y, from_Z = vertex_centers[i]
+                to_X, to_Y, to_Z = vertex_centers[i + 1]
 
                 seg_poly_points = []
                 for j in range(num_points):
@@ -7856,9 +7755,7 @@ class PointCloudViewer(ApplicationUI):
                         thickness_positive = max(0.0, real_thickness)  # Changed to prefer positive fill
 
                         # Get absolute coordinates
-                        X, Y, Z_center = self.get_real_coordinates_from_chainage(chainage)
-                        if X is None or Y is None or Z_center is None:
-                            X, Y, Z_center = self.interpolate_xyz(chainage)
+                        X, Y, Z_center = point_centers[j]
                         abs_z = Z_center + material_rel
 
                         seg_poly_points.append({
@@ -8238,6 +8135,29 @@ class PointCloudViewer(ApplicationUI):
         t = np.clip(chainage_m / total_len, 0.0, 1.0)
         point_3d = start_pt + t * (end_pt - start_pt)
         return round(float(point_3d[0]), 3), round(float(point_3d[1]), 3), round(float(point_3d[2]), 3)
+
+    def interpolate_xyz_batch(self, chainages):
+        """
+        Vectorized interpolate_xyz: (N, 3) array of X, Y, Z for an array of chainages,
+        with the same zero line fallback and 3 decimal rounding.
+        """
+        chainages = np.asarray(chainages, dtype=float)
+        if getattr(self, 'horizontal_alignment', None) and getattr(self, 'vertical_profile', None):
+            return np.array([self.interpolate_xyz(ch) for ch in chainages], dtype=float).reshape(-1, 3)
+
+        if (not self.zero_line_set or
+            not hasattr(self, 'zero_start_point') or
+            not hasattr(self, 'zero_end_point') or
+            not hasattr(self, 'total_distance') or
+            self.total_distance <= 0):
+            return np.zeros((len(chainages), 3))
+
+        start_pt = np.array(self.zero_start_point)
+        end_pt = np.array(self.zero_end_point)
+        t = np.clip(chainages / float(self.total_distance), 0.0, 1.0)
+        points = start_pt + t[:, None] * (end_pt - start_pt)
+        # Python round() per value so the result matches interpolate_xyz to the last digit
+        return np.array([round(value, 3) for value in points.ravel().tolist()]).reshape(-1, 3)
     
 # =================================================================================================================================================================
     def save_material_segment_to_json(self, material_idx, config, from_m, to_m, point_number=None, polyline_points=None, segments_list=None):
@@ -8645,8 +8565,7 @@ class PointCloudViewer(ApplicationUI):
             return None, None
 
         try:
-            with open(baseline_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_baseline(baseline_path)
 
             # Extract points – supports both new and old baseline formats
             all_points = []
@@ -8814,52 +8733,16 @@ class PointCloudViewer(ApplicationUI):
         end = np.array(self.end_point)
         dir_vec = (end - start) / self.total_distance
         dir_xy_norm = dir_vec[0:2] / np.linalg.norm(dir_vec[0:2])
-        perp_xy = np.array([-dir_xy_norm[1], dir_xy_norm[0]])
-        perp = np.array([perp_xy[0], perp_xy[1], 0.0])
-
-        num_points = len(xs)
-        left_points = []
-        right_points = []
-
-        for i in range(num_points):
-            chainage = xs[i]
-            t = chainage / self.total_distance
-            center_base = start + t * (end - start)
-            abs_z = center_base[2] + ys[i]  # Absolute Z = zero line Z + relative elevation
-            center = np.array([center_base[0], center_base[1], abs_z])
-            left = center + perp * (width / 2)
-            right = center - perp * (width / 2)
-            left_points.append(left)
-            right_points.append(right)
+        perp = np.array([-dir_xy_norm[1], dir_xy_norm[0], 0.0])
 
-        # Create VTK points
-        vtk_points = vtk.vtkPoints()
-        point_id = 0
-        left_ids = []
-        right_ids = []
-        for pt in left_points:
-            vtk_points.InsertNextPoint(pt)
-            left_ids.append(point_id)
-            point_id += 1
-        for pt in right_points:
-            vtk_points.InsertNextPoint(pt)
-            right_ids.append(point_id)
-            point_id += 1
-
-        # Create quad strips
-        polys = vtk.vtkCellArray()
-        for i in range(num_points - 1):
-            quad = vtk.vtkQuad()
-            quad.GetPointIds().SetId(0, left_ids[i])
-            quad.GetPointIds().SetId(1, left_ids[i+1])
-            quad.GetPointIds().SetId(2, right_ids[i+1])
-            quad.GetPointIds().SetId(3, right_ids[i])
-            polys.InsertNextCell(quad)
+        t = np.asarray(xs, dtype=float) / self.total_distance
+        center = start + t[:, None] * (end - start)
+        center[:, 2] += np.asarray(ys, dtype=float)  # Absolute Z = zero line Z + relative elevation
+        left_points = center + perp * (width / 2)
+        right_points = center - perp * (width / 2)
 
-        # PolyData
-        polydata = vtk.vtkPolyData()
-        polydata.SetPoints(vtk_points)
-        polydata.SetPolys(polys)
+        # Quad strip between the edges (right/left order keeps the original winding)
+        polydata = create_curtain_polydata(right_points, left_points)
 
         # Mapper and Actor
         mapper = vtk.vtkPolyDataMapper()
@@ -8928,8 +8811,7 @@ class PointCloudViewer(ApplicationUI):
             self.message_text.append(f"Baseline file missing: {baseline_path}")
             return [], []
         try:
-            with open(baseline_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_baseline(baseline_path)
             # Extract points – supports both new and old baseline formats
             all_points = []
             if "polylines" in data and data["polylines"]:
@@ -9167,8 +9049,7 @@ class PointCloudViewer(ApplicationUI):
             return False
 
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_baseline(json_path)
         except Exception as e:
             self.message_text.append(f"Error reading {os.path.basename(json_path)}: {str(e)}")
             return False
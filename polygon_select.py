@@ -0,0 +1,123 @@
+# polygon_select.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+TILE_OUTSIDE = 0
+TILE_INSIDE = 1
+TILE_BOUNDARY = 2
+
+
+def points_in_polygon(xy, polygon):
+    """Exact even-odd (ray casting) test of (N, 2) positions against a closed XY polygon"""
+    x = xy[:, 0]
+    y = xy[:, 1]
+    inside = np.zeros(len(xy), dtype=bool)
+    for (x1, y1), (x2, y2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        if y1 == y2:
+            continue
+        crosses = (y1 > y) != (y2 > y)
+        crosses &= x < (x2 - x1) * (y - y1) / (y2 - y1) + x1
+        inside ^= crosses
+    return inside
+
+
+class PolygonTiles:
+    """
+    Grid of tiles over the polygon bounding box, each classified as outside, inside or
+    boundary (crossed by a polygon edge). Points in inside/outside tiles are decided by a
+    table lookup; only points in boundary tiles need the exact polygon test.
+    """
+
+    def __init__(self, polygon, resolution=128):
+        self.polygon = np.asarray(polygon, dtype=np.float64)[:, :2]
+        self.mins = self.polygon.min(axis=0)
+        self.maxs = self.polygon.max(axis=0)
+        extent = np.maximum(self.maxs - self.mins, 1e-9)
+        self.tile_size = float(extent.max()) / resolution
+        self.shape = tuple(int(n) for n in np.maximum(np.ceil(extent / self.tile_size), 1).astype(np.int64))
+
+        nx, ny = self.shape
+        states = np.zeros((nx, ny), dtype=np.uint8)
+        boundary = self._boundary_tiles()
+        centers_x = self.mins[0] + (np.arange(nx) + 0.5) * self.tile_size
+        centers_y = self.mins[1] + (np.arange(ny) + 0.5) * self.tile_size
+        grid_x, grid_y = np.meshgrid(centers_x, centers_y, indexing='ij')
+        centers = np.column_stack((grid_x.ravel(), grid_y.ravel()))
+        # A tile no edge crosses lies entirely on one side, so its center decides it
+        states.ravel()[points_in_polygon(centers, self.polygon)] = TILE_INSIDE
+        states[boundary] = TILE_BOUNDARY
+        self.states = states
+
+    def _boundary_tiles(self):
+        """Tiles touched by any polygon edge (segment/box test on the tiles of the edge bbox)"""
+        nx, ny = self.shape
+        boundary = np.zeros((nx, ny), dtype=bool)
+        size = self.tile_size
+        for p, q in zip(self.polygon, np.roll(self.polygon, -1, axis=0)):
+            lo = np.floor((np.minimum(p, q) - self.mins) / size).astype(np.int64)
+            hi = np.floor((np.maximum(p, q) - self.mins) / size).astype(np.int64)
+            lo = np.clip(lo, 0, [nx - 1, ny - 1])
+            hi = np.clip(hi, 0, [nx - 1, ny - 1])
+            ix, iy = np.meshgrid(np.arange(lo[0], hi[0] + 1), np.arange(lo[1], hi[1] + 1), indexing='ij')
+            ix, iy = ix.ravel(), iy.ravel()
+            # The edge crosses a tile of its bbox unless all four corners lie on one side of it
+            corner_x = self.mins[0] + (ix[:, None] + np.array([0, 1, 0, 1])) * size
+            corner_y = self.mins[1] + (iy[:, None] + np.array([0, 0, 1, 1])) * size
+            side = (q[0] - p[0]) * (corner_y - p[1]) - (q[1] - p[1]) * (corner_x - p[0])
+            crossed = (side.min(axis=1) <= 0) & (side.max(axis=1) >= 0)
+            boundary[ix[crossed], iy[crossed]] = True
+        return boundary
+
+    def classify(self, xy):
+        """Boolean inside mask for (N, 2) positions"""
+        mask = np.zeros(len(xy), dtype=bool)
+        in_bbox = np.nonzero((xy[:, 0] >= self.mins[0]) & (xy[:, 0] <= self.maxs[0]) &
+                             (xy[:, 1] >= self.mins[1]) & (xy[:, 1] <= self.maxs[1]))[0]
+        if len(in_bbox) == 0:
+            return mask
+        candidates = xy[in_bbox]
+        tile = np.floor((candidates - self.mins) / self.tile_size).astype(np.int64)
+        tile[:, 0] = np.clip(tile[:, 0], 0, self.shape[0] - 1)
+        tile[:, 1] = np.clip(tile[:, 1], 0, self.shape[1] - 1)
+        states = self.states[tile[:, 0], tile[:, 1]]
+
+        mask[in_bbox[states == TILE_INSIDE]] = True
+        boundary = np.nonzero(states == TILE_BOUNDARY)[0]
+        if len(boundary):
+            exact = points_in_polygon(candidates[boundary], self.polygon)
+            mask[in_bbox[boundary[exact]]] = True
+        return mask
+
+
+def polygon_mask(points, polygon, resolution=128, chunk_size=1_000_000, max_workers=None):
+    """
+    Boolean mask of the points whose XY position lies inside the polygon.
+
+    points may be any (N, >=2) array, including a memory map; it is processed in chunks of
+    chunk_size across a thread pool and never copied as a whole.
+    """
+    points = np.asarray(points)
+    mask = np.zeros(len(points), dtype=bool)
+    if len(points) == 0 or len(polygon) < 3:
+        return mask
+    tiles = PolygonTiles(polygon, resolution)
+
+    def run_chunk(start):
+        xy = np.asarray(points[start:start + chunk_size, :2], dtype=np.float64)
+        mask[start:start + len(xy)] = tiles.classify(xy)
+
+    starts = range(0, len(points), chunk_size)
+    if len(starts) == 1:
+        run_chunk(0)
+        return mask
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(run_chunk, starts))
+    return mask
+
+
+def polygon_indices(points, polygon, **kwargs):
+    """Indices of the points inside the polygon (see polygon_mask)"""
+    return np.flatnonzero(polygon_mask(points, polygon, **kwargs))
@@ -0,0 +1,42 @@
+# render_scheduler.py
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+
+class RenderScheduler(QObject):
+    """
+    Coalesces render requests for a VTK render window.
+
+    request() only marks the scene dirty; a single-shot timer then renders once, at most
+    every interval_ms, however many requests arrived in between. render_now() renders
+    synchronously for callers that need the frame immediately (screenshots, pixel reads).
+    """
+
+    def __init__(self, render_window, interval_ms=16, parent=None):
+        super().__init__(parent)
+        self.render_window = render_window
+        self.interval_ms = interval_ms
+        self.dirty = False
+        self.last_render = 0.0
+        self.render_count = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_timeout)
+
+    def request(self):
+        self.dirty = True
+        if not self.timer.isActive():
+            elapsed_ms = (time.perf_counter() - self.last_render) * 1000.0
+            self.timer.start(int(max(0.0, self.interval_ms - elapsed_ms)))
+
+    def on_timeout(self):
+        if self.dirty:
+            self.render_now()
+
+    def render_now(self):
+        self.timer.stop()
+        self.dirty = False
+        self.render_window.Render()
+        self.last_render = time.perf_counter()
+        self.render_count += 1
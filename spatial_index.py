@@ -0,0 +1,114 @@
+# spatial_index.py
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def world_to_display(renderer, points):
+    """Vectorized renderer.WorldToDisplay: returns (N, 2) pixel coordinates and (N,) depths in [-1, 1]"""
+    camera = renderer.GetActiveCamera()
+    matrix = camera.GetCompositeProjectionTransformMatrix(renderer.GetTiledAspectRatio(), -1, 1)
+    m = np.array([[matrix.GetElement(i, j) for j in range(4)] for i in range(4)])
+    homogeneous = np.asarray(points, dtype=np.float64) @ m[:3, :3].T + m[:3, 3]
+    w = np.asarray(points, dtype=np.float64) @ m[3, :3] + m[3, 3]
+    w = np.where(np.abs(w) < 1e-12, 1e-12, w)
+    ndc = homogeneous / w[:, None]
+
+    width, height = renderer.GetRenderWindow().GetSize() if renderer.GetRenderWindow() else renderer.GetSize()
+    vx0, vy0, vx1, vy1 = renderer.GetViewport()
+    display = np.empty((len(ndc), 2))
+    display[:, 0] = (ndc[:, 0] + 1.0) * 0.5 * (vx1 - vx0) * width + vx0 * width
+    display[:, 1] = (ndc[:, 1] + 1.0) * 0.5 * (vy1 - vy0) * height + vy0 * height
+    return display, ndc[:, 2]
+
+
+def display_to_world(renderer, x, y, z):
+    renderer.SetDisplayPoint(x, y, z)
+    renderer.DisplayToWorld()
+    world = renderer.GetWorldPoint()
+    return np.array(world[:3]) / (world[3] if world[3] else 1.0)
+
+
+class PointCloudSpatialIndex:
+    """
+    KD-tree over the point cloud, built once after loading and shared by all snapping code.
+
+    nearest() snaps a world position to the closest cloud point; pick() finds the cloud point
+    under a screen position by projecting only the points near the pick ray.
+    """
+
+    def __init__(self, points, leafsize=32):
+        self.points = points
+        self.tree = cKDTree(np.asarray(points, dtype=np.float64), leafsize=leafsize,
+                            balanced_tree=False, compact_nodes=False)
+        self.mins = np.asarray(self.tree.mins)
+        self.maxes = np.asarray(self.tree.maxes)
+
+    def __len__(self):
+        return self.tree.n
+
+    def nearest(self, point):
+        """Return (index, point) of the cloud point closest to the given world position"""
+        _, index = self.tree.query(np.asarray(point, dtype=np.float64))
+        return int(index), np.asarray(self.points[index], dtype=np.float64)
+
+    def _clip_ray(self, origin, direction):
+        """Parametric [t0, t1] of the ray inside the cloud bounding box, or None when it misses"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv = 1.0 / direction
+            t_a = (self.mins - origin) * inv
+            t_b = (self.maxes - origin) * inv
+        t_a = np.nan_to_num(t_a, nan=-np.inf, posinf=np.inf, neginf=-np.inf)
+        t_b = np.nan_to_num(t_b, nan=np.inf, posinf=np.inf, neginf=-np.inf)
+        t0 = np.max(np.minimum(t_a, t_b))
+        t1 = np.min(np.maximum(t_a, t_b))
+        if t1 < max(t0, 0.0):
+            return None
+        return max(t0, 0.0), t1
+
+    def pick(self, renderer, display_x, display_y, radius_px=4, max_samples=4000):
+        """
+        Return the cloud point closest (on screen) to the display position within radius_px,
+        preferring the point nearest the camera on ties, or None.
+        """
+        near = display_to_world(renderer, display_x, display_y, 0.0)
+        far = display_to_world(renderer, display_x, display_y, 1.0)
+        direction = far - near
+        length = np.linalg.norm(direction)
+        if length == 0:
+            return None
+        direction /= length
+        span = self._clip_ray(near, direction)
+        if span is None:
+            return None
+        t0, t1 = span
+
+        # World size of radius_px at each end of the clipped ray
+        offset_near = display_to_world(renderer, display_x + radius_px, display_y, 0.0)
+        pixel_scale_near = np.linalg.norm(offset_near - near)
+        offset_far = display_to_world(renderer, display_x + radius_px, display_y, 1.0)
+        pixel_scale_far = np.linalg.norm(offset_far - far)
+
+        def radius_at(t):
+            # Linear between near and far plane (exact for perspective, constant for parallel)
+            return pixel_scale_near + (pixel_scale_far - pixel_scale_near) * (t / length)
+
+        # Sample the ray so consecutive query spheres overlap
+        samples = [t0]
+        while samples[-1] < t1 and len(samples) < max_samples:
+            samples.append(samples[-1] + max(radius_at(samples[-1]), (t1 - t0) / max_samples))
+        samples = np.array(samples)
+        centers = near + samples[:, None] * direction
+        radii = radius_at(samples) * 1.5
+        candidate_lists = self.tree.query_ball_point(centers, radii)
+        candidates = np.unique(np.concatenate([np.asarray(c, dtype=np.int64) for c in candidate_lists]))
+        if len(candidates) == 0:
+            return None
+
+        candidate_points = np.asarray(self.points[candidates], dtype=np.float64)
+        display, depth = world_to_display(renderer, candidate_points)
+        distances = np.hypot(display[:, 0] - display_x, display[:, 1] - display_y)
+        inside = np.where(distances <= radius_px)[0]
+        if len(inside) == 0:
+            return None
+        best = inside[np.lexsort((depth[inside], np.round(distances[inside], 1)))[0]]
+        return candidate_points[best]
@@ -6,4 +6,13 @@ def find_best_fitting_plane(points):
     centered = points - centroid
     _, _, vh = np.linalg.svd(centered)
     normal = vh[2]  # The third row is the normal to the best-fit plane
-    return centroid, normal
\ No newline at end of file
+    return centroid, normal
+
+def tetrahedra_volume(points, simplices):
+    """Total volume of the tetrahedra given by (M, 4) vertex indices, computed in one batch"""
+    tetrahedra = np.asarray(points, dtype=np.float64)[simplices]
+    a = tetrahedra[:, 1] - tetrahedra[:, 0]
+    b = tetrahedra[:, 2] - tetrahedra[:, 0]
+    c = tetrahedra[:, 3] - tetrahedra[:, 0]
+    # Scalar triple product a . (b x c) is the determinant of [a; b; c]
+    return float(np.abs(np.einsum('ij,ij->i', a, np.cross(b, c))).sum() / 6.0)
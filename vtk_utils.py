@@ -0,0 +1,157 @@
+# vtk_utils.py
+import numpy as np
+import vtk
+from vtk.util.numpy_support import numpy_to_vtk, vtk_to_numpy, numpy_to_vtkIdTypeArray, get_vtk_to_numpy_typemap
+
+from point_cache import point_cloud_arrays
+
+
+def numpy_to_vtk_points(points):
+    """Wrap an (N, 3) float array as vtkPoints without copying when the buffer is contiguous"""
+    points = np.asarray(points)
+    if points.dtype not in (np.float32, np.float64):
+        points = points.astype(np.float64)
+    points = np.ascontiguousarray(points)
+    vtk_points = vtk.vtkPoints()
+    # numpy_to_vtk keeps a reference to the numpy buffer on the vtk array, so it stays alive
+    vtk_points.SetData(numpy_to_vtk(points, deep=False))
+    return vtk_points
+
+
+def polydata_points_to_numpy(polydata):
+    """Copy the points of a vtkPolyData into an (N, 3) float64 array in one call"""
+    if polydata.GetPoints() is None:
+        return np.empty((0, 3))
+    return np.array(vtk_to_numpy(polydata.GetPoints().GetData()), dtype=np.float64)
+
+
+def create_vertex_cells(num_points):
+    """Build a vtkCellArray with one vertex cell per point using offsets/connectivity arrays"""
+    id_dtype = get_vtk_to_numpy_typemap()[vtk.VTK_ID_TYPE]
+    offsets = np.arange(num_points + 1, dtype=id_dtype)
+    connectivity = offsets[:-1]
+    cells = vtk.vtkCellArray()
+    cells.SetData(numpy_to_vtkIdTypeArray(offsets, deep=False),
+                  numpy_to_vtkIdTypeArray(connectivity, deep=False))
+    return cells
+
+
+def create_quad_strip_cells(num_pairs):
+    """
+    Quads between consecutive pairs of an interleaved point list (top 0, bottom 0, top 1, ...),
+    ordered top i, bottom i, bottom i+1, top i+1.
+    """
+    id_dtype = get_vtk_to_numpy_typemap()[vtk.VTK_ID_TYPE]
+    num_quads = max(num_pairs - 1, 0)
+    first = 2 * np.arange(num_quads, dtype=id_dtype)
+    connectivity = np.column_stack((first, first + 1, first + 3, first + 2)).ravel()
+    offsets = np.arange(0, 4 * num_quads + 1, 4, dtype=id_dtype)
+    cells = vtk.vtkCellArray()
+    cells.SetData(numpy_to_vtkIdTypeArray(offsets, deep=False),
+                  numpy_to_vtkIdTypeArray(connectivity, deep=False))
+    return cells
+
+
+def create_curtain_polydata(upper, lower):
+    """Polydata of the quad strip (curtain) joining two (N, 3) polylines sampled pairwise"""
+    upper = np.asarray(upper, dtype=np.float64)
+    lower = np.asarray(lower, dtype=np.float64)
+    points = np.empty((2 * len(upper), 3))
+    points[0::2] = upper
+    points[1::2] = lower
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(numpy_to_vtk_points(points))
+    polydata.SetPolys(create_quad_strip_cells(len(upper)))
+    return polydata
+
+
+def numpy_to_vtk_colors(colors, name="Colors"):
+    """Convert Open3D style 0-1 float colors (or 0-255 uint8 colors) to a vtkUnsignedCharArray"""
+    colors = np.asarray(colors)
+    if colors.dtype != np.uint8:
+        colors = (np.clip(colors, 0.0, 1.0) * 255).astype(np.uint8)
+    vtk_colors = numpy_to_vtk(np.ascontiguousarray(colors), deep=False, array_type=vtk.VTK_UNSIGNED_CHAR)
+    vtk_colors.SetName(name)
+    return vtk_colors
+
+
+def create_point_cloud_polydata(points, colors=None):
+    """Create vertex polydata for a point cloud from numpy points (and optional colors) in bulk"""
+    points = np.asarray(points)
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(numpy_to_vtk_points(points))
+    polydata.SetVerts(create_vertex_cells(len(points)))
+    if colors is not None and len(colors) == len(points):
+        polydata.GetPointData().SetScalars(numpy_to_vtk_colors(colors))
+    return polydata
+
+
+def o3d_to_vtk_polydata(point_cloud):
+    """
+    Create vertex polydata sharing the point buffer of an Open3D PointCloud or a CachedPointCloud
+    (float colors are converted to uint8, cached uint8 colors are shared)
+    """
+    return create_point_cloud_polydata(*point_cloud_arrays(point_cloud))
+
+
+def create_segment_planes_polydata(polylines, half_width, fallback_direction=None):
+    """
+    Build one merged polydata with a horizontal-width quad for every segment of the polylines.
+
+    Each quad spans +/- half_width perpendicular to its segment in XY; vertical segments use
+    the perpendicular of fallback_direction (or are skipped without one). The cell data arrays
+    'PolylineId' and 'SegmentId' map every quad back to its source segment.
+    """
+    fallback_perp = None
+    if fallback_direction is not None:
+        fallback = np.asarray(fallback_direction, dtype=np.float64)[:2]
+        fallback_length = np.hypot(*fallback)
+        if fallback_length >= 1e-6:
+            fallback_perp = np.array([-fallback[1], fallback[0]]) / fallback_length
+
+    corners, polyline_ids, segment_ids = [], [], []
+    for polyline_id, polyline in enumerate(polylines):
+        points = np.asarray(polyline, dtype=np.float64).reshape(-1, 3)
+        if len(points) < 2:
+            continue
+        starts, ends = points[:-1], points[1:]
+        segments = ends - starts
+        lengths = np.linalg.norm(segments, axis=1)
+        keep = lengths >= 1e-6
+        horiz = segments[:, :2] / np.where(keep, lengths, 1.0)[:, None]
+        horiz_lengths = np.hypot(horiz[:, 0], horiz[:, 1])
+        vertical = horiz_lengths < 1e-6
+        with np.errstate(invalid='ignore', divide='ignore'):
+            perp = np.column_stack((-horiz[:, 1], horiz[:, 0])) / horiz_lengths[:, None]
+        if fallback_perp is not None:
+            perp[vertical] = fallback_perp
+        else:
+            keep &= ~vertical
+        offsets = np.zeros((len(segments), 3))
+        offsets[:, :2] = perp * half_width
+
+        index = np.nonzero(keep)[0]
+        quads = np.stack((starts[index] + offsets[index], starts[index] - offsets[index],
+                          ends[index] - offsets[index], ends[index] + offsets[index]), axis=1)
+        corners.append(quads.reshape(-1, 3))
+        polyline_ids.append(np.full(len(index), polyline_id, dtype=np.int32))
+        segment_ids.append(index.astype(np.int32))
+
+    corners = np.concatenate(corners) if corners else np.empty((0, 3))
+    num_quads = len(corners) // 4
+    id_dtype = get_vtk_to_numpy_typemap()[vtk.VTK_ID_TYPE]
+    offsets = np.arange(0, 4 * num_quads + 1, 4, dtype=id_dtype)
+    connectivity = np.arange(4 * num_quads, dtype=id_dtype)
+    cells = vtk.vtkCellArray()
+    cells.SetData(numpy_to_vtkIdTypeArray(offsets, deep=False),
+                  numpy_to_vtkIdTypeArray(connectivity, deep=False))
+
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(numpy_to_vtk_points(corners))
+    polydata.SetPolys(cells)
+    for name, values in (("PolylineId", polyline_ids), ("SegmentId", segment_ids)):
+        values = np.concatenate(values) if values else np.empty(0, dtype=np.int32)
+        array = numpy_to_vtk(np.ascontiguousarray(values), deep=True, array_type=vtk.VTK_INT)
+        array.SetName(name)
+        polydata.GetCellData().AddArray(array)
+    return polydata
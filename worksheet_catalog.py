@@ -0,0 +1,192 @@
+# worksheet_catalog.py
+"""
+Local SQLite catalog of the worksheet tree (worksheets, sections, layers and their config files).
+
+The dialogs list the same folders and parse the same worksheet_config.txt / design_layer_config.txt
+files every time they open. The catalog keeps the directory listings and the config contents in
+a small database under the user's home folder and only goes back to the file system for a
+directory or file whose mtime changed, so reopening a dialog costs one stat per folder instead of
+a listdir, an isdir per entry and a JSON parse per config.
+
+Usage:
+    from worksheet_catalog import get_catalog
+
+    catalog = get_catalog()
+    for folder_name, config in catalog.worksheets(base_dir):
+        ...
+    layers = catalog.subdirectories(os.path.join(worksheet_path, "designs"))
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".3d_tool", "worksheet_catalog.sqlite3")
+WORKSHEET_CONFIG = "worksheet_config.txt"
+# An mtime this close to the scan may still be followed by a change with the same timestamp
+# (coarse mtime resolution on FAT and network drives), so such entries are never trusted
+RACY_WINDOW_S = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    PRIMARY KEY (parent, name)
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content TEXT NOT NULL
+);
+"""
+
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _trusted_mtime(stat_result):
+    """mtime to store for a scan, or -1 when the entry was modified too recently to trust"""
+    if time.time() - stat_result.st_mtime < RACY_WINDOW_S:
+        return -1
+    return stat_result.st_mtime_ns
+
+
+class WorksheetCatalog:
+    """Directory listings and JSON config files cached in SQLite and revalidated by mtime"""
+
+    def __init__(self, db_path=DEFAULT_CATALOG_PATH):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def list_dir(self, path):
+        """Sorted (name, is_dir) pairs of a directory; [] if it does not exist"""
+        path = os.path.normpath(path)
+        stat_result = _stat(path)
+        with self.lock:
+            if stat_result is None:
+                self._forget_directory(path)
+                return []
+            row = self.connection.execute(
+                "SELECT mtime_ns FROM directories WHERE path = ?", (path,)).fetchone()
+            if row is not None and row[0] == stat_result.st_mtime_ns:
+                return [(name, bool(is_dir)) for name, is_dir in self.connection.execute(
+                    "SELECT name, is_dir FROM entries WHERE parent = ? ORDER BY name", (path,))]
+
+            entries = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            entries.append((entry.name, entry.is_dir()))
+                        except OSError:
+                            continue
+            except OSError:
+                return []
+            entries.sort()
+            with self.connection:
+                self.connection.execute("DELETE FROM entries WHERE parent = ?", (path,))
+                self.connection.executemany(
+                    "INSERT INTO entries (parent, name, is_dir) VALUES (?, ?, ?)",
+                    [(path, name, int(is_dir)) for name, is_dir in entries])
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO directories (path, mtime_ns) VALUES (?, ?)",
+                    (path, _trusted_mtime(stat_result)))
+            return entries
+
+    def subdirectories(self, path):
+        """Sorted names of the folders directly inside path"""
+        return [name for name, is_dir in self.list_dir(path) if is_dir]
+
+    def files(self, path, extension=None):
+        """Sorted names of the files directly inside path, optionally only those ending with extension"""
+        names = [name for name, is_dir in self.list_dir(path) if not is_dir]
+        if extension:
+            extension = extension.lower()
+            names = [name for name in names if name.lower().endswith(extension)]
+        return names
+
+    def read_json(self, path):
+        """Parsed contents of a JSON (or JSON .txt config) file; None if missing or invalid"""
+        path = os.path.normpath(path)
+        stat_result = _stat(path)
+        with self.lock:
+            if stat_result is None:
+                self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                self.connection.commit()
+                return None
+            row = self.connection.execute(
+                "SELECT mtime_ns, size, content FROM files WHERE path = ?", (path,)).fetchone()
+            if row is not None and row[0] == stat_result.st_mtime_ns and row[1] == stat_result.st_size:
+                content = row[2]
+            else:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except (OSError, UnicodeDecodeError):
+                    return None
+                with self.connection:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO files (path, mtime_ns, size, content) VALUES (?, ?, ?, ?)",
+                        (path, _trusted_mtime(stat_result), stat_result.st_size, content))
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+
+    def worksheets(self, base_dir):
+        """(folder_name, config) of every worksheet folder in base_dir that has a readable worksheet_config.txt"""
+        result = []
+        for folder_name in self.subdirectories(base_dir):
+            config = self.read_json(os.path.join(base_dir, folder_name, WORKSHEET_CONFIG))
+            if isinstance(config, dict):
+                result.append((folder_name, config))
+        return result
+
+    def invalidate(self, path):
+        """Drop what is cached for path (a directory or a file) so the next query rescans it"""
+        path = os.path.normpath(path)
+        with self.lock, self.connection:
+            self._forget_directory(path)
+            self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _forget_directory(self, path):
+        with self.connection:
+            self.connection.execute("DELETE FROM directories WHERE path = ?", (path,))
+            self.connection.execute("DELETE FROM entries WHERE parent = ?", (path,))
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Shared catalog at DEFAULT_CATALOG_PATH (in memory if the home folder is not writable)"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            try:
+                _catalog = WorksheetCatalog()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Worksheet catalog unavailable ({e}); using an in-memory catalog")
+                _catalog = WorksheetCatalog(":memory:")
+        return _catalog
@@ -0,0 +1,141 @@
+# xyz_reader.py
+import io
+import os
+import warnings
+import numpy as np
+
+DEFAULT_BLOCK_BYTES = 8 * 1024 * 1024
+# Column separators seen in XYZ/TXT exports, all parsed as whitespace
+SEPARATORS = bytes.maketrans(b',;\t', b'   ')
+# np.loadtxt got a C parser in NumPy 1.23; older versions parse in Python, so use fromstring there
+HAS_C_LOADTXT = np.lib.NumpyVersion(np.__version__) >= '1.23.0'
+
+
+def _is_data_line(line):
+    parts = line.translate(SEPARATORS).split()
+    if not parts:
+        return False
+    try:
+        float(parts[0])
+        return True
+    except ValueError:
+        return False
+
+
+def _parse_block(block, num_columns, usecols, delimiter):
+    """Parse a block of complete lines into a (rows, len(usecols)) float64 array"""
+    if not HAS_C_LOADTXT:
+        text = block.translate(SEPARATORS) if delimiter else block
+        num_lines = text.count(b'\n') + (0 if text.endswith(b'\n') else 1)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            values = np.fromstring(text, dtype=np.float64, sep=' ')
+        if values.size == num_lines * num_columns:
+            return values.reshape(-1, num_columns)[:, usecols]
+    # C tokenizer on NumPy >= 1.23; also handles blank lines, comments and ragged rows
+    return np.loadtxt(io.BytesIO(block), usecols=usecols, ndmin=2, comments='#', delimiter=delimiter)
+
+
+def read_xyz(file_path, keep_intensity=False, keep_rgb=False, block_bytes=DEFAULT_BLOCK_BYTES,
+             progress_callback=None, block_callback=None, should_stop=None):
+    """
+    Stream an ASCII XYZ file in fixed-size blocks.
+
+    Columns are interpreted by count: x y z, x y z intensity, x y z r g b or
+    x y z intensity r g b. Coordinates are written into a preallocated float32 buffer relative
+    to the first point (so UTM sized values keep centimetre precision) and returned as float64.
+
+    progress_callback(bytes_read, total_bytes) is called after every block,
+    block_callback(points) receives each parsed block (e.g. for a preview), and reading stops
+    early with None returned when should_stop() becomes true.
+
+    Returns a dict with 'points' (N, 3), 'intensity' (N,) or None and 'colors' (N, 3, 0-1) or None.
+    """
+    total_bytes = max(os.path.getsize(file_path), 1)
+    with open(file_path, 'rb') as f:
+        # Skip header lines and find the column layout from the first data line
+        header_bytes = 0
+        first_line = f.readline()
+        while first_line and not _is_data_line(first_line):
+            header_bytes += len(first_line)
+            first_line = f.readline()
+        if not first_line:
+            return None
+        num_columns = len(first_line.translate(SEPARATORS).split())
+        delimiter = next((d for d in (',', ';') if d.encode() in first_line), None)
+        if num_columns < 3:
+            raise ValueError(f"Expected at least 3 columns in XYZ file, found {num_columns}")
+        has_intensity = num_columns == 4 or num_columns >= 7
+        rgb_start = 4 if num_columns >= 7 else 3
+        has_rgb = num_columns >= 6
+        keep_intensity = keep_intensity and has_intensity
+        keep_rgb = keep_rgb and has_rgb
+        usecols = [0, 1, 2]
+        if keep_intensity:
+            usecols.append(3)
+        if keep_rgb:
+            usecols.extend(range(rgb_start, rgb_start + 3))
+
+        # Preallocate from the average line length, growing if the estimate was low
+        estimated = int((total_bytes - header_bytes) / max(len(first_line), 1) * 1.05) + 1
+        positions = np.empty((estimated, 3), dtype=np.float32)
+        intensity = np.empty(estimated, dtype=np.float32) if keep_intensity else None
+        colors = np.empty((estimated, 3), dtype=np.float32) if keep_rgb else None
+        origin = None
+        count = 0
+        bytes_read = header_bytes
+        pending = first_line
+
+        while True:
+            if should_stop and should_stop():
+                return None
+            chunk = f.read(block_bytes)
+            data = pending + chunk
+            if chunk:
+                cut = data.rfind(b'\n') + 1
+                if cut == 0:
+                    pending = data
+                    continue
+                block, pending = data[:cut], data[cut:]
+            else:
+                block, pending = data, b''
+            if block:
+                values = _parse_block(block, num_columns, usecols, delimiter)
+                rows = len(values)
+                if count + rows > len(positions):
+                    new_size = max(count + rows, int(len(positions) * 1.25))
+                    positions = np.resize(positions, (new_size, 3))
+                    if keep_intensity:
+                        intensity = np.resize(intensity, new_size)
+                    if keep_rgb:
+                        colors = np.resize(colors, (new_size, 3))
+                if origin is None and rows:
+                    origin = values[0, :3].copy()
+                positions[count:count + rows] = values[:, :3] - origin
+                if keep_intensity:
+                    intensity[count:count + rows] = values[:, 3]
+                if keep_rgb:
+                    colors[count:count + rows] = values[:, -3:]
+                count += rows
+                if block_callback and rows:
+                    block_callback(values[:, :3])
+            bytes_read += len(block)
+            if progress_callback:
+                progress_callback(min(bytes_read, total_bytes), total_bytes)
+            if not chunk:
+                break
+
+    if count == 0:
+        return None
+    points = positions[:count].astype(np.float64)
+    points += origin
+    if keep_rgb:
+        colors = colors[:count]
+        if colors.max(initial=0.0) > 1.0:
+            colors /= 255.0
+        colors = colors.astype(np.float64)
+    return {
+        'points': points,
+        'intensity': intensity[:count] if keep_intensity else None,
+        'colors': colors,
+    }